@@ -0,0 +1,180 @@
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+# Default for LRUCache.get when None is a legitimate cached value
+MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with optional expiry and hit/miss counters"""
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl  # Seconds an entry stays valid after it was stored (None = forever)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data: OrderedDict = OrderedDict()
+        self._deadlines = {}
+
+    def _expired(self, key: Hashable) -> bool:
+        """Check whether an entry has outlived the TTL"""
+        return self.ttl is not None and self._deadlines[key] <= time.monotonic()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Optional[Any]:
+        """Get a cached value, marking it as recently used"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if self._expired(key):
+            self.invalidate(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable, default: Optional[Any] = None) -> Optional[Any]:
+        """Get a live cached value without touching the counters or recency"""
+        if key not in self._data or self._expired(key):
+            return default
+        return self._data[key]
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.ttl is not None:
+            self._deadlines[key] = time.monotonic() + self.ttl
+        while len(self._data) > self.maxsize:
+            oldest, _ = self._data.popitem(last=False)
+            self._deadlines.pop(oldest, None)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry if present"""
+        self._data.pop(key, None)
+        self._deadlines.pop(key, None)
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        self._data.clear()
+        self._deadlines.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data and not self._expired(key)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> str:
+        """Human-readable summary of the counters"""
+        summary = f'{len(self._data)}/{self.maxsize} entries, {self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate)'
+        if self.evictions or self.expirations:
+            summary += f', {self.evictions} evicted, {self.expirations} expired'
+        return summary
+
+
+class CacheRead:
+    """A read from the source of truth, to be cached once it completes"""
+    __slots__ = ('value', 'valid')
+
+    def __init__(self):
+        self.value = MISSING
+        self.valid = True  # Cleared when a write to the same key overlaps the read
+
+
+class CacheWrite:
+    """A write to the source of truth, to be mirrored in the cache"""
+    __slots__ = ('update', 'size')
+
+    def __init__(self):
+        self.update: Optional[Callable[[Any], Any]] = None
+        self.size: Optional[int] = None
+
+    def apply(self, update: Callable[[Any], Any], size: int):
+        """Record how to update the cached value and the size the source reported afterwards"""
+        self.update = update
+        self.size = size
+
+
+class WriteThroughCache:
+    """LRU cache of per-key lists that mirrors writes to the source and never serves a list older than the last write"""
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._reading: Dict[Hashable, List[CacheRead]] = {}  # Key -> reads in flight
+        self._writing: Dict[Hashable, int] = {}              # Key -> writes in flight
+
+    def get(self, key: Hashable) -> Any:
+        """Get the cached list for a key (MISSING if it has to be read)"""
+        return self.cache.get(key, MISSING)
+
+    @contextmanager
+    def reading(self, key: Hashable) -> Iterator[CacheRead]:
+        """Wrap a read from the source; set `value` on the yielded CacheRead to cache it"""
+        read = CacheRead()
+        self._reading.setdefault(key, []).append(read)
+        try:
+            yield read
+        finally:
+            reads = self._reading[key]
+            reads.remove(read)
+            if not reads:
+                del self._reading[key]
+            # Skipped when a write to the key happened meanwhile
+            if read.valid and read.value is not MISSING:
+                self.cache.put(key, read.value)
+
+    def _invalidate_reads(self, key: Hashable):
+        """Keep reads in flight for a key out of the cache"""
+        for read in self._reading.get(key, ()):
+            read.valid = False
+
+    @contextmanager
+    def writing(self, key: Hashable) -> Iterator[CacheWrite]:
+        """Wrap a write to the source; call apply() on the yielded CacheWrite once it succeeded"""
+        self._invalidate_reads(key)
+        if self._writing.get(key):
+            self.cache.invalidate(key)
+        self._writing[key] = self._writing.get(key, 0) + 1
+
+        write = CacheWrite()
+        try:
+            yield write
+        finally:
+            self._invalidate_reads(key)
+            overlapped = self._writing[key] > 1
+            if overlapped:
+                self._writing[key] -= 1
+            else:
+                del self._writing[key]
+
+            # Mirror the write into a cached copy, or drop the copy when it can't be trusted
+            cached = self.cache.peek(key, MISSING)
+            if cached is not MISSING:
+                value = write.update(cached) if write.update and not overlapped else None
+                if value is not None and len(value) == write.size:
+                    self.cache.put(key, value)
+                else:
+                    self.cache.invalidate(key)
+
+    def invalidate(self, key: Hashable):
+        """Drop the cached list for a key"""
+        self.cache.invalidate(key)
+
+    def stats(self) -> str:
+        """Human-readable summary of the cache counters"""
+        return self.cache.stats()
@@ -0,0 +1,418 @@
+import csv
+import mmap
+import os
+import pickle
+import re
+import sys
+import time
+from array import array
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+# Region boundaries by National Dex number
+REGION_RANGES = [
+    ('Kanto', 1, 151),
+    ('Johto', 152, 251),
+    ('Hoenn', 252, 386),
+    ('Sinnoh', 387, 493),
+    ('Unova', 494, 649),
+    ('Kalos', 650, 721),
+    ('Alola', 722, 809),
+    ('Galar', 810, 905),
+    ('Paldea', 906, 1025),
+]
+
+REGIONS = [region for region, _, _ in REGION_RANGES] + ['Unknown']
+
+GENDERS = ['male', 'female', 'genderless']
+
+# Bump whenever the layout of the saved catalog state changes
+SNAPSHOT_FORMAT = 1
+
+# Catalog attributes saved in (and restored from) a binary snapshot
+SNAPSHOT_FIELDS = (
+    'names', 'dex', 'type1', 'type2', 'region', 'spawn',
+    'type_names', 'region_names', '_type_codes', '_region_codes',
+    '_forms_by_dex', '_row_by_name', '_genders',
+    'sorted_names', 'type_index', 'region_index', 'spawn_index', 'gender_index',
+    'spawning_mask', 'all_mask',
+)
+
+# Spawn-rate filter such as '1/899', '<=1/899' or '> 1/674'
+RATE_FILTER_PATTERN = re.compile(r'^(<=|>=|<|>|=)?\s*1\s*/\s*(\d+)$')
+
+
+def get_region(dex: int) -> str:
+    """Get region based on Dex number"""
+    for region, first, last in REGION_RANGES:
+        if first <= dex <= last:
+            return region
+    return 'Unknown'
+
+
+def parse_spawn_rate(chance: str) -> int:
+    """Convert a '1/N' spawn chance into its denominator N (0 if unparseable)"""
+    numerator, _, denominator = chance.partition('/')
+    if numerator.strip() != '1' or not denominator.strip().isdigit():
+        return 0
+    return int(denominator)
+
+
+class PokemonEntry:
+    """Lightweight view of one catalog row, only built when a caller needs it"""
+    __slots__ = ('row', 'name', 'type1', 'type2', 'dex', 'region', 'spawn_rate')
+
+    def __init__(self, row: int, name: str, type1: str, type2: Optional[str], dex: int, region: str, spawn_rate: Optional[str]):
+        self.row = row  # Stable primary key: the entry's position in pokemondata.csv
+        self.name = name
+        self.type1 = type1
+        self.type2 = type2
+        self.dex = dex
+        self.region = region
+        self.spawn_rate = spawn_rate
+
+    def __repr__(self) -> str:
+        return f'PokemonEntry({self.name!r}, #{self.dex:03d})'
+
+
+class PokemonCatalog:
+    """Pokédex, spawn rates and gender data stored column-wise with bitmask indexes, loaded once and shared by every cog"""
+
+    def __init__(self, data_file: str = 'pokemondata.csv', spawn_file: str = 'spawnrates.csv',
+                 snapshot_file: Optional[str] = 'catalog.snapshot'):
+        self.data_file = data_file
+        self.spawn_file = spawn_file
+        self.snapshot_file = snapshot_file
+
+        self.names: List[str] = []
+        self.dex = array('H')
+        self.type1 = array('B')
+        self.type2 = array('B')     # 0 means no secondary type
+        self.region = array('B')
+        self.spawn = array('I')     # Spawn-rate denominator, 0 means no spawn data
+
+        self.type_names: List[Optional[str]] = [None]  # Code -> type name
+        self.region_names: List[str] = list(REGIONS)   # Code -> region name
+
+        self._type_codes: Dict[str, int] = {}
+        self._region_codes: Dict[str, int] = {region: code for code, region in enumerate(REGIONS)}
+        self._forms_by_dex: Dict[int, Tuple[int, ...]] = {}  # Dex -> rows of every form, base form first
+        self._row_by_name: Dict[str, int] = {}                # Lower-cased name -> row
+        self._genders: Dict[str, FrozenSet[str]] = {gender: frozenset() for gender in GENDERS}
+
+        # Inverted indexes (bitmasks over name-sorted rows)
+        self.sorted_names: List[str] = []
+        self.type_index: Dict[str, int] = {}
+        self.region_index: Dict[str, int] = {}
+        self.spawn_index: Dict[int, int] = {}  # Spawn-rate denominator -> mask
+        self.gender_index: Dict[str, int] = {}
+        self.spawning_mask = 0                 # Every entry with spawn data
+        self.all_mask = 0                      # Every entry
+
+        self.version = 0  # Bumped on every (re)load so caches can invalidate
+        self.load()
+
+    def _intern_type(self, type_name: str, codes: Dict[str, int], names: List[Optional[str]]) -> int:
+        """Get the small-int code for a type, assigning a new one if needed"""
+        if not type_name:
+            return 0
+        code = codes.get(type_name)
+        if code is None:
+            code = codes[type_name] = len(names)
+            names.append(sys.intern(type_name))
+        return code
+
+    def source_files(self) -> List[str]:
+        """Get the CSV files the catalog is built from"""
+        return [self.data_file, self.spawn_file] + [f'{gender}.csv' for gender in GENDERS]
+
+    def snapshot_is_fresh(self) -> bool:
+        """Check that the snapshot exists and is newer than every CSV file"""
+        if not self.snapshot_file:
+            return False
+        try:
+            snapshot_mtime = os.path.getmtime(self.snapshot_file)
+        except OSError:
+            return False
+        return all(os.path.getmtime(path) <= snapshot_mtime for path in self.source_files() if os.path.exists(path))
+
+    def save_snapshot(self, path: Optional[str] = None):
+        """Write the loaded catalog to a binary snapshot file"""
+        path = path or self.snapshot_file
+        state = {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump((SNAPSHOT_FORMAT, state), f, protocol=5)
+        os.replace(temp_path, path)
+
+    def load_snapshot(self) -> bool:
+        """Load the catalog from a fresh snapshot, returning False if it can't be used"""
+        if not self.snapshot_is_fresh():
+            return False
+
+        try:
+            with open(self.snapshot_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    snapshot_format, state = pickle.loads(mapped)
+        except Exception as e:
+            print(f'Error loading catalog snapshot: {e}')
+            return False
+
+        if snapshot_format != SNAPSHOT_FORMAT or set(state) != set(SNAPSHOT_FIELDS):
+            print('Catalog snapshot is from another version, loading CSV files instead')
+            return False
+
+        for field, value in state.items():
+            setattr(self, field, value)
+        self.version += 1
+
+        print(f'Loaded {len(self.names)} Pokémon ({len(self._forms_by_dex)} Dex numbers) from {self.snapshot_file}')
+        return True
+
+    def load(self):
+        """Load the catalog, preferring a fresh snapshot over the CSV files"""
+        if not self.load_snapshot():
+            self.load_csv()
+
+    def load_csv(self):
+        """Load Pokémon data, spawn rates and gender lists from CSV files"""
+        type_codes: Dict[str, int] = {}
+        type_names: List[Optional[str]] = [None]
+        rows: List[tuple] = []
+        spawn_rates: List[tuple] = []
+        genders = {}
+
+        try:
+            # Load pokemondata.csv (tab-separated); every form gets its own row
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f, delimiter='\t')
+                for row in reader:
+                    rows.append((
+                        int(row['Dex']),
+                        row['Name'],
+                        self._intern_type(row['Type 1'].strip(), type_codes, type_names),
+                        self._intern_type(row['Type 2'].strip(), type_codes, type_names),
+                    ))
+
+            # Load spawnrates.csv (comma-separated)
+            with open(self.spawn_file, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    spawn_rates.append((int(row['Dex']), row['Pokemon'].strip(), parse_spawn_rate(row['Chance'])))
+        except Exception as e:
+            print(f'Error loading Pokémon data: {e}')
+            return
+
+        # Load gender data
+        for gender in GENDERS:
+            names = set()
+            try:
+                with open(f'{gender}.csv', 'r', encoding='utf-8') as f:
+                    reader = csv.DictReader(f)
+                    for row in reader:
+                        if row:
+                            names.add(row['name'].strip())
+            except FileNotFoundError:
+                print(f'Warning: {gender}.csv not found')
+            genders[gender] = frozenset(names)
+
+        # Build the columns
+        self.names = []
+        self.dex = array('H')
+        self.type1 = array('B')
+        self.type2 = array('B')
+        self.region = array('B')
+        self.spawn = array('I', bytes(4 * len(rows)))
+        forms_by_dex: Dict[int, List[int]] = {}
+        row_by_name: Dict[str, int] = {}
+
+        for row, (dex, name, type1, type2) in enumerate(rows):
+            forms_by_dex.setdefault(dex, []).append(row)
+            row_by_name.setdefault(name.lower(), row)
+            self.names.append(name)
+            self.dex.append(dex)
+            self.type1.append(type1)
+            self.type2.append(type2)
+            self.region.append(self._region_codes[get_region(dex)])
+
+        # Join spawn rates by form name, falling back to the base form of the Dex
+        # number (spawnrates.csv uses its own IDs for alternate forms)
+        for dex, name, denominator in spawn_rates:
+            row = row_by_name.get(name.lower())
+            if row is None and dex in forms_by_dex:
+                row = forms_by_dex[dex][0]
+            if row is not None and not self.spawn[row]:
+                self.spawn[row] = denominator
+
+        self._forms_by_dex = {dex: tuple(forms) for dex, forms in forms_by_dex.items()}
+        self._row_by_name = row_by_name
+
+        self.type_names = type_names
+        self._type_codes = type_codes
+        self._genders = genders
+        self._build_indexes()
+        self.version += 1
+
+        print(f'Loaded {len(self.names)} Pokémon ({len(self._forms_by_dex)} Dex numbers) and {len(spawn_rates)} spawn rates')
+        print(f'Loaded gender data: {len(genders["male"])} male, {len(genders["female"])} female, {len(genders["genderless"])} genderless')
+
+    def _build_indexes(self):
+        """Build the type/region/spawn-rate bitmask indexes"""
+        order = sorted(range(len(self.names)), key=self.names.__getitem__)
+        type_index: Dict[str, int] = {}
+        region_index: Dict[str, int] = {}
+        spawn_index: Dict[int, int] = {}
+        gender_index: Dict[str, int] = {gender: 0 for gender in GENDERS}
+
+        for position, row in enumerate(order):
+            bit = 1 << position
+            for code in (self.type1[row], self.type2[row]):
+                if code:
+                    type_name = self.type_names[code]
+                    type_index[type_name] = type_index.get(type_name, 0) | bit
+            region = self.region_names[self.region[row]]
+            region_index[region] = region_index.get(region, 0) | bit
+            denominator = self.spawn[row]
+            if denominator:
+                spawn_index[denominator] = spawn_index.get(denominator, 0) | bit
+            for gender, names in self._genders.items():
+                if self.names[row] in names:
+                    gender_index[gender] |= bit
+
+        self.sorted_names = [self.names[row] for row in order]
+        self.type_index = type_index
+        self.region_index = region_index
+        self.spawn_index = spawn_index
+        self.gender_index = gender_index
+        self.all_mask = (1 << len(order)) - 1
+        self.spawning_mask = 0
+        for mask in spawn_index.values():
+            self.spawning_mask |= mask
+
+    def rate_mask(self, expression: str) -> int:
+        """Get the mask of entries whose spawn chance satisfies e.g. '<=1/899'"""
+        match = RATE_FILTER_PATTERN.match(expression.strip())
+        if not match:
+            return 0
+
+        operator = match.group(1) or '='
+        target = int(match.group(2))
+        if operator == '=':
+            return self.spawn_index.get(target, 0)
+
+        # A smaller chance means a larger denominator
+        mask = 0
+        for denominator, tier in self.spawn_index.items():
+            if ((operator == '<=' and denominator >= target) or
+                    (operator == '<' and denominator > target) or
+                    (operator == '>=' and denominator <= target) or
+                    (operator == '>' and denominator < target)):
+                mask |= tier
+        return mask
+
+    def mask_for(self, attribute: str, value: str) -> int:
+        """Get the mask of entries matching one attribute value"""
+        if attribute == 'type':
+            return self.type_index.get(value, 0)
+        if attribute == 'region':
+            return self.region_index.get(value, 0)
+        if attribute == 'gender':
+            return self.gender_index.get(value, 0)
+        if attribute == 'rate':
+            return self.rate_mask(value)
+        raise ValueError(f'Unknown attribute: {attribute}')
+
+    def query(self, include: List[Tuple[str, List[str]]], exclude: List[Tuple[str, List[str]]] = ()) -> int:
+        """
+        Evaluate a filter query into a mask.
+        Clauses are (attribute, values) pairs: values within a clause are OR'd,
+        included clauses are AND'd together and excluded values are removed.
+        """
+        mask = self.all_mask
+        for attribute, values in include:
+            clause = 0
+            for value in values:
+                clause |= self.mask_for(attribute, value)
+            mask &= clause
+        for attribute, values in exclude:
+            for value in values:
+                mask &= ~self.mask_for(attribute, value)
+        return mask
+
+    def names_in(self, mask: int) -> List[str]:
+        """Decode a bitmask into entry names, in alphabetical order"""
+        names = []
+        sorted_names = self.sorted_names
+        while mask:
+            lowest = mask & -mask
+            names.append(sorted_names[lowest.bit_length() - 1])
+            mask ^= lowest
+        return names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[PokemonEntry]:
+        """Iterate over entries in Dex file order"""
+        return (self.entry(row) for row in range(len(self.names)))
+
+    def type_code(self, type_name: Optional[str]) -> int:
+        """Get the code for a type name (-1 if the type is unknown)"""
+        if not type_name:
+            return 0
+        return self._type_codes.get(type_name, -1)
+
+    def region_code(self, region: Optional[str]) -> int:
+        """Get the code for a region name (-1 if the region is unknown)"""
+        return self._region_codes.get(region, -1)
+
+    def entry(self, row: int) -> PokemonEntry:
+        """Build the entry view for a row"""
+        denominator = self.spawn[row]
+        return PokemonEntry(
+            row=row,
+            name=self.names[row],
+            type1=self.type_names[self.type1[row]],
+            type2=self.type_names[self.type2[row]],
+            dex=self.dex[row],
+            region=self.region_names[self.region[row]],
+            spawn_rate=f'1/{denominator}' if denominator else None
+        )
+
+    def get(self, dex: int) -> Optional[PokemonEntry]:
+        """Get the base form entry for a Dex number"""
+        forms = self._forms_by_dex.get(dex)
+        return self.entry(forms[0]) if forms else None
+
+    def forms(self, dex: int) -> List[PokemonEntry]:
+        """Get every form sharing a Dex number, base form first"""
+        return [self.entry(row) for row in self._forms_by_dex.get(dex, ())]
+
+    def find(self, name: str) -> Optional[PokemonEntry]:
+        """Get an entry by its (case-insensitive) name"""
+        row = self._row_by_name.get(name.strip().lower())
+        return None if row is None else self.entry(row)
+
+    def spawn_rate(self, dex: int) -> Optional[str]:
+        """Get the spawn rate (e.g. '1/225') of the base form for a Dex number"""
+        entry = self.get(dex)
+        return entry.spawn_rate if entry else None
+
+    def gender_names(self, gender: str) -> FrozenSet[str]:
+        """Get the names of Pokémon belonging to a gender list"""
+        return self._genders.get(gender, frozenset())
+
+
+if __name__ == '__main__':
+    # Build step: compile the CSV files into a snapshot for faster bot startup
+    start = time.perf_counter()
+    catalog = PokemonCatalog(snapshot_file=None)
+    csv_time = time.perf_counter() - start
+
+    catalog.save_snapshot('catalog.snapshot')
+
+    start = time.perf_counter()
+    PokemonCatalog(snapshot_file='catalog.snapshot')
+    snapshot_time = time.perf_counter() - start
+
+    print(f'Wrote catalog.snapshot ({os.path.getsize("catalog.snapshot")} bytes)')
+    print(f'CSV parsing: {csv_time * 1000:.1f} ms, snapshot loading: {snapshot_time * 1000:.1f} ms')
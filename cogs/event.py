@@ -3,9 +3,23 @@ from discord.ext import commands
 from discord import app_commands
 import re
 import asyncio
+import hashlib
+import io
 import time
-from typing import Set, Optional
-from config import EMBED_COLOR, IDS_PER_PAGE, RECORDING_TIMEOUT, INACTIVITY_CHECK_INTERVAL
+from array import array
+from typing import Dict, List, Set, Optional
+from config import (
+    EMBED_COLOR, IDS_PER_PAGE, RECORDING_TIMEOUT,
+    CONTROL_UPDATE_INTERVAL, CONTROL_UPDATE_MAX_BACKOFF, CONTROL_UPDATE_SLOW_EDIT, RECORDING_LOG_PATH,
+    RESULT_CACHE_SIZE, EXPORT_ATTACH_THRESHOLD
+)
+from cache import LRUCache
+from recording_log import RecordingLog, SavedRecording
+from scheduler import DeadlineScheduler
+
+# Numbers in backticks with optional leading/trailing spaces
+# Works for `398121`, **`398121`**, ` 2593`, **` 2593`**, etc.
+RECORDED_ID_PATTERN = re.compile(r'`\s*(\d+)\s*`')
 
 class IDRecorder:
     """Class to handle ID recording for a specific message"""
@@ -13,61 +27,128 @@ class IDRecorder:
         self.message = message
         self.user_id = user_id
         self.user_mention = user_mention  # Store user mentionn
-        self.ids: Set[str] = set()
+        self.ids: Set[int] = set()
+        self.seen_descriptions: Set[bytes] = set()  # Digests of embed descriptions already scanned
         self.is_recording = True
         self.control_message = control_message
         self.last_activity = time.time()
 
-    def extract_ids(self, description: str) -> Set[str]:
+        # Control message edits are coalesced: at most one in flight or waiting
+        self.display_task: Optional[asyncio.Task] = None
+        self.display_interval = CONTROL_UPDATE_INTERVAL  # Grows while rate limited
+        self.last_display = 0.0  # time.monotonic() when the last edit finished
+        self.display_requests = 0
+        self.display_edits = 0
+
+    def extract_ids(self, description: str) -> Set[int]:
         """Extract Pokemon IDs from embed description"""
-        # Pattern matches numbers in backticks with optional leading/trailing spaces
-        # Works for `398121`, **`398121`**, ` 2593`, **` 2593`**, etc.
-        pattern = r'`\s*(\d+)\s*`'
-        matches = re.findall(pattern, description)
-        return set(matches)
-
-    async def update_ids_and_display(self):
-        """Update IDs from current message embeds and update control message"""
-        if not self.message.embeds:
-            return
+        return {int(match) for match in RECORDED_ID_PATTERN.findall(description)}
 
-        old_count = len(self.ids)
+    async def update_ids_and_display(self) -> Set[int]:
+        """Update IDs from current message embeds and update control message. Returns the newly found IDs"""
+        new_ids: Set[int] = set()
+        if not self.message.embeds:
+            return new_ids
 
         for embed in self.message.embeds:
-            if embed.description:
-                new_ids = self.extract_ids(embed.description)
-                self.ids.update(new_ids)
-
-        new_count = len(self.ids)
+            if not embed.description:
+                continue
+            # Listings are paged back and forth by editing one message, so most
+            # descriptions have been scanned before; only new ones are parsed
+            digest = hashlib.blake2b(embed.description.encode('utf-8'), digest_size=16).digest()
+            if digest in self.seen_descriptions:
+                continue
+            self.seen_descriptions.add(digest)
+            new_ids.update(self.extract_ids(embed.description) - self.ids)
+        self.ids.update(new_ids)
 
         # Update last activity time if new IDs were found
-        if new_count > old_count:
+        if new_ids:
             self.last_activity = time.time()
+            self.request_display()
+        return new_ids
+
+    def control_embed(self) -> discord.Embed:
+        """Build the control message embed with the current count"""
+        time_since_activity = time.time() - self.last_activity
+        time_remaining = RECORDING_TIMEOUT - int(time_since_activity)
+        minutes_remaining = max(0, time_remaining // 60)
+
+        return discord.Embed(
+            title="<:red_dot:1391644116357746728> Recording Pokemon IDs",
+            description=f"Recording IDs from [this message]({self.message.jump_url})\n\n"
+                       f"**IDs found:** {len(self.ids)}\n"
+                       f"**Started by:** {self.user_mention}\n\n"
+                       f"The message will be monitored for edits.\n"
+                       f"Click the button below when you're done!\n\n"
+                       f"⏱️ Auto-stops in ~{minutes_remaining} minutes if no new IDs.",
+            color=EMBED_COLOR
+        )
+
+    def request_display(self):
+        """Have the control message show the latest count, coalescing with a pending edit"""
+        # Only update if control_message exists
+        if not self.control_message:
+            return
 
-            # Only update if control_message exists
-            if self.control_message:
-                # Update control message immediately
-                time_since_activity = time.time() - self.last_activity
-                time_remaining = RECORDING_TIMEOUT - int(time_since_activity)
-                minutes_remaining = max(0, time_remaining // 60)
-
-                embed = discord.Embed(
-                    title="<:red_dot:1391644116357746728> Recording Pokemon IDs",
-                    description=f"Recording IDs from [this message]({self.message.jump_url})\n\n"
-                               f"**IDs found:** {new_count}\n"
-                               f"**Started by:** {self.user_mention}\n\n"
-                               f"The message will be monitored for edits.\n"
-                               f"Click the button below when you're done!\n\n"
-                               f"⏱️ Auto-stops in ~{minutes_remaining} minutes if no new IDs.",
-                    color=EMBED_COLOR
-                )
-                try:
-                    await self.control_message.edit(embed=embed)
-                except:
-                    pass
+        self.display_requests += 1
+        if not self.display_task or self.display_task.done():
+            self.display_task = asyncio.create_task(self.send_display())
+
+    async def send_display(self):
+        """Edit the control message once display_interval has passed since the last edit"""
+        while self.is_recording:
+            wait = self.last_display + self.display_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                if not self.is_recording:
+                    return
+
+            shown_count = len(self.ids)
+            started = time.monotonic()
+            try:
+                await self.control_message.edit(embed=self.control_embed())
+                self.display_edits += 1
+            except discord.RateLimited as e:
+                # Raised instead of waiting when the wait is over the client's max_ratelimit_timeout
+                self.back_off(e.retry_after)
+                continue
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    self.back_off(None)
+                    continue
+            except Exception:
+                pass
+            else:
+                # discord.py sleeps through rate limits inside edit(), so an edit
+                # held for several seconds was waiting on one, not on a slow round trip
+                held = time.monotonic() - started
+                if held > CONTROL_UPDATE_SLOW_EDIT:
+                    self.back_off(held)
+                else:
+                    self.display_interval = CONTROL_UPDATE_INTERVAL
+            finally:
+                self.last_display = time.monotonic()
+
+            # IDs found while the edit was in flight get one more edit
+            if len(self.ids) == shown_count:
+                return
+
+    def back_off(self, held: Optional[float]):
+        """Wait longer before the next edit after being rate limited (at least as long as Discord asked or held the edit)"""
+        self.display_interval = max(held or 0, min(self.display_interval * 2, CONTROL_UPDATE_MAX_BACKOFF))
+
+    def stop_display(self):
+        """Drop any pending control message edit and report how many edits were coalesced"""
+        if self.display_task and not self.display_task.done():
+            self.display_task.cancel()
+        if self.display_requests:
+            saved = max(0, self.display_requests - self.display_edits)
+            print(f"Recording {self.message.id}: {self.display_edits} control message edit(s) "
+                  f"for {self.display_requests} update(s), {saved} saved")
 
 class StopRecordingView(discord.ui.View):
-    """View with stop recording button"""
+    """View with stop recording button (persistent: re-registered for resumed recordings)"""
     def __init__(self, recorder: IDRecorder, cog):
         super().__init__(timeout=None)
         self.recorder = recorder
@@ -88,19 +169,60 @@ class StopRecordingView(discord.ui.View):
         await interaction.response.defer()
         await self.cog.show_results(interaction.channel, self.recorder, interaction.user)
 
+class RecordingResult:
+    """The IDs of a finished recording, sorted once; pages and export files are built on demand"""
+    __slots__ = ('message_id', 'ids', 'stopped_by', '_exports')
+
+    def __init__(self, message_id: int, ids: Set[int], stopped_by: Optional[str]):
+        self.message_id = message_id
+        # Descending - newest first
+        try:
+            self.ids = array('Q', sorted(ids, reverse=True))
+        except OverflowError:
+            self.ids = sorted(ids, reverse=True)
+        self.stopped_by = stopped_by
+        self._exports: Dict[str, bytes] = {}  # File format -> contents, kept for re-downloads
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def page_count(self) -> int:
+        return -(-len(self.ids) // IDS_PER_PAGE)
+
+    def page(self, index: int) -> str:
+        """Space-separated IDs of one page"""
+        return ' '.join(map(str, self.ids[index * IDS_PER_PAGE:(index + 1) * IDS_PER_PAGE]))
+
+    def export(self, file_format: str) -> discord.File:
+        """The whole result as a .txt (space-separated, like the pages) or .csv (one ID per row) attachment"""
+        data = self._exports.get(file_format)
+        if data is None:
+            buffer = io.StringIO()
+            if file_format == 'csv':
+                buffer.write('id\n')
+                buffer.write('\n'.join(map(str, self.ids)))
+            else:
+                buffer.write(' '.join(map(str, self.ids)))
+            buffer.write('\n')
+            data = buffer.getvalue().encode('utf-8')
+            self._exports[file_format] = data
+        return discord.File(io.BytesIO(data), filename=f"ids_{self.message_id}.{file_format}")
+
 class IDPaginationView(discord.ui.View):
-    """View for paginating large lists of IDs"""
-    def __init__(self, pages: list, total_ids: int):
+    """View for paginating large lists of IDs, rendering each page when it is shown"""
+    def __init__(self, result: RecordingResult):
         super().__init__(timeout=180)
-        self.pages = pages
+        self.result = result
         self.current_page = 0
-        self.total_ids = total_ids
         self.message: Optional[discord.Message] = None
 
     def get_message_content(self) -> str:
         """Get message content for current page"""
-        footer = f"Total IDs: {self.total_ids} • Page {self.current_page + 1}/{len(self.pages)}"
-        return f"{footer}\n```\n{self.pages[self.current_page]}\n```"
+        footer = f"Total IDs: {len(self.result)}"
+        if self.result.stopped_by:
+            footer += f" • Stopped by {self.result.stopped_by}"
+        footer += f" • Page {self.current_page + 1}/{self.result.page_count()}"
+        return f"{footer}\n```\n{self.result.page(self.current_page)}\n```"
 
     @discord.ui.button(label="◀", style=discord.ButtonStyle.primary, custom_id="prev_page")
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -112,18 +234,94 @@ class IDPaginationView(discord.ui.View):
 
     @discord.ui.button(label="▶", style=discord.ButtonStyle.primary, custom_id="next_page")
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page < len(self.pages) - 1:
+        if self.current_page < self.result.page_count() - 1:
             self.current_page += 1
             await interaction.response.edit_message(content=self.get_message_content(), view=self)
         else:
             await interaction.response.defer()
 
+    @discord.ui.button(label="📄 .txt", style=discord.ButtonStyle.secondary, custom_id="export_txt")
+    async def txt_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_message(file=self.result.export('txt'), ephemeral=True)
+
+    @discord.ui.button(label="📊 .csv", style=discord.ButtonStyle.secondary, custom_id="export_csv")
+    async def csv_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_message(file=self.result.export('csv'), ephemeral=True)
+
 class EventCog(commands.Cog):
     """Cog for recording Pokemon IDs from messages"""
 
     def __init__(self, bot):
         self.bot = bot
         self.recorders: dict[int, IDRecorder] = {}  # message_id -> IDRecorder
+        self.timeouts = DeadlineScheduler(self.recording_timed_out)  # message_id -> inactivity deadline
+        self.recording_log = RecordingLog(RECORDING_LOG_PATH)
+        self.resume_task: Optional[asyncio.Task] = None
+        self.results = LRUCache(maxsize=RESULT_CACHE_SIZE)  # message_id -> RecordingResult, for !idexport
+
+    async def cog_load(self):
+        """Resume the recordings that were running when the bot stopped"""
+        # Replayed right away so recordings started meanwhile aren't mixed into the log's replay
+        saved_recordings = self.recording_log.load()
+        if saved_recordings:
+            self.resume_task = asyncio.create_task(self.resume_recordings(saved_recordings))
+
+    async def cog_unload(self):
+        """Stop the recording timeouts (running recordings stay in the log)"""
+        if self.resume_task:
+            self.resume_task.cancel()
+        self.timeouts.close()
+        self.recording_log.close()
+
+    async def resume_recordings(self, saved_recordings: List[SavedRecording]):
+        """Reattach to the recorded and control messages of recordings left in the log"""
+        await self.bot.wait_until_ready()
+        resumed = 0
+        for saved in saved_recordings:
+            try:
+                channel = self.bot.get_channel(saved.channel_id) or await self.bot.fetch_channel(saved.channel_id)
+                message = await channel.fetch_message(saved.message_id)
+                control_message = await channel.fetch_message(saved.control_id)
+            except discord.HTTPException as e:
+                print(f"Could not resume recording of message {saved.message_id}: {e}")
+                self.recording_log.end(saved.message_id)
+                continue
+
+            recorder = IDRecorder(message, saved.user_id, control_message, saved.user_mention)
+            recorder.ids = saved.ids
+            recorder.last_activity = saved.last_activity
+            self.recorders[message.id] = recorder
+            self.bot.add_view(StopRecordingView(recorder, self), message_id=control_message.id)
+
+            # Pick up edits made while the bot was offline
+            new_ids = await recorder.update_ids_and_display()
+            if new_ids:
+                self.recording_log.add_ids(message.id, new_ids)
+            time_remaining = RECORDING_TIMEOUT - (time.time() - recorder.last_activity)
+            self.timeouts.schedule(message.id, max(0.0, time_remaining))
+            resumed += 1
+
+        if resumed:
+            print(f"Resumed {resumed} ID recording(s)")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """After a reconnect with a new session, pick up edits missed while disconnected"""
+        for message_id, recorder in list(self.recorders.items()):
+            try:
+                message = await recorder.message.channel.fetch_message(message_id)
+            except discord.HTTPException:
+                continue
+            if recorder.is_recording:
+                recorder.message = message
+                await self.update_recording(recorder)
+
+    async def update_recording(self, recorder: IDRecorder):
+        """Scan the recorded message, logging new IDs and pushing back the timeout"""
+        new_ids = await recorder.update_ids_and_display()
+        if new_ids:
+            self.recording_log.add_ids(recorder.message.id, new_ids)
+            self.timeouts.schedule(recorder.message.id, RECORDING_TIMEOUT)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message):
@@ -132,7 +330,7 @@ class EventCog(commands.Cog):
             recorder = self.recorders[after.id]
             if recorder.is_recording:
                 recorder.message = after
-                await recorder.update_ids_and_display()
+                await self.update_recording(recorder)
 
     @commands.command(name='id')
     async def record_ids(self, ctx: commands.Context):
@@ -190,85 +388,100 @@ class EventCog(commands.Cog):
         recorder.control_message = control_msg
 
         # Now update IDs and add to recorders
-        await recorder.update_ids_and_display()
+        self.recording_log.start(replied_message.id, ctx.channel.id, control_msg.id, ctx.author.id, ctx.author.mention)
+        new_ids = await recorder.update_ids_and_display()
+        if new_ids:
+            self.recording_log.add_ids(replied_message.id, new_ids)
         self.recorders[replied_message.id] = recorder
 
-        # Start timeout monitoring task
-        asyncio.create_task(self.monitor_timeout(recorder))
-
-    async def monitor_timeout(self, recorder: IDRecorder):
-        """Monitor for timeout only - ID updates happen immediately in on_message_edit"""
-        while recorder.is_recording:
-            await asyncio.sleep(INACTIVITY_CHECK_INTERVAL)
-
-            if not recorder.is_recording:
-                break
+        # Auto-stop after RECORDING_TIMEOUT seconds without new IDs
+        self.timeouts.schedule(replied_message.id, RECORDING_TIMEOUT)
 
-            time_since_activity = time.time() - recorder.last_activity
+    async def recording_timed_out(self, message_id: int):
+        """Stop a recording whose inactivity deadline passed - ID updates happen immediately in on_message_edit"""
+        recorder = self.recorders.get(message_id)
+        if not recorder or not recorder.is_recording:
+            return
 
-            if time_since_activity >= RECORDING_TIMEOUT:
-                # Auto-stop due to inactivity
-                recorder.is_recording = False
+        # Auto-stop due to inactivity
+        recorder.is_recording = False
 
-                # Update control message
-                embed = discord.Embed(
-                    title="⏹️ Recording Stopped (Timeout)",
-                    description=f"Recording automatically stopped due to inactivity.\n\n"
-                               f"**IDs found:** {len(recorder.ids)}",
-                    color=EMBED_COLOR
-                )
+        # Update control message
+        embed = discord.Embed(
+            title="⏹️ Recording Stopped (Timeout)",
+            description=f"Recording automatically stopped due to inactivity.\n\n"
+                       f"**IDs found:** {len(recorder.ids)}",
+            color=EMBED_COLOR
+        )
 
-                try:
-                    # Disable the button
-                    view = discord.ui.View()
-                    button = discord.ui.Button(label="Stop Recording", style=discord.ButtonStyle.danger, disabled=True)
-                    view.add_item(button)
-                    await recorder.control_message.edit(embed=embed, view=view)
-                except:
-                    pass
+        try:
+            # Disable the button
+            view = discord.ui.View()
+            button = discord.ui.Button(label="Stop Recording", style=discord.ButtonStyle.danger, disabled=True)
+            view.add_item(button)
+            await recorder.control_message.edit(embed=embed, view=view)
+        except:
+            pass
 
-                # Show results
-                await self.show_results(recorder.control_message.channel, recorder, None)
-                break
+        # Show results
+        await self.show_results(recorder.control_message.channel, recorder, None)
 
     async def show_results(self, channel: discord.TextChannel, recorder: IDRecorder, stopped_by: Optional[discord.User]):
         """Display the recorded IDs with pagination if needed"""
         # Remove from active recorders
         if recorder.message.id in self.recorders:
             del self.recorders[recorder.message.id]
+        self.timeouts.cancel(recorder.message.id)
+        self.recording_log.end(recorder.message.id)
+        recorder.stop_display()
 
         if not recorder.ids:
             await channel.send("No Pokemon IDs were found!")
             return
 
-        # Sort IDs (descending - newest first)
-        sorted_ids = sorted(recorder.ids, key=lambda x: int(x), reverse=True)
-
-        # Format as space-separated string
-        id_string = ' '.join(sorted_ids)
+        result = RecordingResult(recorder.message.id, recorder.ids, stopped_by.name if stopped_by else None)
+        self.results.put(recorder.message.id, result)
 
         # Check if pagination is needed
-        if len(sorted_ids) <= IDS_PER_PAGE:
+        if len(result) <= IDS_PER_PAGE:
             # Single page - send as plain message with backticks
-            footer_text = f"Total IDs: {len(sorted_ids)}"
+            footer_text = f"Total IDs: {len(result)}"
             if stopped_by:
                 footer_text += f" • Stopped by {stopped_by.name}"
 
-            await channel.send(f"{footer_text}\n```\n{id_string}\n```")
+            await channel.send(f"{footer_text}\n```\n{result.page(0)}\n```")
         else:
-            # Multiple pages needed
-            pages = []
-            for i in range(0, len(sorted_ids), IDS_PER_PAGE):
-                page_ids = sorted_ids[i:i + IDS_PER_PAGE]
-                pages.append(' '.join(page_ids))
-
-            view = IDPaginationView(pages, len(sorted_ids))
+            # Multiple pages needed; big results come with the whole list as a file
+            view = IDPaginationView(result)
             content = view.get_message_content()
-            if stopped_by:
-                content = content.replace(f"Total IDs: {len(sorted_ids)}", f"Total IDs: {len(sorted_ids)} • Stopped by {stopped_by.name}")
-            message = await channel.send(content=content, view=view)
+            if len(result) >= EXPORT_ATTACH_THRESHOLD:
+                message = await channel.send(content=content, view=view, file=result.export('txt'))
+            else:
+                message = await channel.send(content=content, view=view)
             view.message = message
 
+    @commands.command(name='idexport')
+    async def export_ids(self, ctx: commands.Context, file_format: str = 'txt'):
+        """
+        Download the IDs of a finished recording as a file.
+        Usage: Reply to the recorded message with !idexport [txt|csv]
+        """
+        file_format = file_format.lower().lstrip('.')
+        if file_format not in ('txt', 'csv'):
+            await ctx.send("❌ Pick a file format: `txt` or `csv`")
+            return
+
+        if not ctx.message.reference:
+            await ctx.send("❌ Please reply to the recorded message to export its IDs!")
+            return
+
+        result = self.results.get(ctx.message.reference.message_id)
+        if result is None:
+            await ctx.send("❌ No recent results for that message! Record it with `!id` first.")
+            return
+
+        await ctx.send(f"Total IDs: {len(result)}", file=result.export(file_format))
+
 async def setup(bot):
     """Setup function to load the cog"""
     await bot.add_cog(EventCog(bot))
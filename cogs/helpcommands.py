@@ -273,7 +273,9 @@ class HelpDropdown(discord.ui.Select):
                 "1️⃣ Find a message with Pokemon embeds (from bot)\n"
                 "2️⃣ Reply to that message with `!id`\n"
                 "3️⃣ Bot starts recording IDs automatically\n"
-                "4️⃣ Click **Stop Recording** button when done"
+                "4️⃣ Click **Stop Recording** button when done\n\n"
+                "**`!idexport [txt|csv]`** (Reply to the recorded message)\n"
+                "Download the last results as a file"
             ),
             inline=False
         )
@@ -299,7 +301,8 @@ class HelpDropdown(discord.ui.Select):
                 "• **Sorted list** (newest to oldest)\n"
                 "• **Paginated view** if more than 50 IDs\n"
                 "• **Copy-ready format** in code blocks\n"
-                "• **Space-separated** for easy copying"
+                "• **Space-separated** for easy copying\n"
+                "• **.txt / .csv download** buttons (attached automatically for big results)"
             ),
             inline=False
         )
@@ -309,7 +312,6 @@ class HelpDropdown(discord.ui.Select):
             value=(
                 "**Timeout:** 10 minutes of no new IDs\n"
                 "**IDs per page:** 50\n"
-                "**Check interval:** 30 seconds\n"
                 "**ID Format:** Must be in backticks (`` `123456` ``)\n\n"
                 "⏱️ Timer resets when new IDs are detected!"
             ),
@@ -1,53 +1,53 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional, List, Dict
+from typing import Optional, List
 from config import EMBED_COLOR
+from id_lists import IDListStore
+from storage import IDList, PokemonID
 
 class EvolveListView(discord.ui.View):
-    """View for evolve list with tabs for 1x and 2x uses"""
-    def __init__(self, once_ids: List[str], twice_ids: List[str], ids_per_page: int = 50):
+    """View for evolve list with tabs for 1x and 2x uses, fetching one page at a time"""
+    def __init__(self, store: IDListStore, user_id: int, ids_per_page: int = 50):
         super().__init__(timeout=180)
-        self.once_ids = once_ids
-        self.twice_ids = twice_ids
+        self.store = store
+        self.user_id = user_id
         self.ids_per_page = ids_per_page
         self.current_tab = "once"  # Start with once (priority)
         self.current_page = 0
+        self.page_ids: List[PokemonID] = []
+        self.tab_total = 0  # IDs in the current tab
+        self.total_ids = 0  # IDs in both tabs
         self.message: Optional[discord.Message] = None
 
-        # Create pages for each tab
-        self.once_pages = self._create_pages(once_ids)
-        self.twice_pages = self._create_pages(twice_ids)
+    @property
+    def page_count(self) -> int:
+        return -(-self.tab_total // self.ids_per_page)
 
-    def _create_pages(self, ids: List[str]) -> List[str]:
-        """Create pages from ID list"""
-        if not ids:
-            return []
-
-        pages = []
-        for i in range(0, len(ids), self.ids_per_page):
-            page_ids = ids[i:i + self.ids_per_page]
-            pages.append(' '.join(page_ids))
-        return pages
+    async def load_page(self, page: int):
+        """Fetch a page of the current tab (the last one if the tab shrank past it)"""
+        uses = 1 if self.current_tab == "once" else 2
+        self.page_ids, self.tab_total, self.total_ids = await self.store.page(
+            self.user_id, uses, page * self.ids_per_page, self.ids_per_page
+        )
+        if page >= self.page_count > 0:
+            page = self.page_count - 1
+            self.page_ids, self.tab_total, self.total_ids = await self.store.page(
+                self.user_id, uses, page * self.ids_per_page, self.ids_per_page
+            )
+        self.current_page = min(page, max(self.page_count - 1, 0))
 
     def get_embed(self) -> discord.Embed:
         """Get embed for current tab and page"""
-        if self.current_tab == "once":
-            pages = self.once_pages
-            tab_name = "1x Use (Priority)"
-            total = len(self.once_ids)
-        else:
-            pages = self.twice_pages
-            tab_name = "2x Uses"
-            total = len(self.twice_ids)
+        tab_name = "1x Use (Priority)" if self.current_tab == "once" else "2x Uses"
 
-        if not pages:
+        if not self.page_ids:
             description = "```\nNo IDs in this category\n```"
             footer_text = f"{tab_name} • 0 ID(s)"
             title = f"📋 Your Evolve List - {tab_name}"
         else:
-            description = f"```\n{pages[self.current_page]}\n```"
-            footer_text = f"{total} ID(s) • Page {self.current_page + 1}/{len(pages)}"
+            description = f"```\n{' '.join(map(str, self.page_ids))}\n```"
+            footer_text = f"{self.tab_total} ID(s) • Page {self.current_page + 1}/{self.page_count}"
             title = f"📋 Your Evolve List - {tab_name}"
 
         embed = discord.Embed(
@@ -61,29 +61,27 @@ class EvolveListView(discord.ui.View):
     @discord.ui.button(label="Once (1x) ⭐", style=discord.ButtonStyle.primary, custom_id="tab_once")
     async def once_tab(self, interaction: discord.Interaction, button: discord.ui.Button):
         self.current_tab = "once"
-        self.current_page = 0
+        await self.load_page(0)
         await interaction.response.edit_message(embed=self.get_embed(), view=self)
 
     @discord.ui.button(label="Twice (2x)", style=discord.ButtonStyle.secondary, custom_id="tab_twice")
     async def twice_tab(self, interaction: discord.Interaction, button: discord.ui.Button):
         self.current_tab = "twice"
-        self.current_page = 0
+        await self.load_page(0)
         await interaction.response.edit_message(embed=self.get_embed(), view=self)
 
     @discord.ui.button(label="◀", style=discord.ButtonStyle.primary, custom_id="prev_page_evolve")
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        pages = self.once_pages if self.current_tab == "once" else self.twice_pages
-        if pages and self.current_page > 0:
-            self.current_page -= 1
+        if self.current_page > 0:
+            await self.load_page(self.current_page - 1)
             await interaction.response.edit_message(embed=self.get_embed(), view=self)
         else:
             await interaction.response.defer()
 
     @discord.ui.button(label="▶", style=discord.ButtonStyle.primary, custom_id="next_page_evolve")
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        pages = self.once_pages if self.current_tab == "once" else self.twice_pages
-        if pages and self.current_page < len(pages) - 1:
-            self.current_page += 1
+        if self.current_page < self.page_count - 1:
+            await self.load_page(self.current_page + 1)
             await interaction.response.edit_message(embed=self.get_embed(), view=self)
         else:
             await interaction.response.defer()
@@ -126,26 +124,17 @@ class AddIDsModal(discord.ui.Modal, title="Add IDs to Evolve List"):
             await interaction.response.send_message("❌ Please provide at least one ID!", ephemeral=True)
             return
 
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
-        added_count = 0
-
-        for pokemon_id in ids_to_add:
-            exists = any(item['id'] == pokemon_id for item in current_ids)
-            if not exists:
-                current_ids.append({'id': pokemon_id, 'uses': uses})
-                added_count += 1
-
-        await self.cog.save_user_ids(interaction.user.id, current_ids)
+        added_count, total = await self.cog.store.add(interaction.user.id, ids_to_add, uses)
 
         use_text = "1 use" if uses == 1 else "2 uses"
         if added_count > 0:
             await interaction.response.send_message(
-                f"✅ Added {added_count} ID(s) with {use_text} to your evolve list! Total IDs: {len(current_ids)}",
+                f"✅ Added {added_count} ID(s) with {use_text} to your evolve list! Total IDs: {total}",
                 ephemeral=True
             )
         else:
             await interaction.response.send_message(
-                f"⚠️ No new IDs added (all were duplicates). Total IDs: {len(current_ids)}",
+                f"⚠️ No new IDs added (all were duplicates). Total IDs: {total}",
                 ephemeral=True
             )
 
@@ -184,40 +173,21 @@ class RemoveIDsModal(discord.ui.Modal, title="Remove IDs from Evolve List"):
             await interaction.response.send_message("❌ Please provide at least one ID!", ephemeral=True)
             return
 
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
+        removed_count, remaining = await self.cog.store.remove(interaction.user.id, ids_to_remove, remove_once)
 
-        if not current_ids:
+        if not removed_count and not remaining:
             await interaction.response.send_message("❌ Your evolve list is empty!", ephemeral=True)
             return
 
-        removed_count = 0
-        new_ids = []
-
-        for item in current_ids:
-            if item['id'] in ids_to_remove:
-                if remove_once and item['uses'] > 1:
-                    new_ids.append({'id': item['id'], 'uses': item['uses'] - 1})
-                    removed_count += 1
-                elif remove_once and item['uses'] == 1:
-                    removed_count += 1
-                elif not remove_once:
-                    removed_count += 1
-                else:
-                    new_ids.append(item)
-            else:
-                new_ids.append(item)
-
-        await self.cog.save_user_ids(interaction.user.id, new_ids)
-
         if removed_count > 0:
             action = "use(s) removed from" if remove_once else "ID(s) removed from"
             await interaction.response.send_message(
-                f"✅ {removed_count} {action} your evolve list! Remaining IDs: {len(new_ids)}",
+                f"✅ {removed_count} {action} your evolve list! Remaining IDs: {remaining}",
                 ephemeral=True
             )
         else:
             await interaction.response.send_message(
-                f"⚠️ No IDs were removed (not found in your list). Total IDs: {len(new_ids)}",
+                f"⚠️ No IDs were removed (not found in your list). Total IDs: {remaining}",
                 ephemeral=True
             )
 
@@ -244,44 +214,19 @@ class EvolveIDsModal(discord.ui.Modal, title="Evolve Pokemon IDs"):
             await interaction.response.send_message("❌ Count must be a valid number!", ephemeral=True)
             return
 
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
-
-        if not current_ids:
-            await interaction.response.send_message("❌ Your evolve list is empty! Add IDs first.", ephemeral=True)
-            return
+        ids_to_evolve, remaining = await self.cog.store.pop(interaction.user.id, count)
 
-        available_count = len(current_ids)
-        if count > available_count:
-            await interaction.response.send_message(
-                f"❌ You only have {available_count} ID(s) available in your evolve list!",
-                ephemeral=True
-            )
+        if ids_to_evolve is None:
+            if not remaining:
+                await interaction.response.send_message("❌ Your evolve list is empty! Add IDs first.", ephemeral=True)
+            else:
+                await interaction.response.send_message(
+                    f"❌ You only have {remaining} ID(s) available in your evolve list!",
+                    ephemeral=True
+                )
             return
 
-        # Priority: Pick from 1x (once) first, then 2x (twice)
-        ids_to_evolve, remaining_ids = self.cog.select_ids_with_priority(current_ids, count)
-
-        await self.cog.save_user_ids(interaction.user.id, remaining_ids)
-
-        ids_string = ' '.join([item['id'] for item in ids_to_evolve])
-
-        # Count how many came from each category
-        once_used = sum(1 for item in ids_to_evolve if item['uses'] == 1)
-        twice_used = sum(1 for item in ids_to_evolve if item['uses'] == 2)
-        
-        footer_parts = []
-        if once_used > 0:
-            footer_parts.append(f"{once_used} from 1x")
-        if twice_used > 0:
-            footer_parts.append(f"{twice_used} from 2x")
-        footer_text = f"{count} ID(s) used ({', '.join(footer_parts)}) • {len(remaining_ids)} remaining"
-
-        embed = discord.Embed(
-            description=f"```\n<@716390085896962058> evolve {ids_string}\n```",
-            color=EMBED_COLOR
-        )
-        embed.set_footer(text=footer_text)
-
+        embed = self.cog.format_evolve_embed(ids_to_evolve, remaining)
         await interaction.response.send_message(embed=embed)
 
 class EvolvePanelView(discord.ui.View):
@@ -302,33 +247,29 @@ class EvolvePanelView(discord.ui.View):
 
     @discord.ui.button(label="📋 View List", style=discord.ButtonStyle.primary, row=0)
     async def list_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
+        view = EvolveListView(self.cog.store, interaction.user.id)
+        await view.load_page(0)
 
-        if not current_ids:
+        if not view.total_ids:
             await interaction.response.send_message(
                 "❌ Your evolve list is empty! Add IDs using the Add button.",
                 ephemeral=True
             )
             return
 
-        once_ids = [item['id'] for item in current_ids if item['uses'] == 1]
-        twice_ids = [item['id'] for item in current_ids if item['uses'] == 2]
-
-        view = EvolveListView(once_ids, twice_ids)
         embed = view.get_embed()
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
     @discord.ui.button(label="🗑️ Clear All", style=discord.ButtonStyle.secondary, row=1)
     async def clear_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
+        cleared_count = await self.cog.store.clear(interaction.user.id)
 
-        if not current_ids:
+        if not cleared_count:
             await interaction.response.send_message("❌ Your evolve list is already empty!", ephemeral=True)
             return
 
-        await self.cog.save_user_ids(interaction.user.id, [])
         await interaction.response.send_message(
-            f"✅ Cleared all {len(current_ids)} ID(s) from your evolve list!",
+            f"✅ Cleared all {cleared_count} ID(s) from your evolve list!",
             ephemeral=True
         )
 
@@ -343,77 +284,40 @@ class HelpEvolve(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = None
+        self.store = IDListStore('evolve_ids')
 
     async def cog_load(self):
         """Initialize database connection"""
         self.db = self.bot.db if hasattr(self.bot, 'db') else None
+        self.store.db = self.db
         if not self.db:
             print("Warning: Database not available in HelpEvolve cog")
 
-    async def get_user_ids(self, user_id: int) -> List[Dict]:
-        """Get user's evolve IDs from database"""
-        if not self.db:
-            return []
+    async def cog_unload(self):
+        """Report how well the evolve list cache did"""
+        print(f"Evolve list cache: {self.store.stats()}")
 
-        collection = self.db.db.evolve_ids
-        user_data = await collection.find_one({"user_id": user_id})
+    def format_evolve_embed(self, evolved: IDList, remaining: int) -> discord.Embed:
+        """Build the embed with the evolve command for the given IDs"""
+        ids_string = ' '.join(str(pokemon_id) for pokemon_id in evolved.once + evolved.twice)
 
-        if user_data and 'ids' in user_data:
-            return user_data['ids']
-        return []
+        # Count how many came from each category
+        once_used = len(evolved.once)
+        twice_used = len(evolved.twice)
 
-    async def save_user_ids(self, user_id: int, ids: List[Dict]):
-        """Save user's evolve IDs to database"""
-        if not self.db:
-            return
+        footer_parts = []
+        if once_used > 0:
+            footer_parts.append(f"{once_used} from 1x")
+        if twice_used > 0:
+            footer_parts.append(f"{twice_used} from 2x")
+        footer_text = f"{len(evolved)} ID(s) used ({', '.join(footer_parts)}) • {remaining} remaining"
 
-        collection = self.db.db.evolve_ids
-        await collection.update_one(
-            {"user_id": user_id},
-            {"$set": {"ids": ids}},
-            upsert=True
+        embed = discord.Embed(
+            description=f"```\n<@716390085896962058> evolve {ids_string}\n```",
+            color=EMBED_COLOR
         )
-
-    def select_ids_with_priority(self, current_ids: List[Dict], count: int) -> tuple[List[Dict], List[Dict]]:
-        """
-        Select IDs with priority: 1x (once) first, then 2x (twice)
-        Returns: (ids_to_evolve, remaining_ids)
-        """
-        # Separate into once and twice lists
-        once_ids = [item for item in current_ids if item['uses'] == 1]
-        twice_ids = [item for item in current_ids if item['uses'] == 2]
-
-        ids_to_evolve = []
-        
-        # First, take from once (1x) list
-        if len(once_ids) >= count:
-            # We have enough in once list
-            ids_to_evolve = once_ids[:count]
-            remaining_once = once_ids[count:]
-            remaining_twice = twice_ids
-        else:
-            # Take all from once, then fill from twice
-            ids_to_evolve = once_ids.copy()
-            needed = count - len(once_ids)
-            ids_to_evolve.extend(twice_ids[:needed])
-            remaining_once = []
-            remaining_twice = twice_ids[needed:]
-
-        # Build remaining IDs list
-        remaining_ids = []
-        
-        # Add remaining once IDs (these stay as is)
-        remaining_ids.extend(remaining_once)
-        
-        # Add remaining twice IDs (these stay as is)
-        remaining_ids.extend(remaining_twice)
-        
-        # For twice IDs that were used, add them back with uses-1
-        for item in ids_to_evolve:
-            if item['uses'] == 2:
-                remaining_ids.append({'id': item['id'], 'uses': 1})
-
-        return ids_to_evolve, remaining_ids
+        embed.set_footer(text=footer_text)
+        return embed
 
     @commands.command(name='evolvepanel', aliases=['ep'])
     async def evolve_panel(self, ctx: commands.Context):
@@ -463,23 +367,13 @@ class HelpEvolve(commands.Cog):
             await ctx.reply("❌ Please provide at least one ID!", mention_author=False)
             return
 
-        current_ids = await self.get_user_ids(ctx.author.id)
-
-        added_count = 0
-        for pokemon_id in ids_to_add:
-            exists = any(item['id'] == pokemon_id for item in current_ids)
-            if not exists:
-                current_ids.append({'id': pokemon_id, 'uses': uses})
-                added_count += 1
-
-        await self.save_user_ids(ctx.author.id, current_ids)
+        added_count, total_count = await self.store.add(ctx.author.id, ids_to_add, uses)
 
         use_text = "1 use" if uses == 1 else "2 uses"
         if added_count > 0:
-            total_count = len(current_ids)
             await ctx.reply(f"✅ Added {added_count} ID(s) with {use_text} to your evolve list! Total IDs: {total_count}", mention_author=False)
         else:
-            await ctx.reply(f"⚠️ No new IDs added (all were duplicates). Total IDs: {len(current_ids)}", mention_author=False)
+            await ctx.reply(f"⚠️ No new IDs added (all were duplicates). Total IDs: {total_count}", mention_author=False)
 
     @commands.command(name='evolveremove', aliases=['er'])
     async def evolve_remove(self, ctx: commands.Context, *args):
@@ -502,36 +396,17 @@ class HelpEvolve(commands.Cog):
             await ctx.reply("❌ Please provide at least one ID!", mention_author=False)
             return
 
-        current_ids = await self.get_user_ids(ctx.author.id)
+        removed_count, remaining = await self.store.remove(ctx.author.id, ids_to_remove, remove_once)
 
-        if not current_ids:
+        if not removed_count and not remaining:
             await ctx.reply("❌ Your evolve list is empty!", mention_author=False)
             return
 
-        removed_count = 0
-        new_ids = []
-
-        for item in current_ids:
-            if item['id'] in ids_to_remove:
-                if remove_once and item['uses'] > 1:
-                    new_ids.append({'id': item['id'], 'uses': item['uses'] - 1})
-                    removed_count += 1
-                elif remove_once and item['uses'] == 1:
-                    removed_count += 1
-                elif not remove_once:
-                    removed_count += 1
-                else:
-                    new_ids.append(item)
-            else:
-                new_ids.append(item)
-
-        await self.save_user_ids(ctx.author.id, new_ids)
-
         if removed_count > 0:
             action = "use(s) removed from" if remove_once else "ID(s) removed from"
-            await ctx.reply(f"✅ {removed_count} {action} your evolve list! Remaining IDs: {len(new_ids)}", mention_author=False)
+            await ctx.reply(f"✅ {removed_count} {action} your evolve list! Remaining IDs: {remaining}", mention_author=False)
         else:
-            await ctx.reply(f"⚠️ No IDs were removed (not found in your list). Total IDs: {len(new_ids)}", mention_author=False)
+            await ctx.reply(f"⚠️ No IDs were removed (not found in your list). Total IDs: {remaining}", mention_author=False)
 
     @commands.command(name='evolveclear', aliases=['ec'])
     async def evolve_clear(self, ctx: commands.Context):
@@ -540,15 +415,13 @@ class HelpEvolve(commands.Cog):
         Usage: !evolveclear
         Aliases: !ec
         """
-        current_ids = await self.get_user_ids(ctx.author.id)
+        cleared_count = await self.store.clear(ctx.author.id)
 
-        if not current_ids:
+        if not cleared_count:
             await ctx.reply("❌ Your evolve list is already empty!", mention_author=False)
             return
 
-        await self.save_user_ids(ctx.author.id, [])
-
-        await ctx.reply(f"✅ Cleared all {len(current_ids)} ID(s) from your evolve list!", mention_author=False)
+        await ctx.reply(f"✅ Cleared all {cleared_count} ID(s) from your evolve list!", mention_author=False)
 
     @commands.command(name='evolvelist', aliases=['el'])
     async def evolve_list(self, ctx: commands.Context):
@@ -557,16 +430,13 @@ class HelpEvolve(commands.Cog):
         Usage: !evolvelist
         Aliases: !el
         """
-        current_ids = await self.get_user_ids(ctx.author.id)
+        view = EvolveListView(self.store, ctx.author.id)
+        await view.load_page(0)
 
-        if not current_ids:
+        if not view.total_ids:
             await ctx.reply("❌ Your evolve list is empty! Add IDs using `!evolveadd` first.", mention_author=False)
             return
 
-        once_ids = [item['id'] for item in current_ids if item['uses'] == 1]
-        twice_ids = [item['id'] for item in current_ids if item['uses'] == 2]
-
-        view = EvolveListView(once_ids, twice_ids)
         embed = view.get_embed()
         message = await ctx.reply(embed=embed, view=view, mention_author=False)
         view.message = message
@@ -582,41 +452,16 @@ class HelpEvolve(commands.Cog):
             await ctx.send("❌ Please provide a positive number!")
             return
 
-        current_ids = await self.get_user_ids(ctx.author.id)
+        ids_to_evolve, remaining = await self.store.pop(ctx.author.id, count)
 
-        if not current_ids:
-            await ctx.send("❌ Your evolve list is empty! Add IDs using `!evolveadd` first.")
-            return
-
-        available_count = len(current_ids)
-        if count > available_count:
-            await ctx.send(f"❌ You only have {available_count} ID(s) available in your evolve list!")
+        if ids_to_evolve is None:
+            if not remaining:
+                await ctx.send("❌ Your evolve list is empty! Add IDs using `!evolveadd` first.")
+            else:
+                await ctx.send(f"❌ You only have {remaining} ID(s) available in your evolve list!")
             return
 
-        # Priority: Pick from 1x (once) first, then 2x (twice)
-        ids_to_evolve, remaining_ids = self.select_ids_with_priority(current_ids, count)
-
-        await self.save_user_ids(ctx.author.id, remaining_ids)
-
-        ids_string = ' '.join([item['id'] for item in ids_to_evolve])
-
-        # Count how many came from each category
-        once_used = sum(1 for item in ids_to_evolve if item['uses'] == 1)
-        twice_used = sum(1 for item in ids_to_evolve if item['uses'] == 2)
-        
-        footer_parts = []
-        if once_used > 0:
-            footer_parts.append(f"{once_used} from 1x")
-        if twice_used > 0:
-            footer_parts.append(f"{twice_used} from 2x")
-        footer_text = f"{count} ID(s) used ({', '.join(footer_parts)}) • {len(remaining_ids)} remaining"
-
-        embed = discord.Embed(
-            description=f"```\n<@716390085896962058> evolve {ids_string}\n```",
-            color=EMBED_COLOR
-        )
-        embed.set_footer(text=footer_text)
-
+        embed = self.format_evolve_embed(ids_to_evolve, remaining)
         await ctx.send(embed=embed)
 
     @app_commands.command(name='evolve', description='Evolve Pokemon IDs from your list')
@@ -630,47 +475,22 @@ class HelpEvolve(commands.Cog):
             await interaction.response.send_message("❌ Please provide a positive number!", ephemeral=True)
             return
 
-        current_ids = await self.get_user_ids(interaction.user.id)
+        ids_to_evolve, remaining = await self.store.pop(interaction.user.id, count)
 
-        if not current_ids:
-            await interaction.response.send_message(
-                "❌ Your evolve list is empty! Add IDs using `!evolveadd` first.",
-                ephemeral=True
-            )
-            return
-
-        available_count = len(current_ids)
-        if count > available_count:
-            await interaction.response.send_message(
-                f"❌ You only have {available_count} ID(s) available in your evolve list!",
-                ephemeral=True
-            )
+        if ids_to_evolve is None:
+            if not remaining:
+                await interaction.response.send_message(
+                    "❌ Your evolve list is empty! Add IDs using `!evolveadd` first.",
+                    ephemeral=True
+                )
+            else:
+                await interaction.response.send_message(
+                    f"❌ You only have {remaining} ID(s) available in your evolve list!",
+                    ephemeral=True
+                )
             return
 
-        # Priority: Pick from 1x (once) first, then 2x (twice)
-        ids_to_evolve, remaining_ids = self.select_ids_with_priority(current_ids, count)
-
-        await self.save_user_ids(interaction.user.id, remaining_ids)
-
-        ids_string = ' '.join([item['id'] for item in ids_to_evolve])
-
-        # Count how many came from each category
-        once_used = sum(1 for item in ids_to_evolve if item['uses'] == 1)
-        twice_used = sum(1 for item in ids_to_evolve if item['uses'] == 2)
-        
-        footer_parts = []
-        if once_used > 0:
-            footer_parts.append(f"{once_used} from 1x")
-        if twice_used > 0:
-            footer_parts.append(f"{twice_used} from 2x")
-        footer_text = f"{count} ID(s) used ({', '.join(footer_parts)}) • {len(remaining_ids)} remaining"
-
-        embed = discord.Embed(
-            description=f"```\n<@716390085896962058> evolve {ids_string}\n```",
-            color=EMBED_COLOR
-        )
-        embed.set_footer(text=footer_text)
-
+        embed = self.format_evolve_embed(ids_to_evolve, remaining)
         await interaction.response.send_message(embed=embed)
 
 async def setup(bot):
@@ -1,40 +1,64 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional
+from typing import List, Optional
 from config import EMBED_COLOR
+from id_lists import IDListStore
+from storage import PokemonID
 
 class ReleaseListPaginationView(discord.ui.View):
-    """View for paginating release list"""
-    def __init__(self, pages: list, total_ids: int):
+    """View for paginating release list, fetching one page at a time"""
+    def __init__(self, store: IDListStore, user_id: int, ids_per_page: int = 150):
         super().__init__(timeout=180)
-        self.pages = pages
+        self.store = store
+        self.user_id = user_id
+        self.ids_per_page = ids_per_page
         self.current_page = 0
-        self.total_ids = total_ids
+        self.page_ids: List[PokemonID] = []
+        self.total_ids = 0
         self.message: Optional[discord.Message] = None
 
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-self.total_ids // self.ids_per_page))
+
+    async def load_page(self, page: int):
+        """Fetch a page of the list (the last one if the list shrank past it)"""
+        self.page_ids, self.total_ids, _ = await self.store.page(
+            self.user_id, 1, page * self.ids_per_page, self.ids_per_page
+        )
+        if page >= self.page_count and self.total_ids:
+            page = self.page_count - 1
+            self.page_ids, self.total_ids, _ = await self.store.page(
+                self.user_id, 1, page * self.ids_per_page, self.ids_per_page
+            )
+        self.current_page = min(page, self.page_count - 1)
+
     def get_embed(self) -> discord.Embed:
         """Get embed for current page"""
         embed = discord.Embed(
             title="📋 Your Release List",
-            description=f"```\n{self.pages[self.current_page]}\n```",
+            description=f"```\n{' '.join(map(str, self.page_ids))}\n```",
             color=EMBED_COLOR
         )
-        embed.set_footer(text=f"Total: {self.total_ids} ID(s) • Page {self.current_page + 1}/{len(self.pages)}")
+        if self.total_ids <= self.ids_per_page:
+            embed.set_footer(text=f"Total: {self.total_ids} ID(s)")
+        else:
+            embed.set_footer(text=f"Total: {self.total_ids} ID(s) • Page {self.current_page + 1}/{self.page_count}")
         return embed
 
     @discord.ui.button(label="◀", style=discord.ButtonStyle.primary, custom_id="prev_page_release")
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         if self.current_page > 0:
-            self.current_page -= 1
+            await self.load_page(self.current_page - 1)
             await interaction.response.edit_message(embed=self.get_embed(), view=self)
         else:
             await interaction.response.defer()
 
     @discord.ui.button(label="▶", style=discord.ButtonStyle.primary, custom_id="next_page_release")
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page < len(self.pages) - 1:
-            self.current_page += 1
+        if self.current_page < self.page_count - 1:
+            await self.load_page(self.current_page + 1)
             await interaction.response.edit_message(embed=self.get_embed(), view=self)
         else:
             await interaction.response.defer()
@@ -59,24 +83,16 @@ class AddReleaseIDsModal(discord.ui.Modal, title="Add IDs to Release List"):
             await interaction.response.send_message("❌ Please provide at least one ID!", ephemeral=True)
             return
 
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
-        added_count = 0
-
-        for pokemon_id in ids_to_add:
-            if pokemon_id not in current_ids:
-                current_ids.append(pokemon_id)
-                added_count += 1
-
-        await self.cog.save_user_ids(interaction.user.id, current_ids)
+        added_count, total = await self.cog.store.add(interaction.user.id, ids_to_add)
 
         if added_count > 0:
             await interaction.response.send_message(
-                f"✅ Added {added_count} ID(s) to your release list! Total IDs: {len(current_ids)}",
+                f"✅ Added {added_count} ID(s) to your release list! Total IDs: {total}",
                 ephemeral=True
             )
         else:
             await interaction.response.send_message(
-                f"⚠️ No new IDs added (all were duplicates). Total IDs: {len(current_ids)}",
+                f"⚠️ No new IDs added (all were duplicates). Total IDs: {total}",
                 ephemeral=True
             )
 
@@ -100,28 +116,20 @@ class RemoveReleaseIDsModal(discord.ui.Modal, title="Remove IDs from Release Lis
             await interaction.response.send_message("❌ Please provide at least one ID!", ephemeral=True)
             return
 
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
+        removed_count, remaining = await self.cog.store.remove(interaction.user.id, ids_to_remove)
 
-        if not current_ids:
+        if not removed_count and not remaining:
             await interaction.response.send_message("❌ Your release list is empty!", ephemeral=True)
             return
 
-        removed_count = 0
-        for pokemon_id in ids_to_remove:
-            if pokemon_id in current_ids:
-                current_ids.remove(pokemon_id)
-                removed_count += 1
-
-        await self.cog.save_user_ids(interaction.user.id, current_ids)
-
         if removed_count > 0:
             await interaction.response.send_message(
-                f"✅ Removed {removed_count} ID(s) from your release list! Remaining IDs: {len(current_ids)}",
+                f"✅ Removed {removed_count} ID(s) from your release list! Remaining IDs: {remaining}",
                 ephemeral=True
             )
         else:
             await interaction.response.send_message(
-                f"⚠️ No IDs were removed (not found in your list). Total IDs: {len(current_ids)}",
+                f"⚠️ No IDs were removed (not found in your list). Total IDs: {remaining}",
                 ephemeral=True
             )
 
@@ -148,33 +156,19 @@ class ReleaseIDsModal(discord.ui.Modal, title="Release Pokemon IDs"):
             await interaction.response.send_message("❌ Count must be a valid number!", ephemeral=True)
             return
 
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
+        released, remaining = await self.cog.store.pop(interaction.user.id, count)
 
-        if not current_ids:
-            await interaction.response.send_message("❌ Your release list is empty! Add IDs first.", ephemeral=True)
+        if released is None:
+            if not remaining:
+                await interaction.response.send_message("❌ Your release list is empty! Add IDs first.", ephemeral=True)
+            else:
+                await interaction.response.send_message(
+                    f"❌ You only have {remaining} ID(s) available in your release list!",
+                    ephemeral=True
+                )
             return
 
-        available_count = len(current_ids)
-        if count > available_count:
-            await interaction.response.send_message(
-                f"❌ You only have {available_count} ID(s) available in your release list!",
-                ephemeral=True
-            )
-            return
-
-        ids_to_release = current_ids[:count]
-        remaining_ids = current_ids[count:]
-
-        await self.cog.save_user_ids(interaction.user.id, remaining_ids)
-
-        ids_string = ' '.join(ids_to_release)
-
-        embed = discord.Embed(
-            description=f"```\n<@716390085896962058> r {ids_string}\n```",
-            color=EMBED_COLOR
-        )
-        embed.set_footer(text=f"{count} ID(s) removed from your release list • {len(remaining_ids)} remaining")
-
+        embed = self.cog.format_release_embed(released.ids(), remaining)
         await interaction.response.send_message(embed=embed)
 
 class ReleasePanelView(discord.ui.View):
@@ -195,47 +189,31 @@ class ReleasePanelView(discord.ui.View):
 
     @discord.ui.button(label="📋 View List", style=discord.ButtonStyle.primary, row=0)
     async def list_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
+        view = ReleaseListPaginationView(self.cog.store, interaction.user.id)
+        await view.load_page(0)
 
-        if not current_ids:
+        if not view.total_ids:
             await interaction.response.send_message(
                 "❌ Your release list is empty! Add IDs using the Add button.",
                 ephemeral=True
             )
             return
 
-        ids_string = ' '.join(current_ids)
-        ids_per_page = 150
-
-        if len(current_ids) <= ids_per_page:
-            embed = discord.Embed(
-                title="📋 Your Release List",
-                description=f"```\n{ids_string}\n```",
-                color=EMBED_COLOR
-            )
-            embed.set_footer(text=f"Total: {len(current_ids)} ID(s)")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+        if view.total_ids <= view.ids_per_page:
+            await interaction.response.send_message(embed=view.get_embed(), ephemeral=True)
         else:
-            pages = []
-            for i in range(0, len(current_ids), ids_per_page):
-                page_ids = current_ids[i:i + ids_per_page]
-                pages.append(' '.join(page_ids))
-
-            view = ReleaseListPaginationView(pages, len(current_ids))
-            embed = view.get_embed()
-            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+            await interaction.response.send_message(embed=view.get_embed(), view=view, ephemeral=True)
 
     @discord.ui.button(label="🗑️ Clear All", style=discord.ButtonStyle.secondary, row=1)
     async def clear_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        current_ids = await self.cog.get_user_ids(interaction.user.id)
+        cleared_count = await self.cog.store.clear(interaction.user.id)
 
-        if not current_ids:
+        if not cleared_count:
             await interaction.response.send_message("❌ Your release list is already empty!", ephemeral=True)
             return
 
-        await self.cog.save_user_ids(interaction.user.id, [])
         await interaction.response.send_message(
-            f"✅ Cleared all {len(current_ids)} ID(s) from your release list!",
+            f"✅ Cleared all {cleared_count} ID(s) from your release list!",
             ephemeral=True
         )
 
@@ -250,36 +228,29 @@ class HelpRelease(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = None
+        self.store = IDListStore('release_ids')
 
     async def cog_load(self):
         """Initialize database connection"""
         self.db = self.bot.db if hasattr(self.bot, 'db') else None
+        self.store.db = self.db
         if not self.db:
             print("Warning: Database not available in HelpRelease cog")
 
-    async def get_user_ids(self, user_id: int) -> list:
-        """Get user's release IDs from database"""
-        if not self.db:
-            return []
-
-        collection = self.db.db.release_ids
-        user_data = await collection.find_one({"user_id": user_id})
+    async def cog_unload(self):
+        """Report how well the release list cache did"""
+        print(f"Release list cache: {self.store.stats()}")
 
-        if user_data and 'ids' in user_data:
-            return user_data['ids']
-        return []
+    def format_release_embed(self, ids_to_release: List[PokemonID], remaining: int) -> discord.Embed:
+        """Build the embed with the release command for the given IDs"""
+        ids_string = ' '.join(map(str, ids_to_release))
 
-    async def save_user_ids(self, user_id: int, ids: list):
-        """Save user's release IDs to database"""
-        if not self.db:
-            return
-
-        collection = self.db.db.release_ids
-        await collection.update_one(
-            {"user_id": user_id},
-            {"$set": {"ids": ids}},
-            upsert=True
+        embed = discord.Embed(
+            description=f"```\n<@716390085896962058> r {ids_string}\n```",
+            color=EMBED_COLOR
         )
+        embed.set_footer(text=f"{len(ids_to_release)} ID(s) removed from your release list • {remaining} remaining")
+        return embed
 
     @commands.command(name='releasepanel', aliases=['rp'])
     async def release_panel(self, ctx: commands.Context):
@@ -317,20 +288,12 @@ class HelpRelease(commands.Cog):
             await ctx.reply("❌ Please provide at least one ID!", mention_author=False)
             return
 
-        current_ids = await self.get_user_ids(ctx.author.id)
-
-        added_count = 0
-        for pokemon_id in ids:
-            if pokemon_id not in current_ids:
-                current_ids.append(pokemon_id)
-                added_count += 1
-
-        await self.save_user_ids(ctx.author.id, current_ids)
+        added_count, total = await self.store.add(ctx.author.id, ids)
 
         if added_count > 0:
-            await ctx.reply(f"✅ Added {added_count} ID(s) to your release list! Total IDs: {len(current_ids)}", mention_author=False)
+            await ctx.reply(f"✅ Added {added_count} ID(s) to your release list! Total IDs: {total}", mention_author=False)
         else:
-            await ctx.reply(f"⚠️ No new IDs added (all were duplicates). Total IDs: {len(current_ids)}", mention_author=False)
+            await ctx.reply(f"⚠️ No new IDs added (all were duplicates). Total IDs: {total}", mention_author=False)
 
     @commands.command(name='releaseremove', aliases=['rr'])
     async def release_remove(self, ctx: commands.Context, *ids: str):
@@ -342,24 +305,16 @@ class HelpRelease(commands.Cog):
             await ctx.reply("❌ Please provide at least one ID!", mention_author=False)
             return
 
-        current_ids = await self.get_user_ids(ctx.author.id)
+        removed_count, remaining = await self.store.remove(ctx.author.id, ids)
 
-        if not current_ids:
+        if not removed_count and not remaining:
             await ctx.reply("❌ Your release list is empty!", mention_author=False)
             return
 
-        removed_count = 0
-        for pokemon_id in ids:
-            if pokemon_id in current_ids:
-                current_ids.remove(pokemon_id)
-                removed_count += 1
-
-        await self.save_user_ids(ctx.author.id, current_ids)
-
         if removed_count > 0:
-            await ctx.reply(f"✅ Removed {removed_count} ID(s) from your release list! Remaining IDs: {len(current_ids)}", mention_author=False)
+            await ctx.reply(f"✅ Removed {removed_count} ID(s) from your release list! Remaining IDs: {remaining}", mention_author=False)
         else:
-            await ctx.reply(f"⚠️ No IDs were removed (not found in your list). Total IDs: {len(current_ids)}", mention_author=False)
+            await ctx.reply(f"⚠️ No IDs were removed (not found in your list). Total IDs: {remaining}", mention_author=False)
 
     @commands.command(name='releaseclear', aliases=['rc'])
     async def release_clear(self, ctx: commands.Context):
@@ -367,15 +322,13 @@ class HelpRelease(commands.Cog):
         Clear all Pokemon IDs from your release list.
         Usage: !releaseclear or !rc
         """
-        current_ids = await self.get_user_ids(ctx.author.id)
+        cleared_count = await self.store.clear(ctx.author.id)
 
-        if not current_ids:
+        if not cleared_count:
             await ctx.reply("❌ Your release list is already empty!", mention_author=False)
             return
 
-        await self.save_user_ids(ctx.author.id, [])
-
-        await ctx.reply(f"✅ Cleared all {len(current_ids)} ID(s) from your release list!", mention_author=False)
+        await ctx.reply(f"✅ Cleared all {cleared_count} ID(s) from your release list!", mention_author=False)
 
     @commands.command(name='releaselist', aliases=['rl'])
     async def release_list(self, ctx: commands.Context):
@@ -383,33 +336,17 @@ class HelpRelease(commands.Cog):
         View all Pokemon IDs in your release list.
         Usage: !releaselist or !rl
         """
-        current_ids = await self.get_user_ids(ctx.author.id)
+        view = ReleaseListPaginationView(self.store, ctx.author.id)
+        await view.load_page(0)
 
-        if not current_ids:
+        if not view.total_ids:
             await ctx.reply("❌ Your release list is empty! Add IDs using `!releaseadd` first.", mention_author=False)
             return
 
-        ids_string = ' '.join(current_ids)
-        ids_per_page = 150
-
-        if len(current_ids) <= ids_per_page:
-            embed = discord.Embed(
-                title="📋 Your Release List",
-                description=f"```\n{ids_string}\n```",
-                color=EMBED_COLOR
-            )
-            embed.set_footer(text=f"Total: {len(current_ids)} ID(s)")
-
-            await ctx.reply(embed=embed, mention_author=False)
+        if view.total_ids <= view.ids_per_page:
+            await ctx.reply(embed=view.get_embed(), mention_author=False)
         else:
-            pages = []
-            for i in range(0, len(current_ids), ids_per_page):
-                page_ids = current_ids[i:i + ids_per_page]
-                pages.append(' '.join(page_ids))
-
-            view = ReleaseListPaginationView(pages, len(current_ids))
-            embed = view.get_embed()
-            message = await ctx.reply(embed=embed, view=view, mention_author=False)
+            message = await ctx.reply(embed=view.get_embed(), view=view, mention_author=False)
             view.message = message
 
     @commands.command(name='release', aliases=['r'])
@@ -422,30 +359,16 @@ class HelpRelease(commands.Cog):
             await ctx.reply("❌ Please provide a positive number!", mention_author=False)
             return
 
-        current_ids = await self.get_user_ids(ctx.author.id)
-
-        if not current_ids:
-            await ctx.reply("❌ Your release list is empty! Add IDs using `!releaseadd` first.", mention_author=False)
-            return
+        released, remaining = await self.store.pop(ctx.author.id, count)
 
-        available_count = len(current_ids)
-        if count > available_count:
-            await ctx.reply(f"❌ You only have {available_count} ID(s) available in your release list!", mention_author=False)
+        if released is None:
+            if not remaining:
+                await ctx.reply("❌ Your release list is empty! Add IDs using `!releaseadd` first.", mention_author=False)
+            else:
+                await ctx.reply(f"❌ You only have {remaining} ID(s) available in your release list!", mention_author=False)
             return
 
-        ids_to_release = current_ids[:count]
-        remaining_ids = current_ids[count:]
-
-        await self.save_user_ids(ctx.author.id, remaining_ids)
-
-        ids_string = ' '.join(ids_to_release)
-
-        embed = discord.Embed(
-            description=f"```\n<@716390085896962058> r {ids_string}\n```",
-            color=EMBED_COLOR
-        )
-        embed.set_footer(text=f"{count} ID(s) removed from your release list • {len(remaining_ids)} remaining")
-
+        embed = self.format_release_embed(released.ids(), remaining)
         await ctx.reply(embed=embed, mention_author=False)
 
     @app_commands.command(name='release', description='Release Pokemon IDs from your list')
@@ -459,36 +382,22 @@ class HelpRelease(commands.Cog):
             await interaction.response.send_message("❌ Please provide a positive number!", ephemeral=True)
             return
 
-        current_ids = await self.get_user_ids(interaction.user.id)
-
-        if not current_ids:
-            await interaction.response.send_message(
-                "❌ Your release list is empty! Add IDs using `!releaseadd` first.",
-                ephemeral=True
-            )
-            return
-
-        available_count = len(current_ids)
-        if count > available_count:
-            await interaction.response.send_message(
-                f"❌ You only have {available_count} ID(s) available in your release list!",
-                ephemeral=True
-            )
+        released, remaining = await self.store.pop(interaction.user.id, count)
+
+        if released is None:
+            if not remaining:
+                await interaction.response.send_message(
+                    "❌ Your release list is empty! Add IDs using `!releaseadd` first.",
+                    ephemeral=True
+                )
+            else:
+                await interaction.response.send_message(
+                    f"❌ You only have {remaining} ID(s) available in your release list!",
+                    ephemeral=True
+                )
             return
 
-        ids_to_release = current_ids[:count]
-        remaining_ids = current_ids[count:]
-
-        await self.save_user_ids(interaction.user.id, remaining_ids)
-
-        ids_string = ' '.join(ids_to_release)
-
-        embed = discord.Embed(
-            description=f"```\n<@716390085896962058> r {ids_string}\n```",
-            color=EMBED_COLOR
-        )
-        embed.set_footer(text=f"{count} ID(s) removed from your release list • {len(remaining_ids)} remaining")
-
+        embed = self.format_release_embed(released.ids(), remaining)
         await interaction.response.send_message(embed=embed)
 
 async def setup(bot):
@@ -1,73 +1,47 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import csv
-from typing import List, Dict, Optional
-from config import EMBED_COLOR
+from typing import List, Dict, Optional, Tuple
+from config import EMBED_COLOR, LIST_CACHE_SIZE
+from catalog import parse_spawn_rate
+from cache import LRUCache
+
+# Filter flags accepted by !list (prefix with not- to exclude)
+LIST_FILTER_FLAGS = {
+    't': 'type',
+    'r': 'region',
+    'g': 'gender',
+    'gender': 'gender',
+    'rate': 'rate'
+}
+
+# Attributes whose repeated flags must all match (--t fire --t flying); repeating
+# any other flag is the same as listing its values with commas
+LIST_AND_ATTRIBUTES = {'type'}
 
 class PokemonListHelper(commands.Cog):
-    """Cog for listing Pokémon based on type and region filters"""
+    """Cog for listing Pokémon based on type, region, gender and spawn rate filters"""
 
     def __init__(self, bot):
         self.bot = bot
-        self.pokemon_data = {}
-        self.spawn_rates = {}
-        self.load_data()
+        self.catalog = bot.catalog
+        self.list_cache = LRUCache(maxsize=LIST_CACHE_SIZE)  # Normalized filters -> (groups, embed payload)
+        self.list_cache_version = self.catalog.version
 
-    def load_data(self):
-        """Load Pokémon data and spawn rates from CSV files"""
-        try:
-            # Load pokemondata.csv (tab-separated)
-            with open('pokemondata.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f, delimiter='\t')
-                for row in reader:
-                    dex = int(row['Dex'])
-                    self.pokemon_data[dex] = {
-                        'name': row['Name'],
-                        'type1': row['Type 1'],
-                        'type2': row['Type 2'].strip() if row['Type 2'].strip() else None,
-                        'dex': dex,
-                        'region': self.get_region(dex)
-                    }
-
-            # Load spawnrates.csv (comma-separated)
-            with open('spawnrates.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    dex = int(row['Dex'])
-                    self.spawn_rates[dex] = row['Chance']
-
-            print(f'Loaded {len(self.pokemon_data)} Pokémon and {len(self.spawn_rates)} spawn rates')
-        except Exception as e:
-            print(f'Error loading Pokémon data: {e}')
-
-    def get_region(self, dex: int) -> str:
-        """Get region based on Dex number"""
-        if 1 <= dex <= 151:
-            return 'Kanto'
-        elif 152 <= dex <= 251:
-            return 'Johto'
-        elif 252 <= dex <= 386:
-            return 'Hoenn'
-        elif 387 <= dex <= 493:
-            return 'Sinnoh'
-        elif 494 <= dex <= 649:
-            return 'Unova'
-        elif 650 <= dex <= 721:
-            return 'Kalos'
-        elif 722 <= dex <= 809:
-            return 'Alola'
-        elif 810 <= dex <= 905:
-            return 'Galar'
-        elif 906 <= dex <= 1025:
-            return 'Paldea'
-        return 'Unknown'
+    async def cog_unload(self):
+        """Report how well the !list result cache did"""
+        print(f"List result cache: {self.list_cache.stats()}")
 
     def parse_list_command(self, args: str) -> Optional[Dict]:
-        """Parse command arguments to extract filters"""
+        """
+        Parse command arguments to extract filters.
+        Each --flag becomes an (attribute, values) clause; comma-separated
+        values are alternatives and a not- prefix excludes them. Repeated
+        --t flags are separate clauses, other repeated flags add alternatives.
+        """
         filters = {
-            'types': [],
-            'region': None,
+            'include': [],
+            'exclude': [],
             'show_all': False
         }
 
@@ -79,87 +53,112 @@ class PokemonListHelper(commands.Cog):
             if not part:
                 continue
 
-            # Check for type filter
-            if part.startswith('t '):
-                type_name = part[2:].strip().capitalize()
-                if len(filters['types']) < 2:  # Max 2 type filters
-                    filters['types'].append(type_name)
-
-            # Check for region filter
-            elif part.startswith('r '):
-                region_name = part[2:].strip().capitalize()
-                filters['region'] = region_name
-
             # Check for --all flag
-            elif part == 'all':
+            if part == 'all':
                 filters['show_all'] = True
+                continue
 
-        return filters
+            flag, _, value = part.partition(' ')
+            flag = flag.lower()
+            excluded = flag.startswith('not-')
+            if excluded:
+                flag = flag[4:]
 
-    def find_matching_pokemon(self, filters: Dict) -> Dict[str, List[str]]:
-        """Find Pokémon matching the filters, grouped by spawn rate"""
-        spawn_rate_groups = {
-            '1/225': [],
-            '1/337': [],
-            '1/674': [],
-            '1/899': []
-        }
+            attribute = LIST_FILTER_FLAGS.get(flag)
+            if not attribute:
+                continue
 
-        for dex, data in self.pokemon_data.items():
-            # Check if Pokémon has spawn rate data
-            if dex not in self.spawn_rates:
+            values = []
+            for item in value.split(','):
+                item = item.strip()
+                if not item:
+                    continue
+                if attribute in ('type', 'region'):
+                    item = item.capitalize()
+                elif attribute == 'gender':
+                    item = item.lower()
+                else:
+                    item = item.replace(' ', '')
+                values.append(item)
+
+            if not values:
                 continue
+            clauses = filters['exclude' if excluded else 'include']
+            merged = next((clause for clause in clauses if clause[0] == attribute), None)
+            if attribute in LIST_AND_ATTRIBUTES or not merged:
+                clauses.append((attribute, values))
+            else:
+                # A repeated --r/--g/--rate widens the match, like the comma form
+                merged[1].extend(values)
 
-            spawn_rate = self.spawn_rates[dex]
+        return self.normalize_filters(filters)
 
-            # Skip if spawn rate is not in our groups (unless --all is used)
-            if not filters['show_all'] and spawn_rate not in spawn_rate_groups:
-                continue
+    def normalize_filters(self, filters: Dict) -> Dict:
+        """Sort clauses and their values so equivalent queries look the same"""
+        return {
+            'include': sorted((attribute, sorted(set(values))) for attribute, values in filters['include']),
+            'exclude': sorted((attribute, sorted(set(values))) for attribute, values in filters['exclude']),
+            'show_all': filters['show_all']
+        }
 
-            # Check region filter
-            if filters['region'] and data['region'] != filters['region']:
-                continue
+    def filters_key(self, filters: Dict) -> Tuple:
+        """Hashable cache key for normalized filters"""
+        return (
+            tuple((attribute, tuple(values)) for attribute, values in filters['include']),
+            tuple((attribute, tuple(values)) for attribute, values in filters['exclude']),
+            filters['show_all']
+        )
 
-            # Check type filters
-            if len(filters['types']) == 2:
-                # Both types must match (order doesn't matter)
-                type1, type2 = filters['types']
-                has_both_types = (
-                    (data['type1'] == type1 and data['type2'] == type2) or
-                    (data['type1'] == type2 and data['type2'] == type1)
-                )
-                if not has_both_types:
-                    continue
-            elif len(filters['types']) == 1:
-                # At least one type must match
-                type_name = filters['types'][0]
-                if data['type1'] != type_name and data['type2'] != type_name:
-                    continue
+    def get_list_result(self, filters: Dict) -> Tuple[Dict[str, List[str]], Dict]:
+        """Get the grouped Pokémon and embed payload for filters, using the cache"""
+        # The catalog was reloaded, so every cached result is stale
+        if self.catalog.version != self.list_cache_version:
+            self.list_cache.clear()
+            self.list_cache_version = self.catalog.version
+
+        key = self.filters_key(filters)
+        result = self.list_cache.get(key)
+        if result is None:
+            spawn_rate_groups = self.find_matching_pokemon(filters)
+            result = (spawn_rate_groups, self.format_list_embed(spawn_rate_groups, filters).to_dict())
+            self.list_cache.put(key, result)
+        return result
+
+    def filter_values(self, filters: Dict, attribute: str, excluded: bool = False) -> List[str]:
+        """Get every value given for an attribute, in command order"""
+        clauses = filters['exclude'] if excluded else filters['include']
+        return [value for clause_attribute, values in clauses if clause_attribute == attribute for value in values]
 
-            # Add to appropriate spawn rate group
-            if spawn_rate in spawn_rate_groups:
-                spawn_rate_groups[spawn_rate].append(data['name'])
-            elif filters['show_all']:
-                # If --all is used, add to 1/899 group for rates beyond it
-                spawn_rate_groups['1/899'].append(data['name'])
+    def find_matching_pokemon(self, filters: Dict) -> Dict[str, List[str]]:
+        """Find Pokémon matching the filters, grouped by spawn rate"""
+        catalog = self.catalog
+        spawn_order = ['1/225', '1/337', '1/674', '1/899']
+
+        # Evaluate every clause as bitmask AND/OR/NOT, limited to Pokémon with spawn data
+        matching = catalog.query(filters['include'], filters['exclude']) & catalog.spawning_mask
 
-        # Sort each group alphabetically
-        for rate in spawn_rate_groups:
-            spawn_rate_groups[rate].sort()
+        tier_masks = {rate: catalog.spawn_index.get(parse_spawn_rate(rate), 0) & matching for rate in spawn_order}
 
-        return spawn_rate_groups
+        # If --all (or a rate filter) is used, add rates beyond 1/899 to the 1/899 group
+        if filters['show_all'] or self.filter_values(filters, 'rate'):
+            grouped = 0
+            for rate in spawn_order:
+                grouped |= tier_masks[rate]
+            tier_masks['1/899'] |= matching & ~grouped
+
+        # Bitmasks decode in alphabetical order, so each group comes out sorted
+        return {rate: catalog.names_in(mask) for rate, mask in tier_masks.items()}
 
     def format_list_embed(self, spawn_rate_groups: Dict[str, List[str]], filters: Dict) -> discord.Embed:
         """Format the Pokémon list into an embed"""
         # Build title based on filters
+        types = self.filter_values(filters, 'type')
+        regions = self.filter_values(filters, 'region')
         title_parts = []
-        if filters['types']:
-            if len(filters['types']) == 2:
-                title_parts.append(f"{filters['types'][0]}/{filters['types'][1]}")
-            else:
-                title_parts.append(filters['types'][0])
-        if filters['region']:
-            title_parts.append(filters['region'])
+        if types:
+            title_parts.append('/'.join(types))
+        if regions:
+            title_parts.append(', '.join(regions))
 
         title = f"📋 Pokémon List Organized By Spawnrates: {' '.join(title_parts)}" if title_parts else "📋 Pokémon List Organized By Spawnrates"
 
@@ -209,13 +208,18 @@ class PokemonListHelper(commands.Cog):
 
         # Add filter info to footer
         filter_info = []
-        if filters['types']:
-            filter_info.append(f"Types: {', '.join(filters['types'])}")
-        if filters['region']:
-            filter_info.append(f"Region: {filters['region']}")
+        labels = [('type', 'Types'), ('region', 'Region'), ('gender', 'Gender'), ('rate', 'Rate')]
+        for attribute, label in labels:
+            values = self.filter_values(filters, attribute)
+            if values:
+                filter_info.append(f"{label}: {', '.join(values)}")
+        for attribute, label in labels:
+            values = self.filter_values(filters, attribute, excluded=True)
+            if values:
+                filter_info.append(f"Not {label.lower()}: {', '.join(values)}")
         if filters['show_all']:
             filter_info.append("All spawn rates")
-        else:
+        elif not self.filter_values(filters, 'rate'):
             filter_info.append("Up to 1/899")
 
         total_count = sum(len(group) for group in spawn_rate_groups.values())
@@ -225,32 +229,33 @@ class PokemonListHelper(commands.Cog):
 
         return embed
 
-    @commands.hybrid_command(name='list', aliases=['l'], description='List Pokémon by type and region filters')
+    @commands.hybrid_command(name='list', aliases=['l'], description='List Pokémon by type, region, gender and spawn rate filters')
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def list_pokemon(self, ctx, *, args: str = ''):
         """
         List Pokémon based on filters
         Usage: !list --t type1 --t type2 --r region --all
+               !list --t fire --not-t flying --r kanto,johto --rate <=1/899 --gender female
         Example: !list --t dragon --t ice --r paldea
         """
         if not args:
-            await ctx.reply('❌ Please provide filters. Usage: `!list --t type --r region --all`\nExample: `!list --t dragon --t ice --r paldea`', mention_author=False)
+            await ctx.reply('❌ Please provide filters. Usage: `!list --t type --r region --gender gender --rate <=1/899 --all`\nExample: `!list --t dragon --t ice --r paldea`', mention_author=False)
             return
 
         # Parse filters
         filters = self.parse_list_command(args)
 
         # Validate filters
-        if not filters['types'] and not filters['region']:
-            await ctx.reply('❌ Please provide at least one type or region filter.', mention_author=False)
+        if not filters['include'] and not filters['exclude']:
+            await ctx.reply('❌ Please provide at least one type, region, gender or rate filter.', mention_author=False)
             return
 
         # Defer if this might take time
         if isinstance(ctx, discord.Interaction):
             await ctx.response.defer()
 
-        # Find matching Pokémon
-        spawn_rate_groups = self.find_matching_pokemon(filters)
+        # Find matching Pokémon (repeated queries are served from the cache)
+        spawn_rate_groups, embed_payload = self.get_list_result(filters)
 
         # Check if any Pokémon were found
         total_found = sum(len(group) for group in spawn_rate_groups.values())
@@ -258,8 +263,8 @@ class PokemonListHelper(commands.Cog):
             await ctx.reply('❌ No Pokémon found matching the specified filters.', mention_author=False)
             return
 
-        # Format and send embed
-        embed = self.format_list_embed(spawn_rate_groups, filters)
+        # Rebuild and send embed
+        embed = discord.Embed.from_dict(embed_payload)
 
         try:
             if isinstance(ctx, discord.Interaction):
@@ -1,10 +1,41 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import csv
 import re
-from typing import List, Dict, Optional
-from config import EMBED_COLOR
+import hashlib
+from typing import List, Dict, Optional, Tuple
+from config import EMBED_COLOR, QUEST_CACHE_SIZE, QUEST_EMBED_CACHE_SIZE
+from catalog import GENDERS, REGION_RANGES, PokemonEntry, parse_spawn_rate
+from cache import MISSING, LRUCache
+
+QUEST_REGIONS = [region for region, _, _ in REGION_RANGES]
+QUEST_TYPES = ['Normal', 'Fire', 'Water', 'Grass', 'Electric', 'Ice', 'Fighting', 'Poison',
+               'Ground', 'Flying', 'Psychic', 'Bug', 'Rock', 'Ghost', 'Dragon', 'Dark',
+               'Steel', 'Fairy']
+
+# Spawn rates suggested for quests, most common first
+QUEST_SPAWN_PRIORITIES = ['1/225', '1/337', '1/674']
+
+QUEST_REGION_RANKS = {region.lower(): rank for rank, region in enumerate(QUEST_REGIONS)}
+QUEST_TYPE_RANKS = {ptype.lower(): rank for rank, ptype in enumerate(QUEST_TYPES)}
+
+# One tokenizer over the lower-cased line for everything parse_quest needs:
+# the first "catch N" count, regions, genders, breeding and types. The
+# lookahead skips positions that cannot start a token, and "female" is listed
+# before "male" so it is never split into a false "male".
+QUEST_TOKEN_WORDS = ['catch', 'unknown gender', 'genderless', 'female', 'male', 'breed'] + list(QUEST_REGION_RANKS) + list(QUEST_TYPE_RANKS)
+QUEST_TOKEN_PATTERN = re.compile(
+    r'(?=[' + ''.join(sorted({word[0] for word in QUEST_TOKEN_WORDS})) + r'])'
+    r'(?:catch (?P<count>\d+)'
+    r'|(?P<region>' + '|'.join(QUEST_REGION_RANKS) + r')'
+    r'|(?P<gender>unknown gender|genderless|female|male)'
+    r'|(?P<breed>breed)'
+    r'|(?P<type>' + '|'.join(QUEST_TYPE_RANKS) + r'))'
+)
+QUEST_FIELD_PATTERN = re.compile(r'\d+\..*[Cc]atch')
+QUEST_LINE_PATTERN = re.compile(r'\d+\.')
+CUSTOM_EMOJI_PATTERN = re.compile(r'<:[^>]+>')
+QUEST_PROGRESS_PATTERN = re.compile(r'\d+/\d+$')
 
 class DetailsView(discord.ui.View):
     """View with a Details button to show full quest breakdown"""
@@ -22,12 +53,15 @@ class PokemonQuestHelper(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.pokemon_data = {}
-        self.spawn_rates = {}
-        self.gender_data = {'male': set(), 'female': set(), 'genderless': set()}
+        self.catalog = bot.catalog
         self.AUTO_SUGGEST_CHANNEL_ID = 1429692867022164018  # Channel to monitor
         self.processed_messages = set()  # Track processed message IDs
-        self.load_data()
+        self.candidates = {}  # (region, type) -> ranked catalog rows
+        self.gender_candidates = {}  # gender -> ranked catalog rows
+        self.candidates_version = None
+        self.quest_cache = LRUCache(maxsize=QUEST_CACHE_SIZE)  # (quest line, count) -> (quest_info, matches)
+        self.embed_cache = LRUCache(maxsize=QUEST_EMBED_CACHE_SIZE)  # (quest field hash, title, count) -> embed payloads
+        self.refresh_catalog()
 
     def is_regional_variant(self, pokemon_name: str) -> bool:
         """Check if a Pokémon is a regional variant"""
@@ -35,115 +69,57 @@ class PokemonQuestHelper(commands.Cog):
         name_lower = pokemon_name.lower()
         return any(prefix in name_lower for prefix in regional_prefixes)
 
-    def load_data(self):
-        """Load Pokémon data and spawn rates from CSV files"""
-        try:
-            # Load pokemondata.csv (tab-separated)
-            with open('pokemondata.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f, delimiter='\t')
-                for row in reader:
-                    dex = int(row['Dex'])
-                    self.pokemon_data[dex] = {
-                        'name': row['Name'],
-                        'type1': row['Type 1'],
-                        'type2': row['Type 2'].strip() if row['Type 2'].strip() else None,
-                        'dex': dex,
-                        'region': self.get_region(dex)
-                    }
-
-            # Load spawnrates.csv (comma-separated)
-            with open('spawnrates.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    dex = int(row['Dex'])
-                    self.spawn_rates[dex] = row['Chance']
-
-            # Load gender data
-            for gender_type in ['male', 'female', 'genderless']:
-                try:
-                    with open(f'{gender_type}.csv', 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if row:
-                                self.gender_data[gender_type].add(row['name'].strip())
-                except FileNotFoundError:
-                    print(f'Warning: {gender_type}.csv not found')
-
-            print(f'Loaded {len(self.pokemon_data)} Pokémon and {len(self.spawn_rates)} spawn rates')
-            print(f'Loaded gender data: {len(self.gender_data["male"])} male, {len(self.gender_data["female"])} female, {len(self.gender_data["genderless"])} genderless')
-        except Exception as e:
-            print(f'Error loading Pokémon data: {e}')
-
-    def get_region(self, dex: int) -> str:
-        """Get region based on Dex number"""
-        if 1 <= dex <= 151:
-            return 'Kanto'
-        elif 152 <= dex <= 251:
-            return 'Johto'
-        elif 252 <= dex <= 386:
-            return 'Hoenn'
-        elif 387 <= dex <= 493:
-            return 'Sinnoh'
-        elif 494 <= dex <= 649:
-            return 'Unova'
-        elif 650 <= dex <= 721:
-            return 'Kalos'
-        elif 722 <= dex <= 809:
-            return 'Alola'
-        elif 810 <= dex <= 905:
-            return 'Galar'
-        elif 906 <= dex <= 1025:
-            return 'Paldea'
-        return 'Unknown'
-
     def parse_quest(self, quest_text: str) -> Optional[Dict]:
-        """Parse a quest line to extract requirements"""
+        """Parse a quest line to extract requirements in a single regex pass"""
+        count = None
+        region_rank = None
+        type_rank = None
+        genders = set()
+
+        for match in QUEST_TOKEN_PATTERN.finditer(quest_text.lower()):
+            kind = match.lastgroup
+            if kind == 'count':
+                # Only the first "Catch N" counts
+                if count is None:
+                    count = int(match.group('count'))
+            elif kind == 'region':
+                rank = QUEST_REGION_RANKS[match.group()]
+                region_rank = rank if region_rank is None else min(region_rank, rank)
+            elif kind == 'type':
+                rank = QUEST_TYPE_RANKS[match.group()]
+                type_rank = rank if type_rank is None else min(type_rank, rank)
+            elif kind == 'gender':
+                genders.add(match.group())
+            elif kind == 'breed':
+                # Skip breeding quests
+                return None
+
         # Check for gender quests
         gender_quest = None
-        if 'male' in quest_text.lower() and 'female' not in quest_text.lower():
-            gender_quest = 'male'
-        elif 'female' in quest_text.lower():
+        if 'female' in genders:
             gender_quest = 'female'
-        elif 'unknown gender' in quest_text.lower() or 'genderless' in quest_text.lower():
+        elif 'male' in genders:
+            gender_quest = 'male'
+        elif genders:
             gender_quest = 'genderless'
 
-        # Skip breeding quests
-        if 'breed' in quest_text.lower():
-            return None
-
-        # Extract quest details using regex
         quest_info = {
             'text': quest_text,
             'region': None,
             'type': None,
-            'count': 0,
+            'count': count or 0,
             'gender': gender_quest
         }
 
-        # Extract count
-        count_match = re.search(r'Catch (\d+)', quest_text)
-        if count_match:
-            quest_info['count'] = int(count_match.group(1))
-
         # If it's a gender quest, return it
         if gender_quest:
             return quest_info
 
-        # Extract region
-        regions = ['Kanto', 'Johto', 'Hoenn', 'Sinnoh', 'Unova', 'Kalos', 'Alola', 'Galar', 'Paldea']
-        for region in regions:
-            if region in quest_text:
-                quest_info['region'] = region
-                break
-
-        # Extract type (look for common type patterns)
-        types = ['Normal', 'Fire', 'Water', 'Grass', 'Electric', 'Ice', 'Fighting', 'Poison', 
-                'Ground', 'Flying', 'Psychic', 'Bug', 'Rock', 'Ghost', 'Dragon', 'Dark', 
-                'Steel', 'Fairy']
-        for ptype in types:
-            if ptype.lower() in quest_text.lower() or f'{ptype}-type' in quest_text:
-                quest_info['type'] = ptype
-                break
+        # When several regions/types appear, the earliest in list order wins
+        if region_rank is not None:
+            quest_info['region'] = QUEST_REGIONS[region_rank]
+        if type_rank is not None:
+            quest_info['type'] = QUEST_TYPES[type_rank]
 
         # Skip generic catch quests (no region or type specified)
         if not quest_info['region'] and not quest_info['type']:
@@ -151,90 +127,71 @@ class PokemonQuestHelper(commands.Cog):
 
         return quest_info
 
-    def find_matching_pokemon(self, quest_info: Dict, limit: int = 2) -> List[Dict]:
-        """Find Pokémon matching the quest criteria"""
-        matches = []
-
-        # Handle gender quests
-        if quest_info.get('gender'):
-            gender = quest_info['gender']
-            gender_pokemon = self.gender_data.get(gender, set())
-
-            # Priority order for spawn rates
-            spawn_priorities = ['1/225', '1/337', '1/674']
-
-            for priority in spawn_priorities:
-                if len(matches) >= limit:
-                    break
-
-                for dex, data in self.pokemon_data.items():
-                    if len(matches) >= limit:
-                        break
-
-                    # Skip if already in matches
-                    if any(m['dex'] == dex for m in matches):
-                        continue
-
-                    # Skip regional variants
-                    if self.is_regional_variant(data['name']):
-                        continue
-
-                    # Check if Pokémon is in gender list and has spawn rate
-                    if data['name'] in gender_pokemon and dex in self.spawn_rates and self.spawn_rates[dex] == priority:
-                        matches.append({**data, 'spawn_rate': self.spawn_rates[dex]})
-
-            return matches[:limit]
-
-        # Priority order for spawn rates
-        spawn_priorities = ['1/225', '1/337', '1/674']
-
-        for priority in spawn_priorities:
-            if len(matches) >= limit:
-                break
-
-            for dex, data in self.pokemon_data.items():
-                if len(matches) >= limit:
-                    break
-
-                # Skip if already in matches
-                if any(m['dex'] == dex for m in matches):
+    def build_candidates(self):
+        """Precompute priority-ordered candidate rows per (region, type) and per gender"""
+        catalog = self.catalog
+        candidates = {}
+        gender_candidates = {gender: [] for gender in GENDERS}
+        listed_dex = {}  # List key -> Dex numbers already in it, so each species is suggested once
+
+        # Walk the spawn priorities in order so every list comes out ranked
+        for priority in QUEST_SPAWN_PRIORITIES:
+            denominator = parse_spawn_rate(priority)
+            for row, row_denominator in enumerate(catalog.spawn):
+                if row_denominator != denominator:
                     continue
 
                 # Skip regional variants
-                if self.is_regional_variant(data['name']):
-                    continue
-
-                # Skip if no spawn rate data
-                if dex not in self.spawn_rates or self.spawn_rates[dex] != priority:
+                name = catalog.names[row]
+                if self.is_regional_variant(name):
                     continue
 
-                # Check matching criteria
-                region_match = not quest_info['region'] or data['region'] == quest_info['region']
-                type_match = not quest_info['type'] or (
-                    data['type1'] == quest_info['type'] or 
-                    data['type2'] == quest_info['type']
-                )
+                region = catalog.region_names[catalog.region[row]]
+                types = {catalog.type_names[code] for code in (catalog.type1[row], catalog.type2[row]) if code}
+                keys = [(region, None)] + [(None, ptype) for ptype in types] + [(region, ptype) for ptype in types]
+                dex = catalog.dex[row]
+                for key in keys:
+                    # Rows are walked best rank first, base form first, so the first form listed is kept
+                    if dex not in listed_dex.setdefault(key, set()):
+                        listed_dex[key].add(dex)
+                        candidates.setdefault(key, []).append(row)
+
+                for gender in GENDERS:
+                    if name in catalog.gender_names(gender) and dex not in listed_dex.setdefault(gender, set()):
+                        listed_dex[gender].add(dex)
+                        gender_candidates[gender].append(row)
+
+        self.candidates = candidates
+        self.gender_candidates = gender_candidates
+        self.candidates_version = catalog.version
+
+    def refresh_catalog(self):
+        """Rebuild candidate lists and drop cached suggestions if the catalog was reloaded"""
+        if self.candidates_version != self.catalog.version:
+            self.build_candidates()
+            self.quest_cache.clear()
+            self.embed_cache.clear()
+
+    def find_matching_pokemon(self, quest_info: Dict, limit: int = 2) -> List[PokemonEntry]:
+        """Find Pokémon matching the quest criteria"""
+        self.refresh_catalog()
 
-                # Priority: both match > type match > region match
-                if quest_info['region'] and quest_info['type']:
-                    if region_match and type_match:
-                        matches.append({**data, 'spawn_rate': self.spawn_rates[dex]})
-                elif quest_info['type']:
-                    if type_match:
-                        matches.append({**data, 'spawn_rate': self.spawn_rates[dex]})
-                elif quest_info['region']:
-                    if region_match:
-                        matches.append({**data, 'spawn_rate': self.spawn_rates[dex]})
+        # Handle gender quests
+        if quest_info.get('gender'):
+            rows = self.gender_candidates.get(quest_info['gender'], [])
+        else:
+            # Both region and type must match when the quest gives both
+            rows = self.candidates.get((quest_info['region'], quest_info['type']), [])
 
-        return matches[:limit]
+        return [self.catalog.entry(row) for row in rows[:limit]]
 
-    def format_pokemon_info(self, pokemon: Dict) -> str:
+    def format_pokemon_info(self, pokemon: PokemonEntry) -> str:
         """Format Pokémon information for display"""
-        types = pokemon['type1']
-        if pokemon['type2']:
-            types += f"/{pokemon['type2']}"
+        types = pokemon.type1
+        if pokemon.type2:
+            types += f"/{pokemon.type2}"
 
-        return f"→ **{pokemon['name']}** (#{pokemon['dex']:03d}, {types}, {pokemon['region']}, {pokemon['spawn_rate']})"
+        return f"→ **{pokemon.name}** (#{pokemon.dex:03d}, {types}, {pokemon.region}, {pokemon.spawn_rate})"
 
     def is_quest_embed(self, embed: discord.Embed) -> bool:
         """Check if an embed contains quest information"""
@@ -244,26 +201,37 @@ class PokemonQuestHelper(commands.Cog):
         for field in embed.fields:
             if 'quest' in field.name.lower():
                 # Check if it has quest-like content (numbered lists with "Catch")
-                if re.search(r'\d+\..*[Cc]atch', field.value):
+                if QUEST_FIELD_PATTERN.search(field.value):
                     return True
         return False
 
-    async def process_quest_embed(self, message: discord.Message, count: int = 2):
-        """Process a quest embed and send suggestions"""
-        embed = message.embeds[0]
+    def normalize_quest_line(self, line: str) -> str:
+        """Strip whitespace and the per-user progress counter from a quest line"""
+        return QUEST_PROGRESS_PATTERN.sub('', line.strip()).strip()
 
-        # Find the quest field
-        quest_field = None
-        for field in embed.fields:
-            if 'quest' in field.name.lower():
-                quest_field = field
-                break
+    def get_quest_suggestion(self, line: str, count: int) -> Optional[Tuple[Dict, List[PokemonEntry]]]:
+        """Parse and match one normalized quest line, using the quest cache"""
+        key = (line, count)
+        result = self.quest_cache.get(key, MISSING)
+        if result is not MISSING:
+            return result
 
-        if not quest_field:
-            return
+        quest_info = self.parse_quest(line)
+        result = (quest_info, self.find_matching_pokemon(quest_info, limit=count)) if quest_info else None
+        self.quest_cache.put(key, result)
+        return result
 
+    def build_suggestion_embeds(self, embed: discord.Embed, quest_field, count: int) -> Optional[Tuple[Dict, Dict]]:
+        """Build the summary and details embed payloads for a quest field"""
         # Parse quests from the field value
-        quest_lines = quest_field.value.split('\n')
+        quest_lines = [self.normalize_quest_line(line) for line in quest_field.value.split('\n')]
+
+        # The same quests show up across users and days, so reuse finished embeds
+        digest = hashlib.blake2b('\n'.join(quest_lines).encode('utf-8'), digest_size=16).digest()
+        embed_key = (digest, embed.title, count)
+        result = self.embed_cache.get(embed_key, MISSING)
+        if result is not MISSING:
+            return result
 
         # Build summary embed (just the list)
         summary_embed = discord.Embed(
@@ -284,18 +252,18 @@ class PokemonQuestHelper(commands.Cog):
         gender_suggestions = []
 
         for line in quest_lines:
-            if not line.strip() or not re.search(r'^\d+\.', line.strip()):
+            if not QUEST_LINE_PATTERN.match(line):
                 continue
 
-            quest_info = self.parse_quest(line)
-            if not quest_info:
+            suggestion = self.get_quest_suggestion(line, count)
+            if not suggestion:
                 continue
 
-            matches = self.find_matching_pokemon(quest_info, limit=count)
+            quest_info, matches = suggestion
 
             if matches:
-                quest_text = re.sub(r'<:[^>]+>', '', quest_info['text'])
-                quest_text = re.sub(r'\d+/\d+$', '', quest_text).strip()
+                quest_text = CUSTOM_EMOJI_PATTERN.sub('', quest_info['text'])
+                quest_text = QUEST_PROGRESS_PATTERN.sub('', quest_text).strip()
 
                 suggestion_text = f"**Quest:** {quest_text}\n"
                 for pokemon in matches:
@@ -303,12 +271,11 @@ class PokemonQuestHelper(commands.Cog):
 
                     # Only add to main list if not a gender quest
                     if not quest_info.get('gender'):
-                        all_suggested_pokemon.add(pokemon['name'])
+                        all_suggested_pokemon.add(pokemon.name)
 
                 # Separate gender quests from regular quests
                 if quest_info.get('gender'):
-                    gender_pokemon_names = ', '.join([p['name'] for p in matches])
-                    gender_type = 'Unknown gender' if quest_info['gender'] == 'genderless' else quest_info['gender'].capitalize() + ' gender'
+                    gender_pokemon_names = ', '.join([p.name for p in matches])
                     gender_suggestions.append({
                         'text': f"**{quest_text}**\n{gender_pokemon_names}",
                         'quest_text': quest_text,
@@ -317,9 +284,10 @@ class PokemonQuestHelper(commands.Cog):
 
                 suggestions.append(suggestion_text)
 
+        result = None
         if suggestions:
             # Add quest details to the details embed
-            for i, suggestion in enumerate(suggestions[:25]):
+            for suggestion in suggestions[:25]:
                 details_embed.add_field(
                     name=f'🌧️',
                     value=suggestion,
@@ -354,10 +322,35 @@ class PokemonQuestHelper(commands.Cog):
             if len(suggestions) > 25:
                 details_embed.set_footer(text=f'Showing 25 of {len(suggestions)} quests')
 
+            result = (summary_embed.to_dict(), details_embed.to_dict())
+
+        self.embed_cache.put(embed_key, result)
+        return result
+
+    async def process_quest_embed(self, message: discord.Message, count: int = 2):
+        """Process a quest embed and send suggestions"""
+        embed = message.embeds[0]
+
+        # Find the quest field
+        quest_field = None
+        for field in embed.fields:
+            if 'quest' in field.name.lower():
+                quest_field = field
+                break
+
+        if not quest_field:
+            return
+
+        self.refresh_catalog()
+        payloads = self.build_suggestion_embeds(embed, quest_field, count)
+
+        if payloads:
+            summary_payload, details_payload = payloads
+
             # Create view with Details button
-            view = DetailsView(details_embed)
+            view = DetailsView(discord.Embed.from_dict(details_payload))
 
-            await message.reply(embed=summary_embed, view=view, mention_author=False)
+            await message.reply(embed=discord.Embed.from_dict(summary_payload), view=view, mention_author=False)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
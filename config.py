@@ -12,5 +12,67 @@ IDS_PER_PAGE = 200  # Number of IDs to show per page
 # Recording timeout (in seconds) - auto-stop if no activity
 RECORDING_TIMEOUT = 120  # 10 minutes (600 seconds)
 
-# How often to check for inactivity (in seconds)
-INACTIVITY_CHECK_INTERVAL = 30  # Check every 30 seconds
+# A recording's control message is edited at most once per CONTROL_UPDATE_INTERVAL
+# seconds (always with the latest count), backing off up to CONTROL_UPDATE_MAX_BACKOFF
+# seconds when Discord rate limits the edits. discord.py waits out most rate limits
+# inside the edit, so an edit held for over CONTROL_UPDATE_SLOW_EDIT seconds also
+# counts as rate limited (well above a slow round trip, which doesn't)
+CONTROL_UPDATE_INTERVAL = 0.5
+CONTROL_UPDATE_MAX_BACKOFF = 10.0
+CONTROL_UPDATE_SLOW_EDIT = 5.0
+
+# Append-only log of recordings in progress, replayed to resume them after a restart
+RECORDING_LOG_PATH = 'recordings.log'
+RECORDING_LOG_COMPACT_SIZE = 1_000_000  # Bytes before a recording ending also compacts the log
+
+# Finished recording results kept in memory for !idexport, and the number of IDs
+# from which the results message also gets the whole list attached as a .txt file
+RESULT_CACHE_SIZE = 32
+EXPORT_ATTACH_THRESHOLD = 1000
+
+# Number of distinct !list results to keep cached
+LIST_CACHE_SIZE = 256
+
+# Number of parsed quest lines and finished quest embeds to keep cached
+QUEST_CACHE_SIZE = 512
+QUEST_EMBED_CACHE_SIZE = 64
+
+# Number of users whose release/evolve lists are kept in memory, and for how long (seconds)
+USER_LIST_CACHE_SIZE = 1024
+USER_LIST_CACHE_TTL = 600
+# Lists up to this many IDs are loaded and cached whole when first viewed; longer
+# ones are read a page at a time so a huge list isn't held in memory
+USER_LIST_CACHE_MAX_IDS = 5000
+
+# Write-behind for release/evolve list edits: queue adds/removes in memory and
+# write them in one batch every WRITE_BEHIND_INTERVAL seconds (and on shutdown).
+# Faster for big pastes, but less durable: an edit is acknowledged to the user
+# before it is stored, so a crash or kill without a clean shutdown loses up to
+# WRITE_BEHIND_INTERVAL seconds of edits. A failed flush is retried on the next
+# interval, and a user's queued edits are flushed (flush_user) before their list
+# is read or popped, so nobody sees a list older than what they were told.
+WRITE_BEHIND = False
+WRITE_BEHIND_INTERVAL = 2.0
+
+# Where lists and user/guild data are stored: 'mongodb' (MONGODB_URI) or
+# 'sqlite' (a local file, for small deployments and running offline)
+STORAGE_BACKEND = 'mongodb'
+SQLITE_PATH = 'bot.db'
+
+# MongoDB connection pool and timeouts (milliseconds, None = no timeout)
+MONGO_MAX_POOL_SIZE = 100
+MONGO_MIN_POOL_SIZE = 0
+MONGO_CONNECT_TIMEOUT_MS = 20000
+MONGO_SERVER_SELECTION_TIMEOUT_MS = 30000
+MONGO_SOCKET_TIMEOUT_MS = None
+
+# Wire compression, in order of preference (zstd needs the `zstandard` package,
+# snappy needs `python-snappy`; compressors that aren't installed are skipped)
+MONGO_COMPRESSORS = ['zstd', 'snappy', 'zlib']
+
+# primary, primaryPreferred, secondary, secondaryPreferred or nearest.
+# Anything but primary can return lists older than the user's last edit.
+MONGO_READ_PREFERENCE = 'primary'
+
+# Pings sent at connect for the latency report
+LATENCY_PINGS = 5
@@ -1,55 +1,175 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional, Dict, Any, List
+import asyncio
+import statistics
+import time
+from typing import Optional, Dict, Any, List, Set, Tuple
+from config import STORAGE_BACKEND, SQLITE_PATH, WRITE_BEHIND, WRITE_BEHIND_INTERVAL, LATENCY_PINGS
+from storage import EditError, ListEdit, Storage
+
 
 class Database:
-    def __init__(self, mongodb_uri: str):
-        self.client: Optional[AsyncIOMotorClient] = None
-        self.db = None
-        self.mongodb_uri = mongodb_uri
+    """Storage backend (MongoDB or SQLite) shared by every cog, with optional write-behind batching of list edits"""
+
+    def __init__(self, mongodb_uri: Optional[str] = None):
+        self.storage = self.create_storage(mongodb_uri)
+        self.write_behind = WRITE_BEHIND
+        self._pending: Dict[Tuple[str, int], List[ListEdit]] = {}  # (collection, user ID) -> queued edits
+        self._reordered: Set[Tuple[str, int]] = set()  # Lists a retried flush may have reordered
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closing = asyncio.Event()  # Stops the flush loop after its current flush
+
+    @staticmethod
+    def create_storage(mongodb_uri: Optional[str]) -> Storage:
+        """Build the backend selected by STORAGE_BACKEND"""
+        if STORAGE_BACKEND == 'sqlite':
+            from sqlite_storage import SQLiteStorage
+            return SQLiteStorage(SQLITE_PATH)
+        if STORAGE_BACKEND != 'mongodb':
+            raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r} (expected 'mongodb' or 'sqlite')")
+        from mongo_storage import MongoStorage
+        return MongoStorage(mongodb_uri)
 
     async def connect(self):
-        """Connect to MongoDB Atlas"""
-        try:
-            self.client = AsyncIOMotorClient(self.mongodb_uri)
-            self.db = self.client.discord_bot
-            # Test connection
-            await self.client.admin.command('ping')
-            print("Successfully connected to MongoDB!")
-        except Exception as e:
-            print(f"Error connecting to MongoDB: {e}")
-            raise
+        """Open the storage backend"""
+        await self.storage.connect()
+        await self.report_latency()
+
+        if self.write_behind and not self._flush_task:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+            print(f"Write-behind enabled, flushing every {WRITE_BEHIND_INTERVAL}s")
+
+    async def report_latency(self):
+        """Print round-trip times of a few pings and the connection settings in use"""
+        timings = []
+        for _ in range(LATENCY_PINGS):
+            start = time.perf_counter()
+            await self.storage.ping()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        print(
+            f"{self.storage.name} ping: min {min(timings):.2f} ms, median {statistics.median(timings):.2f} ms, "
+            f"max {max(timings):.2f} ms over {len(timings)} pings ({self.storage.describe()})"
+        )
 
     async def close(self):
-        """Close MongoDB connection"""
-        if self.client:
-            self.client.close()
-            print("MongoDB connection closed")
+        """Flush queued edits and close the storage backend"""
+        if self._flush_task:
+            # Not cancelled: a flush in progress has already taken its edits off the queue
+            self._closing.set()
+            await self._flush_task
+            self._flush_task = None
+        if self._pending:
+            await self.flush()
+        await self.storage.close()
+
+    def queue_edit(self, collection: str, user_id: int, edit: ListEdit):
+        """
+        Queue an edit of a user's list until the next flush. A 'clear'
+        overwrites everything queued before it for that user, so earlier
+        edits are dropped.
+        """
+        key = (collection, user_id)
+        queued = self._pending.setdefault(key, [])
+        if edit[0] == 'clear':
+            queued.clear()
+
+        if queued:
+            merged = self._merge_edits(queued[-1], edit)
+            if merged is not None:
+                queued[-1] = merged
+                return
+        queued.append(edit)
+
+    @staticmethod
+    def _merge_edits(first: ListEdit, second: ListEdit) -> Optional[ListEdit]:
+        """Combine two consecutive edits into one, or return None if they can't be"""
+        operation, ids, option = first
+        second_operation, second_ids, second_option = second
+        if operation != second_operation or option != second_option or operation not in ('add', 'remove'):
+            return None
+        # Never merged: taking one use moves 2x IDs to the 1x list in stored order,
+        # so one combined edit can order them differently than the two did
+        if operation == 'remove' and option:
+            return None
+        return operation, list(dict.fromkeys(ids + second_ids)), option
+
+    def take_reordered(self, collection: str, user_id: int) -> bool:
+        """Check (once) whether a retried flush may have stored the user's list in another order than acknowledged"""
+        try:
+            self._reordered.remove((collection, user_id))
+            return True
+        except KeyError:
+            return False
+
+    def has_pending(self, collection: str, user_id: int) -> bool:
+        """Check whether a user's list has queued edits"""
+        return (collection, user_id) in self._pending
+
+    async def flush_user(self, collection: str, user_id: int):
+        """Write a user's queued edits now (call before reading the list)"""
+        if self.has_pending(collection, user_id):
+            await self.flush([(collection, user_id)])
+        elif self._flush_lock.locked():
+            # A flush that includes this user may still be in flight
+            async with self._flush_lock:
+                pass
+
+    async def flush(self, keys: Optional[List[Tuple[str, int]]] = None):
+        """Write queued edits (all of them, or those for the given keys) in one batch per collection"""
+        async with self._flush_lock:
+            keys = list(self._pending) if keys is None else [key for key in keys if key in self._pending]
+
+            batches: Dict[str, List[Tuple[int, ListEdit]]] = {}
+            for key in keys:
+                for edit in self._pending.pop(key):
+                    batches.setdefault(key[0], []).append((key[1], edit))
+
+            for collection, batch in batches.items():
+                try:
+                    await self.storage.apply_edits(collection, batch)
+                    continue
+                except EditError as e:
+                    # Edits before the failed one were applied; the failed one would fail again
+                    print(f"Dropping queued edit for user {batch[e.index][0]} in {collection}: {e}")
+                    retry = batch[e.index + 1:]
+                except Exception as e:
+                    # Part of the batch may have been written, so all of it is retried. Queued edits
+                    # can be applied twice (IDListStore queues remove_once as remove + demote) without
+                    # changing which IDs are listed, but re-adding an ID can move it in the list
+                    print(f"Error flushing {len(batch)} queued edit(s) to {collection}: {e}")
+                    retry = batch
+                    self._reordered.update((collection, user_id) for user_id, _ in batch)
+
+                # Put the rest back in front of anything queued meanwhile, to retry on the next flush
+                requeued: Dict[Tuple[str, int], List[ListEdit]] = {}
+                for user_id, edit in retry:
+                    requeued.setdefault((collection, user_id), []).append(edit)
+                for key, queued in requeued.items():
+                    self._pending[key] = queued + self._pending.get(key, [])
+
+    async def _flush_loop(self):
+        """Flush queued edits every WRITE_BEHIND_INTERVAL seconds"""
+        while not self._closing.is_set():
+            try:
+                await asyncio.wait_for(self._closing.wait(), WRITE_BEHIND_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            if self._pending:
+                await self.flush()
 
     # Example methods for future use
     async def save_user_data(self, user_id: int, data: Dict[str, Any]):
         """Save user data to database"""
-        collection = self.db.users
-        await collection.update_one(
-            {"user_id": user_id},
-            {"$set": data},
-            upsert=True
-        )
+        await self.storage.save_document('users', 'user_id', user_id, data)
 
     async def get_user_data(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user data from database"""
-        collection = self.db.users
-        return await collection.find_one({"user_id": user_id})
+        return await self.storage.get_document('users', 'user_id', user_id)
 
     async def save_guild_data(self, guild_id: int, data: Dict[str, Any]):
         """Save guild data to database"""
-        collection = self.db.guilds
-        await collection.update_one(
-            {"guild_id": guild_id},
-            {"$set": data},
-            upsert=True
-        )
+        await self.storage.save_document('guilds', 'guild_id', guild_id, data)
 
     async def get_guild_data(self, guild_id: int) -> Optional[Dict[str, Any]]:
         """Get guild data from database"""
-        collection = self.db.guilds
-        return await collection.find_one({"guild_id": guild_id})
+        return await self.storage.get_document('guilds', 'guild_id', guild_id)
@@ -0,0 +1,183 @@
+from typing import List, Optional, Tuple
+from config import USER_LIST_CACHE_MAX_IDS, USER_LIST_CACHE_SIZE, USER_LIST_CACHE_TTL
+from cache import MISSING, WriteThroughCache
+from storage import IDList, PokemonID, parse_pokemon_id
+
+
+class IDListStore:
+    """Every user's ID list in one collection, with caching and write-behind, shared by the list cogs"""
+
+    def __init__(self, collection: str):
+        self.collection = collection
+        self.db = None  # Set by the owning cog once the database is connected
+        self.cache = WriteThroughCache(maxsize=USER_LIST_CACHE_SIZE, ttl=USER_LIST_CACHE_TTL)  # User ID -> IDList
+
+    def stats(self) -> str:
+        """Human-readable summary of the cache counters"""
+        return self.cache.stats()
+
+    def forget_reordered(self, user_id: int):
+        """Drop a cached list that a retried flush may have stored in another order, so the stored order is shown"""
+        if self.db.take_reordered(self.collection, user_id):
+            self.cache.invalidate(user_id)
+
+    async def get(self, user_id: int) -> IDList:
+        """Get a copy of the user's list, from the cache when possible"""
+        if not self.db:
+            return IDList()
+
+        self.forget_reordered(user_id)
+        cached = self.cache.get(user_id)
+        if cached is not MISSING:
+            return cached.copy()
+
+        return (await self._load(user_id)).copy()
+
+    async def _load(self, user_id: int) -> IDList:
+        """Read the user's whole list from storage and cache it"""
+        with self.cache.reading(user_id) as read:
+            await self.db.flush_user(self.collection, user_id)
+            read.value = await self.db.storage.get_ids(self.collection, user_id)
+        return read.value
+
+    async def page(self, user_id: int, uses: int, start: int, count: int) -> Tuple[List[PokemonID], int, int]:
+        """
+        Get up to `count` IDs from position `start` of the user's 1x (uses=1)
+        or 2x list. Returns (those IDs, size of that list, total IDs).
+
+        Served from a cached list when there is one. Otherwise the page is
+        read from storage, and a list of up to USER_LIST_CACHE_MAX_IDS IDs is
+        then loaded and cached whole so the next pages and tabs don't go back
+        to storage; longer lists keep being read a page at a time.
+        """
+        if not self.db:
+            return [], 0, 0
+
+        self.forget_reordered(user_id)
+        cached = self.cache.get(user_id)
+        if cached is MISSING:
+            await self.db.flush_user(self.collection, user_id)
+            page, size, total = await self.db.storage.get_page(self.collection, user_id, uses, start, count)
+            if total > USER_LIST_CACHE_MAX_IDS:
+                return page, size, total
+            cached = await self._load(user_id)
+
+        ids = cached.once if uses == 1 else cached.twice
+        return ids[start:start + count], len(ids), len(cached)
+
+    async def add(self, user_id: int, ids: List[str], uses: int = 1) -> Tuple[int, int]:
+        """
+        Append the typed IDs that aren't listed yet, with the given uses.
+        Returns (number of IDs added, total IDs in the list).
+        """
+        if not self.db:
+            return 0, 0
+
+        unique_ids = list(dict.fromkeys(parse_pokemon_id(pokemon_id) for pokemon_id in ids))
+
+        def append_new(new_ids: List):
+            def update(cached: IDList) -> IDList:
+                updated = cached.copy()
+                updated.add(new_ids, uses)
+                return updated
+            return update
+
+        if self.db.write_behind:
+            current = await self.get(user_id)
+            new_ids = current.add(unique_ids, uses)
+            with self.cache.writing(user_id) as write:
+                if new_ids:
+                    self.db.queue_edit(self.collection, user_id, ('add', new_ids, uses))
+                write.apply(append_new(new_ids), len(current))
+            return len(new_ids), len(current)
+
+        with self.cache.writing(user_id) as write:
+            new_ids, total = await self.db.storage.add_ids(self.collection, user_id, unique_ids, uses)
+            write.apply(append_new(new_ids), total)
+
+        return len(new_ids), total
+
+    async def remove(self, user_id: int, ids: List[str], remove_once: bool = False) -> Tuple[int, int]:
+        """
+        Remove the typed IDs, or with remove_once one use of each.
+        Returns (number of matching IDs, IDs remaining in the list).
+        """
+        if not self.db:
+            return 0, 0
+
+        unique_ids = list(dict.fromkeys(parse_pokemon_id(pokemon_id) for pokemon_id in ids))
+
+        def remove_targets(cached: IDList) -> IDList:
+            updated = cached.copy()
+            updated.remove(unique_ids, remove_once)
+            return updated
+
+        if self.db.write_behind:
+            current = await self.get(user_id)
+            # Queued as a remove of the 1x IDs and a demote of the 2x ones: unlike
+            # taking one use, both are safe to write again when a flush is retried
+            twice_ids = set(current.twice).intersection(unique_ids) if remove_once else set()
+            matched_count = current.remove(unique_ids, remove_once)
+            with self.cache.writing(user_id) as write:
+                if matched_count:
+                    removed_ids = [pokemon_id for pokemon_id in unique_ids if pokemon_id not in twice_ids]
+                    if removed_ids:
+                        self.db.queue_edit(self.collection, user_id, ('remove', removed_ids, False))
+                    if twice_ids:
+                        self.db.queue_edit(self.collection, user_id, ('demote', list(twice_ids), None))
+                write.apply(remove_targets, len(current))
+            return matched_count, len(current)
+
+        with self.cache.writing(user_id) as write:
+            matched_count, remaining_count = await self.db.storage.remove_ids(
+                self.collection, user_id, unique_ids, remove_once
+            )
+            write.apply(remove_targets, remaining_count)
+
+        return matched_count, remaining_count
+
+    async def pop(self, user_id: int, count: int) -> Tuple[Optional[IDList], int]:
+        """
+        Take `count` IDs, 1x first, then 2x (taken 2x IDs keep one use).
+        Returns (IDs taken, split by the list they came from, IDs remaining),
+        or (None, IDs available) when the list holds fewer than `count` IDs.
+        """
+        if not self.db:
+            return None, 0
+
+        # Queued edits must land first so the pop sees everything the user was told
+        await self.db.flush_user(self.collection, user_id)
+        self.forget_reordered(user_id)
+
+        with self.cache.writing(user_id) as write:
+            popped, remaining_count = await self.db.storage.pop_ids(self.collection, user_id, count)
+            if popped is None:
+                write.apply(lambda cached: cached, remaining_count)
+                return None, remaining_count
+
+            def take_popped(cached: IDList) -> IDList:
+                updated = cached.copy()
+                updated.take(popped)
+                return updated
+            write.apply(take_popped, remaining_count)
+
+        return popped, remaining_count
+
+    async def clear(self, user_id: int) -> int:
+        """Empty the user's list, returning how many IDs it held"""
+        if not self.db:
+            return 0
+
+        if self.db.write_behind:
+            current = await self.get(user_id)
+            with self.cache.writing(user_id) as write:
+                if current:
+                    self.db.queue_edit(self.collection, user_id, ('clear', [], None))
+                write.apply(lambda cached: IDList(), 0)
+            return len(current)
+
+        with self.cache.writing(user_id) as write:
+            cleared_count = await self.db.storage.clear_ids(self.collection, user_id)
+            write.apply(lambda cached: IDList(), 0)
+
+        return cleared_count
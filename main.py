@@ -3,6 +3,7 @@ from discord.ext import commands
 import os
 import asyncio
 from database import Database
+from catalog import PokemonCatalog
 from config import EMBED_COLOR, PREFIX
 
 # Setup intents
@@ -10,9 +11,19 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.messages = True
 
+class Bot(commands.Bot):
+    async def close(self):
+        """Shut down, then flush queued database writes"""
+        await super().close()
+        if db:
+            await db.close()
+
 # Create bot instance with configurable prefix and case insensitive commands
 # Remove default help command to use custom one
-bot = commands.Bot(command_prefix=PREFIX, intents=intents, case_insensitive=True, help_command=None)
+bot = Bot(command_prefix=PREFIX, intents=intents, case_insensitive=True, help_command=None)
+
+# Load the Pokédex once and share it with every cog
+bot.catalog = PokemonCatalog()
 
 # Initialize database
 db = None
@@ -20,15 +31,27 @@ db = None
 @bot.event
 async def on_ready():
     global db
-    # Initialize database connection
+    print(f'{bot.user} has connected to Discord!')
+
+    # on_ready fires again after every reconnect; the database and cogs are set up once
+    if db is not None:
+        return
+
+    # Initialize database connection (kept only once connected, so a failed
+    # attempt is tried again on the next on_ready)
     mongodb_uri = os.getenv('MONGODB_URI')
-    db = Database(mongodb_uri)
-    await db.connect()
+    database = Database(mongodb_uri)
+    try:
+        await database.connect()
+    except Exception as e:
+        print(f'Database unavailable, retrying on the next ready event: {e}')
+        await database.close()
+        return
 
     # Make database accessible to cogs
+    db = database
     bot.db = db
 
-    print(f'{bot.user} has connected to Discord!')
     print(f'Bot is in {len(bot.guilds)} guilds')
     print(f'Command prefix: {PREFIX}')
 
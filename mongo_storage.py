@@ -0,0 +1,412 @@
+import importlib.util
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+from typing import Any, Dict, List, Optional, Tuple, Union
+from config import (
+    MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE,
+    MONGO_CONNECT_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_COMPRESSORS, MONGO_READ_PREFERENCE
+)
+from storage import MAX_INT_ID_DIGITS, EditError, IDList, ListEdit, PokemonID, Storage, parse_pokemon_id
+
+# A MongoDB update: an update document or an aggregation pipeline
+Update = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+# Module each wire compressor needs (zlib ships with Python)
+COMPRESSOR_MODULES = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': 'zlib'}
+
+# Fields holding each collection's 1x and 2x IDs (release lists have no 2x IDs)
+LIST_FIELDS = {
+    'release_ids': ('ids', None),
+    'evolve_ids': ('once', 'twice'),
+}
+
+# Stored lists (missing fields count as empty), for the migration
+STORED_ONCE = {"$ifNull": ["$once", []]}
+STORED_TWICE = {"$ifNull": ["$twice", []]}
+STORED_IDS = {"$ifNull": ["$ids", []]}
+
+
+def stored_id_expression(value: str) -> Dict[str, Any]:
+    """Aggregation expression doing parse_pokemon_id on the server (e.g. on '$$this')"""
+    return {"$cond": [
+        {"$and": [
+            {"$eq": [{"$type": value}, "string"]},
+            {"$regexMatch": {"input": value, "regex": f"^[0-9]{{1,{MAX_INT_ID_DIGITS}}}$"}}
+        ]},
+        {"$toInt": value},
+        value
+    ]}
+
+
+def projected_slice(*arguments: Any) -> Dict[str, Any]:
+    """
+    Aggregation $slice for a find projection; on its own a field-level $slice
+    is read as the projection operator, which only takes [skip, limit] numbers
+    """
+    return {"$concatArrays": [{"$slice": list(arguments)}]}
+
+
+def unique_expression(values: Any) -> Dict[str, Any]:
+    """Aggregation expression dropping repeats from an array, keeping first occurrences in order"""
+    return {"$reduce": {
+        "input": values,
+        "initialValue": [],
+        "in": {"$cond": [
+            {"$in": ["$$this", "$$value"]},
+            "$$value",
+            {"$concatArrays": ["$$value", ["$$this"]]}
+        ]}
+    }}
+
+
+def has_repeats(values: Any) -> Dict[str, Any]:
+    """Query matching documents whose array holds the same ID more than once"""
+    return {"$expr": {"$lt": [{"$size": {"$setUnion": [values]}}, {"$size": values}]}}
+
+
+def stored_ids(values: List[PokemonID]) -> List[PokemonID]:
+    """IDs as read back, converting numeric strings left over from before the migration"""
+    return [parse_pokemon_id(pokemon_id) if isinstance(pokemon_id, str) else pokemon_id for pokemon_id in values]
+
+
+class MongoStorage(Storage):
+    """Storage in MongoDB (Atlas), one find_one_and_update per list operation"""
+
+    name = 'mongodb'
+
+    # Unique indexes created at startup: collection -> key field
+    INDEXES = {
+        'users': 'user_id',
+        'guilds': 'guild_id',
+        'evolve_ids': 'user_id',
+        'release_ids': 'user_id',
+    }
+
+    def __init__(self, mongodb_uri: str, database: str = 'discord_bot'):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.db = None
+        self.mongodb_uri = mongodb_uri
+        self.database = database
+
+    async def connect(self):
+        """Connect to MongoDB Atlas"""
+        try:
+            self.client = AsyncIOMotorClient(
+                self.mongodb_uri,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                compressors=self.available_compressors(),
+                readPreference=MONGO_READ_PREFERENCE
+            )
+            self.db = self.client[self.database]
+            # Test connection
+            await self.client.admin.command('ping')
+            print("Successfully connected to MongoDB!")
+        except Exception as e:
+            print(f"Error connecting to MongoDB: {e}")
+            raise
+
+        await self.ensure_indexes()
+        try:
+            await self.migrate_legacy_ids()
+        except Exception as e:
+            print(f"Error migrating release/evolve lists: {e}")
+
+    async def close(self):
+        """Close MongoDB connection"""
+        if self.client:
+            self.client.close()
+            print("MongoDB connection closed")
+
+    async def ping(self):
+        await self.client.admin.command('ping')
+
+    def describe(self) -> str:
+        compressors = ', '.join(self.available_compressors()) or 'none'
+        return (f"pool {MONGO_MIN_POOL_SIZE}-{MONGO_MAX_POOL_SIZE}, compressors offered: {compressors}, "
+                f"read preference: {MONGO_READ_PREFERENCE}")
+
+    @staticmethod
+    def available_compressors() -> List[str]:
+        """MONGO_COMPRESSORS minus those whose module isn't installed"""
+        return [name for name in MONGO_COMPRESSORS
+                if importlib.util.find_spec(COMPRESSOR_MODULES.get(name, name)) is not None]
+
+    async def ensure_indexes(self):
+        """Create the unique lookup indexes (a no-op when they already exist)"""
+        for collection, field in self.INDEXES.items():
+            try:
+                await self.db[collection].create_index(field, unique=True)
+            except OperationFailure as e:
+                # E.g. duplicate documents for one user, or an existing non-unique index on the field
+                print(f"Could not create unique index on {collection}.{field}: {e}")
+
+    async def migrate_legacy_ids(self):
+        """
+        Convert lists stored before the compact schema: numeric release IDs
+        kept as strings, and evolve lists as [{'id': '123', 'uses': 2}].
+        Strings such as '42' and '0042' become the same int, so repeats are
+        dropped (an ID in both evolve lists keeps its 2x entry).
+        """
+        result = await self.db.release_ids.update_many(
+            {"$or": [
+                {"ids": {"$elemMatch": {"$type": "string", "$regex": f"^[0-9]{{1,{MAX_INT_ID_DIGITS}}}$"}}},
+                has_repeats(STORED_IDS)
+            ]},
+            [{"$set": {"ids": unique_expression(
+                {"$map": {"input": "$ids", "in": stored_id_expression("$$this")}}
+            )}}]
+        )
+        if result.modified_count:
+            print(f"Migrated {result.modified_count} release list(s) to the compact schema")
+
+        def converted_ids(uses: int) -> Dict:
+            return {"$map": {
+                "input": {"$filter": {"input": STORED_IDS, "cond": {"$eq": ["$$this.uses", uses]}}},
+                "in": stored_id_expression("$$this.id")
+            }}
+
+        result = await self.db.evolve_ids.update_many(
+            {"$or": [
+                {"ids": {"$exists": True}},
+                has_repeats({"$concatArrays": [STORED_ONCE, STORED_TWICE]})
+            ]},
+            [
+                {"$set": {
+                    "once": {"$concatArrays": [STORED_ONCE, converted_ids(1)]},
+                    "twice": {"$concatArrays": [STORED_TWICE, converted_ids(2)]}
+                }},
+                {"$set": {"twice": unique_expression("$twice")}},
+                {"$set": {"once": unique_expression(
+                    {"$filter": {"input": "$once", "cond": {"$not": [{"$in": ["$$this", "$twice"]}]}}}
+                )}},
+                {"$unset": "ids"}
+            ]
+        )
+        if result.modified_count:
+            print(f"Migrated {result.modified_count} evolve list(s) to the compact schema")
+
+    async def get_document(self, collection: str, key_field: str, key: int) -> Optional[Dict[str, Any]]:
+        return await self.db[collection].find_one({key_field: key})
+
+    async def save_document(self, collection: str, key_field: str, key: int, data: Dict[str, Any]):
+        await self.db[collection].update_one(
+            {key_field: key},
+            {"$set": data},
+            upsert=True
+        )
+
+    # ID lists
+
+    @staticmethod
+    def _stored(collection: str) -> Tuple[str, Optional[str], Dict, Any, Dict]:
+        """(1x field, 2x field, 1x list, 2x list, total) for a collection, as aggregation expressions"""
+        once_field, twice_field = LIST_FIELDS[collection]
+        once = {"$ifNull": [f"${once_field}", []]}
+        twice = {"$ifNull": [f"${twice_field}", []]} if twice_field else {"$literal": []}
+        return once_field, twice_field, once, twice, {"$add": [{"$size": once}, {"$size": twice}]}
+
+    @classmethod
+    def list_update(cls, collection: str, edit: ListEdit) -> Tuple[Update, bool]:
+        """The (update, upsert) applying a list edit"""
+        operation, ids, option = edit
+        once_field, twice_field, once, twice, _ = cls._stored(collection)
+        fields = [field for field in (once_field, twice_field) if field]
+
+        if operation == 'clear':
+            return {"$set": {field: [] for field in fields}}, False
+        if operation == 'demote' and not twice_field:
+            raise ValueError(f"{collection} has no 2x IDs to demote")
+        if operation == 'add' and option == 1 and not twice_field:
+            return {"$addToSet": {once_field: {"$each": ids}}}, True
+        if operation == 'remove' and not (option and twice_field):
+            return {"$pull": {field: {"$in": ids} for field in fields}}, False
+
+        # $literal keeps an ID such as "$once" from being read as a field path.
+        # $in scans its array, so it is only run against the listed IDs that are stored
+        # (a hashed $setIntersection), not against the whole list or the whole paste
+        listed = {"$literal": ids}
+        # Demoting only matches 2x IDs, so running it again once they are 1x changes nothing
+        stored = twice if operation == 'demote' else {"$concatArrays": [once, twice]}
+        matched = {"$set": {"_matched": {"$setIntersection": [stored, listed]}}}
+        if operation == 'add':
+            field = once_field if option == 1 else twice_field
+            return [
+                matched,
+                {"$set": {field: {"$concatArrays": [{"$ifNull": [f"${field}", []]}, {"$filter": {
+                    "input": listed,
+                    "cond": {"$not": [{"$in": ["$$this", "$_matched"]}]}
+                }}]}}},
+                {"$unset": "_matched"}
+            ], True
+
+        # Removing one use: 2x IDs move to the 1x list, 1x IDs are dropped (demoting: only 2x IDs match)
+        return [
+            matched,
+            {"$set": {
+                once_field: {"$concatArrays": [
+                    {"$filter": {"input": once, "cond": {"$not": [{"$in": ["$$this", "$_matched"]}]}}},
+                    {"$filter": {"input": twice, "cond": {"$in": ["$$this", "$_matched"]}}}
+                ]},
+                twice_field: {"$filter": {"input": twice, "cond": {"$not": [{"$in": ["$$this", "$_matched"]}]}}}
+            }},
+            {"$unset": "_matched"}
+        ], False
+
+    async def get_ids(self, collection: str, user_id: int) -> IDList:
+        once_field, twice_field = LIST_FIELDS[collection]
+        user_data = await self.db[collection].find_one({"user_id": user_id})
+        if not user_data:
+            return IDList()
+
+        id_list = IDList(stored_ids(user_data.get(once_field, [])),
+                         stored_ids(user_data.get(twice_field, [])) if twice_field else [])
+        # Evolve lists from before the migration: {'ids': [{'id': '123', 'uses': 2}]}
+        if twice_field:
+            for item in user_data.get('ids', []):
+                if item['uses'] == 1:
+                    id_list.once.extend(stored_ids([item['id']]))
+                elif item['uses'] == 2:
+                    id_list.twice.extend(stored_ids([item['id']]))
+
+        # Converted strings can repeat an ID ('42' and '0042'); kept as the migration would
+        twice = list(dict.fromkeys(id_list.twice))
+        listed_twice = set(twice)
+        once = [pokemon_id for pokemon_id in dict.fromkeys(id_list.once) if pokemon_id not in listed_twice]
+        return IDList(once, twice)
+
+    async def get_page(self, collection: str, user_id: int, uses: int, start: int, count: int) -> Tuple[List[PokemonID], int, int]:
+        _, twice_field, once, twice, total = self._stored(collection)
+        listed = once if uses == 1 else twice
+        # $slice in the projection: only the page's IDs leave the server
+        projection = {
+            "_id": 0,
+            "page": projected_slice(listed, start, count),
+            "size": {"$size": listed},
+            "total": total
+        }
+        if twice_field:
+            projection["legacy"] = {"$isArray": "$ids"}
+        user_data = await self.db[collection].find_one({"user_id": user_id}, projection)
+        if not user_data:
+            return [], 0, 0
+
+        if user_data.get('legacy'):
+            # Not migrated yet: the IDs are only in the old layout
+            id_list = await self.get_ids(collection, user_id)
+            ids = id_list.once if uses == 1 else id_list.twice
+            return ids[start:start + count], len(ids), len(id_list)
+        return stored_ids(user_data['page']), user_data['size'], user_data['total']
+
+    async def add_ids(self, collection: str, user_id: int, ids: List[PokemonID], uses: int) -> Tuple[List[PokemonID], int]:
+        _, _, once, twice, total = self._stored(collection)
+        update, upsert = self.list_update(collection, ('add', ids, uses))
+        # The pre-update document is projected down to its size and the given
+        # IDs that were already present, so only that delta comes back
+        before = await self.db[collection].find_one_and_update(
+            {"user_id": user_id},
+            update,
+            projection={
+                "_id": 0,
+                "total": total,
+                "present": {"$setIntersection": [{"$concatArrays": [once, twice]}, {"$literal": ids}]}
+            },
+            upsert=upsert,
+            return_document=ReturnDocument.BEFORE
+        )
+
+        total_count = before['total'] if before else 0
+        present = set(before['present']) if before else set()
+        new_ids = [pokemon_id for pokemon_id in ids if pokemon_id not in present]
+        return new_ids, total_count + len(new_ids)
+
+    async def remove_ids(self, collection: str, user_id: int, ids: List[PokemonID], remove_once: bool) -> Tuple[int, int]:
+        _, twice_field, once, twice, total = self._stored(collection)
+        update, upsert = self.list_update(collection, ('remove', ids, remove_once))
+        listed = {"$literal": ids}
+        matched = {"$size": {"$setIntersection": [{"$concatArrays": [once, twice]}, listed]}}
+        before = await self.db[collection].find_one_and_update(
+            {"user_id": user_id},
+            update,
+            projection={
+                "_id": 0,
+                "total": total,
+                "matched": matched,
+                "dropped": {"$size": {"$setIntersection": [once, listed]}} if remove_once and twice_field else matched
+            },
+            upsert=upsert,
+            return_document=ReturnDocument.BEFORE
+        )
+
+        if not before:
+            return 0, 0
+        return before['matched'], before['total'] - before['dropped']
+
+    async def pop_ids(self, collection: str, user_id: int, count: int) -> Tuple[Optional[IDList], int]:
+        once_field, twice_field, once, twice, total = self._stored(collection)
+        from_twice = {"$max": [0, {"$subtract": [count, {"$size": once}]}]}
+
+        # Remaining 1x IDs then the taken 2x IDs, which have one use left
+        taken = {once_field: {"$concatArrays": [
+            {"$slice": [once, {"$min": [count, {"$size": once}]}, {"$max": [{"$size": once}, 1]}]},
+            {"$slice": [twice, "$_from_twice"]}
+        ]}}
+        if twice_field:
+            taken[twice_field] = {"$slice": [twice, "$_from_twice", {"$max": [{"$size": twice}, 1]}]}
+
+        # The whole selection runs inside a single findAndModify, so concurrent
+        # pops are applied one after another and each use is issued once.
+        # Only matches while the list still has at least `count` IDs.
+        before = await self.db[collection].find_one_and_update(
+            {"user_id": user_id, "$expr": {"$gte": [total, count]}},
+            [
+                {"$set": {"_from_twice": from_twice}},
+                {"$set": taken},
+                {"$unset": "_from_twice"}
+            ],
+            projection={
+                "_id": 0,
+                "total": total,
+                "once_used": projected_slice(once, count),
+                "twice_used": projected_slice(twice, from_twice)
+            },
+            return_document=ReturnDocument.BEFORE
+        )
+        if before:
+            popped = IDList(before['once_used'], before['twice_used'])
+            return popped, before['total'] - len(popped.once)
+
+        user_data = await self.db[collection].find_one(
+            {"user_id": user_id},
+            projection={"_id": 0, "total": total}
+        )
+        return None, user_data['total'] if user_data else 0
+
+    async def clear_ids(self, collection: str, user_id: int) -> int:
+        _, _, _, _, total = self._stored(collection)
+        update, _ = self.list_update(collection, ('clear', [], None))
+        before = await self.db[collection].find_one_and_update(
+            {"user_id": user_id},
+            update,
+            projection={"_id": 0, "total": total},
+            return_document=ReturnDocument.BEFORE
+        )
+        return before['total'] if before else 0
+
+    async def apply_edits(self, collection: str, edits: List[Tuple[int, ListEdit]]):
+        """Write the edits with one ordered bulk_write"""
+        operations = []
+        for user_id, edit in edits:
+            update, upsert = self.list_update(collection, edit)
+            operations.append(UpdateOne({"user_id": user_id}, update, upsert=upsert))
+
+        try:
+            await self.db[collection].bulk_write(operations, ordered=True)
+        except BulkWriteError as e:
+            error = e.details['writeErrors'][0]
+            raise EditError(error['index'], error['errmsg']) from e
@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO
+from config import RECORDING_LOG_COMPACT_SIZE
+
+
+class SavedRecording:
+    """A recording that was still running according to the log"""
+    __slots__ = ('message_id', 'channel_id', 'control_id', 'user_id', 'user_mention', 'ids', 'last_activity')
+
+    def __init__(self, message_id: int, channel_id: int, control_id: int, user_id: int, user_mention: str, started: float):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.control_id = control_id
+        self.user_id = user_id
+        self.user_mention = user_mention
+        self.ids: Set[int] = set()
+        self.last_activity = started
+
+    def start_entry(self) -> Dict[str, Any]:
+        return {'op': 'start', 'message': self.message_id, 'channel': self.channel_id, 'control': self.control_id,
+                'user': self.user_id, 'mention': self.user_mention, 'at': self.last_activity}
+
+
+class RecordingLog:
+    """Append-only JSON-lines log of the ID recordings in progress, replayed to resume them after a restart"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.live: Set[int] = set()  # Message IDs of recordings without an end line
+        self._file: Optional[TextIO] = None
+        self._compacted_size = 0  # Bytes right after the last compaction
+
+    def load(self) -> List[SavedRecording]:
+        """Replay the log, returning the recordings that never ended"""
+        recordings = self._replay()
+        if recordings is None:
+            # Left as is: compacting a partial replay would drop the recordings not read
+            recordings = {}
+        else:
+            self._rewrite(recordings)
+
+        self.live = set(recordings)
+        return list(recordings.values())
+
+    def _replay(self) -> Optional[Dict[int, SavedRecording]]:
+        """Recordings without an end line, or None if the log couldn't be read"""
+        recordings: Dict[int, SavedRecording] = {}
+        try:
+            with open(self.path, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        operation, message_id = entry['op'], int(entry['message'])
+                        if operation == 'start':
+                            recordings[message_id] = SavedRecording(
+                                message_id, int(entry['channel']), int(entry['control']), int(entry['user']),
+                                str(entry['mention']), float(entry['at'])
+                            )
+                        elif operation == 'ids' and message_id in recordings:
+                            ids = [int(pokemon_id) for pokemon_id in entry['ids']]
+                            recordings[message_id].last_activity = float(entry['at'])
+                            recordings[message_id].ids.update(ids)
+                        elif operation == 'end':
+                            recordings.pop(message_id, None)
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Cut off by a crash mid-write, or not a log entry
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error reading recording log {self.path}: {e}")
+            return None
+        return recordings
+
+    def _rewrite(self, recordings: Dict[int, SavedRecording]):
+        """Replace the log with one start line and one ids line per running recording"""
+        self.close()
+        temp_path = f'{self.path}.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for recording in recordings.values():
+                    f.write(json.dumps(recording.start_entry()) + '\n')
+                    if recording.ids:
+                        f.write(json.dumps({'op': 'ids', 'message': recording.message_id,
+                                            'ids': sorted(recording.ids), 'at': recording.last_activity}) + '\n')
+            os.replace(temp_path, self.path)
+            self._compacted_size = os.path.getsize(self.path)
+        except Exception as e:
+            print(f"Error compacting recording log {self.path}: {e}")
+
+    def _append(self, entry: Dict[str, Any]):
+        try:
+            if not self._file:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+        except Exception as e:
+            print(f"Error writing recording log {self.path}: {e}")
+
+    def start(self, message_id: int, channel_id: int, control_id: int, user_id: int, user_mention: str):
+        """Record that a recording started"""
+        self.live.add(message_id)
+        self._append(SavedRecording(message_id, channel_id, control_id, user_id, user_mention, time.time()).start_entry())
+
+    def add_ids(self, message_id: int, ids: Iterable[int]):
+        """Record IDs a recording found since its last line"""
+        self._append({'op': 'ids', 'message': message_id, 'ids': list(ids), 'at': time.time()})
+
+    def end(self, message_id: int):
+        """Record that a recording ended, emptying the log if none is left"""
+        if message_id not in self.live:
+            return
+        self.live.discard(message_id)
+        if self.live:
+            self._append({'op': 'end', 'message': message_id})
+            # Long-running recordings keep appending; compact once the log has doubled
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return
+            if size > max(RECORDING_LOG_COMPACT_SIZE, 2 * self._compacted_size):
+                recordings = self._replay()
+                if recordings is not None:
+                    self._rewrite(recordings)
+            return
+
+        self.close()
+        try:
+            open(self.path, 'w').close()
+            self._compacted_size = 0
+        except Exception as e:
+            print(f"Error emptying recording log {self.path}: {e}")
+
+    def close(self):
+        """Close the log file (it is reopened on the next write)"""
+        if self._file:
+            self._file.close()
+            self._file = None
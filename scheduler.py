@@ -0,0 +1,91 @@
+import asyncio
+import heapq
+import itertools
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class DeadlineScheduler:
+    """One task calling `callback(key)` when each key's deadline passes, with deadlines kept in a heap"""
+
+    def __init__(self, callback: Callable[[Hashable], Awaitable[None]]):
+        self.callback = callback
+        self._deadlines: Dict[Hashable, float] = {}  # Key -> current deadline (loop time)
+        self._heap: List[Tuple[float, int, Hashable]] = []  # (deadline, tie-breaker, key), may hold outdated entries
+        self._counter = itertools.count()  # Keeps keys from being compared on equal deadlines
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._sleeping_until: Optional[float] = None
+        self._callbacks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, delay: float):
+        """Set (or push back) the key's deadline to `delay` seconds from now"""
+        deadline = asyncio.get_running_loop().time() + delay
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), key))
+
+        self._compact()
+
+        if not self._task or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        elif self._sleeping_until is not None and deadline < self._sleeping_until:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable):
+        """Forget the key's deadline"""
+        self._deadlines.pop(key, None)
+        self._compact()
+
+    def _compact(self):
+        """Drop outdated entries once they outnumber the live ones"""
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [entry for entry in self._heap if self._deadlines.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+
+    def close(self):
+        """Stop the task and drop every deadline"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._deadlines.clear()
+        self._heap.clear()
+
+    async def _run(self):
+        """Fire deadlines in order until none are left"""
+        loop = asyncio.get_running_loop()
+        while self._deadlines:
+            deadline, _, key = self._heap[0]
+            if self._deadlines.get(key) != deadline:
+                heapq.heappop(self._heap)  # Cancelled or rescheduled
+                continue
+
+            delay = deadline - loop.time()
+            if delay > 0:
+                self._wakeup.clear()
+                self._sleeping_until = deadline
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._sleeping_until = None
+                continue
+
+            heapq.heappop(self._heap)
+            del self._deadlines[key]
+            task = asyncio.create_task(self._fire(key))
+            self._callbacks.add(task)
+            task.add_done_callback(self._callbacks.discard)
+        self._heap.clear()
+
+    async def _fire(self, key: Hashable):
+        try:
+            await self.callback(key)
+        except Exception as e:
+            print(f"Error handling deadline for {key}: {e}")
@@ -0,0 +1,121 @@
+"""
+Memory and lookup times of the shared columnar catalog against the per-cog
+dict-of-dicts it replaced. Run from anywhere: python scripts/bench_catalog.py
+"""
+import csv
+import os
+import sys
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from catalog import GENDERS, PokemonCatalog, get_region
+from cogs.pokemonlist import PokemonListHelper
+from cogs.pokemonquesthelper import PokemonQuestHelper
+
+SPAWN_PRIORITIES = ['1/225', '1/337', '1/674']
+REGIONAL_PREFIXES = ['alolan', 'galarian', 'hisuian', 'paldean']
+
+
+# The old per-cog loading and scans, kept only to compare against
+
+def legacy_load(with_genders: bool):
+    pokemon_data, spawn_rates = {}, {}
+    gender_data = {gender: set() for gender in GENDERS}
+    with open('pokemondata.csv', 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f, delimiter='\t'):
+            dex = int(row['Dex'])
+            pokemon_data[dex] = {
+                'name': row['Name'],
+                'type1': row['Type 1'],
+                'type2': row['Type 2'].strip() or None,
+                'dex': dex,
+                'region': get_region(dex)
+            }
+    with open('spawnrates.csv', 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            spawn_rates[int(row['Dex'])] = row['Chance']
+    if with_genders:
+        for gender in GENDERS:
+            with open(f'{gender}.csv', 'r', encoding='utf-8') as f:
+                gender_data[gender] = {row['name'].strip() for row in csv.DictReader(f) if row}
+    return pokemon_data, spawn_rates, gender_data
+
+
+def legacy_quest_matches(data, quest_info, limit):
+    pokemon_data, spawn_rates, gender_data = data
+    matches = []
+    gender_pokemon = gender_data.get(quest_info.get('gender'), set())
+    for priority in SPAWN_PRIORITIES:
+        for dex, pokemon in pokemon_data.items():
+            if len(matches) >= limit:
+                return matches
+            if any(match['dex'] == dex for match in matches):
+                continue
+            if any(prefix in pokemon['name'].lower() for prefix in REGIONAL_PREFIXES):
+                continue
+            if spawn_rates.get(dex) != priority:
+                continue
+            if quest_info.get('gender'):
+                matched = pokemon['name'] in gender_pokemon
+            else:
+                matched = ((not quest_info['region'] or pokemon['region'] == quest_info['region']) and
+                           (not quest_info['type'] or quest_info['type'] in (pokemon['type1'], pokemon['type2'])))
+            if matched:
+                matches.append({**pokemon, 'spawn_rate': spawn_rates[dex]})
+    return matches
+
+
+def legacy_list_scan(data, type_name):
+    pokemon_data, spawn_rates, _ = data
+    groups = {rate: [] for rate in SPAWN_PRIORITIES + ['1/899']}
+    for dex, pokemon in pokemon_data.items():
+        rate = spawn_rates.get(dex)
+        if rate in groups and type_name in (pokemon['type1'], pokemon['type2']):
+            groups[rate].append(pokemon['name'])
+    for names in groups.values():
+        names.sort()
+    return groups
+
+
+def allocated_kib(build) -> float:
+    """KiB still allocated by what build() returns"""
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size / 1024
+
+
+def per_call_us(function, number: int = 2000) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+if __name__ == '__main__':
+    legacy_kib = allocated_kib(lambda: (legacy_load(False), legacy_load(True)))
+    catalog_kib = allocated_kib(lambda: PokemonCatalog(snapshot_file=None))
+    print(f'Resident data: {legacy_kib:.0f} KiB for the two per-cog copies, {catalog_kib:.0f} KiB for the shared catalog')
+
+    legacy = legacy_load(True)
+    bot = SimpleNamespace(catalog=PokemonCatalog(snapshot_file=None))
+    quest_helper = PokemonQuestHelper(bot)
+    list_helper = PokemonListHelper(bot)
+
+    quests = {
+        'dragon/paldea': {'region': 'Paldea', 'type': 'Dragon', 'gender': None},
+        'female': {'region': None, 'type': None, 'gender': 'female'},
+    }
+    for label, quest_info in quests.items():
+        before = per_call_us(lambda: legacy_quest_matches(legacy, quest_info, 5), number=200)
+        after = per_call_us(lambda: quest_helper.find_matching_pokemon(quest_info, 5))
+        print(f'Quest matching ({label}, limit 5): {before:.1f} us -> {after:.1f} us')
+
+    filters = list_helper.parse_list_command('--t fire')
+    before = per_call_us(lambda: legacy_list_scan(legacy, 'Fire'), number=500)
+    after = per_call_us(lambda: list_helper.find_matching_pokemon(filters), number=500)
+    print(f'!list --t fire scan (uncached): {before:.1f} us -> {after:.1f} us')
@@ -0,0 +1,68 @@
+"""
+Document size and find_one time of release/evolve lists in the compact
+schema (int IDs, evolve lists as once/twice arrays) against the legacy one
+(string IDs, evolve lists as [{'id': '123', 'uses': 2}]). find_one is only
+timed when MONGODB_URI is set (a throwaway database is created and dropped).
+Run from anywhere: python scripts/bench_compact_schema.py
+"""
+import os
+import random
+import statistics
+import time
+import uuid
+
+import bson
+
+LIST_SIZES = [100, 1_000, 10_000]
+FIND_ONE_REPEATS = 50
+
+
+def documents(size: int):
+    """(collection, legacy document, compact document) for a list of `size` IDs"""
+    rng = random.Random(size)
+    ids = rng.sample(range(1, 100_000_000), size)
+    twice = set(rng.sample(ids, size // 2))
+    yield ('release_ids',
+           {"user_id": 1, "ids": [str(pokemon_id) for pokemon_id in ids]},
+           {"user_id": 2, "ids": ids})
+    yield ('evolve_ids',
+           {"user_id": 1, "ids": [{"id": str(pokemon_id), "uses": 2 if pokemon_id in twice else 1} for pokemon_id in ids]},
+           {"user_id": 2, "once": [pokemon_id for pokemon_id in ids if pokemon_id not in twice],
+            "twice": [pokemon_id for pokemon_id in ids if pokemon_id in twice]})
+
+
+def find_one_ms(collection, user_id: int) -> float:
+    timings = []
+    for _ in range(FIND_ONE_REPEATS):
+        start = time.perf_counter()
+        collection.find_one({"user_id": user_id})
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == '__main__':
+    mongodb_uri = os.getenv('MONGODB_URI')
+    client = db = None
+    if mongodb_uri:
+        from pymongo import MongoClient
+        client = MongoClient(mongodb_uri)
+        db = client[f'bench_{uuid.uuid4().hex}']
+
+    try:
+        for size in LIST_SIZES:
+            for collection, legacy, compact in documents(size):
+                legacy_size, compact_size = len(bson.encode(legacy)), len(bson.encode(compact))
+                line = (f'{collection:<12} {size:>6,} IDs: {legacy_size:>9,} -> {compact_size:>9,} bytes '
+                        f'({compact_size / legacy_size:.0%})')
+                if db is not None:
+                    db[collection].delete_many({})
+                    db[collection].insert_many([legacy, compact])
+                    db[collection].create_index('user_id', unique=True)
+                    line += f', find_one {find_one_ms(db[collection], 1):.2f} -> {find_one_ms(db[collection], 2):.2f} ms'
+                print(line)
+        if db is None:
+            print('(set MONGODB_URI to time find_one)')
+    finally:
+        if client is not None:
+            client.drop_database(db.name)
+            client.close()
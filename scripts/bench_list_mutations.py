@@ -0,0 +1,92 @@
+"""
+Time evolve list adds and removes (10,000 stored IDs, a 1,000-ID paste half
+of which is already stored): the old per-ID list scans against the set-based
+IDList, then each storage backend. MongoDB is only timed when
+MONGODB_BENCH_URI is set (a throwaway database is created and dropped).
+Run from anywhere: python scripts/bench_list_mutations.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from sqlite_storage import SQLiteStorage
+from storage import IDList
+
+STORED = 10_000
+PASTE = 1_000
+
+
+def legacy_add(current_ids, ids_to_add, uses):
+    """The old add: an any() scan of the stored list per pasted ID"""
+    for pokemon_id in ids_to_add:
+        if not any(item['id'] == pokemon_id for item in current_ids):
+            current_ids.append({'id': pokemon_id, 'uses': uses})
+
+
+def legacy_remove(current_ids, ids_to_remove):
+    """The old remove: a scan of the paste per stored ID"""
+    return [item for item in current_ids if item['id'] not in ids_to_remove]
+
+
+def timed_ms(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+async def time_storage(storage, stored, paste):
+    await storage.connect()
+    try:
+        await storage.add_ids('evolve_ids', 1, stored, 2)
+        start = time.perf_counter()
+        await storage.add_ids('evolve_ids', 1, paste, 2)
+        add_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        await storage.remove_ids('evolve_ids', 1, paste, True)
+        remove_ms = (time.perf_counter() - start) * 1000
+    finally:
+        await storage.close()
+    return add_ms, remove_ms
+
+
+def report(label, add_ms, remove_ms):
+    print(f'  {label:<28} add {add_ms:8.2f} ms   remove {remove_ms:8.2f} ms')
+
+
+if __name__ == '__main__':
+    stored = list(range(100_000, 100_000 + STORED))
+    # Half already stored, half new
+    paste = stored[-PASTE // 2:] + list(range(1, PASTE // 2 + 1))
+    print(f'{STORED:,} stored IDs, {PASTE:,}-ID paste ({PASTE // 2:,} already stored)')
+
+    legacy_ids = [{'id': str(pokemon_id), 'uses': 2} for pokemon_id in stored]
+    legacy_paste = [str(pokemon_id) for pokemon_id in paste]
+    report('old list scans', timed_ms(legacy_add, list(legacy_ids), legacy_paste, 2),
+           timed_ms(legacy_remove, legacy_ids, legacy_paste))
+
+    id_list = IDList(twice=list(stored))
+    report('IDList (set based)', timed_ms(id_list.add, paste, 2), timed_ms(id_list.remove, paste, True))
+
+    with tempfile.TemporaryDirectory() as directory:
+        report('SQLite backend', *asyncio.run(time_storage(SQLiteStorage(os.path.join(directory, 'bench.db')), stored, paste)))
+
+    mongodb_uri = os.getenv('MONGODB_BENCH_URI')
+    if mongodb_uri:
+        from pymongo import MongoClient
+        from mongo_storage import MongoStorage
+
+        database = f'bench_{uuid.uuid4().hex}'
+        try:
+            report('MongoDB backend', *asyncio.run(time_storage(MongoStorage(mongodb_uri, database), stored, paste)))
+        finally:
+            with MongoClient(mongodb_uri) as client:
+                client.drop_database(database)
+    else:
+        print('  (set MONGODB_BENCH_URI to time the MongoDB backend)')
@@ -0,0 +1,82 @@
+"""
+Time parse_quest (one precompiled tokenizer pass) against the per-keyword
+scans it replaced, over representative event quest lines.
+Run from anywhere: python scripts/bench_quest_parse.py
+"""
+import os
+import re
+import sys
+import timeit
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from catalog import PokemonCatalog
+from cogs.pokemonquesthelper import QUEST_REGIONS, QUEST_TYPES, PokemonQuestHelper
+
+QUEST_LINES = [
+    'Catch 10 Pokémon',
+    'Catch 5 Fire-type Pokémon',
+    'Catch 5 Pokémon from the Kalos region',
+    'Catch 5 Dragon-type Pokémon from the Paldea region',
+    'Catch 3 female Pokémon',
+    'Catch 3 Pokémon of unknown gender',
+    'Breed 2 Pokémon',
+    'Catch 20 Water-type Pokémon <:water:123456> 4/20',
+]
+
+
+def legacy_parse_quest(quest_text: str):
+    """The old parse_quest: one lower() and substring scan per keyword"""
+    gender_quest = None
+    if 'male' in quest_text.lower() and 'female' not in quest_text.lower():
+        gender_quest = 'male'
+    elif 'female' in quest_text.lower():
+        gender_quest = 'female'
+    elif 'unknown gender' in quest_text.lower() or 'genderless' in quest_text.lower():
+        gender_quest = 'genderless'
+
+    if 'breed' in quest_text.lower():
+        return None
+
+    quest_info = {'text': quest_text, 'region': None, 'type': None, 'count': 0, 'gender': gender_quest}
+    count_match = re.search(r'Catch (\d+)', quest_text)
+    if count_match:
+        quest_info['count'] = int(count_match.group(1))
+    if gender_quest:
+        return quest_info
+
+    for region in QUEST_REGIONS:
+        if region in quest_text:
+            quest_info['region'] = region
+            break
+    for ptype in QUEST_TYPES:
+        if ptype.lower() in quest_text.lower() or f'{ptype}-type' in quest_text:
+            quest_info['type'] = ptype
+            break
+
+    if not quest_info['region'] and not quest_info['type']:
+        return None
+    return quest_info
+
+
+def per_line_us(parse, number: int = 5000) -> float:
+    def run():
+        for line in QUEST_LINES:
+            parse(line)
+    return min(timeit.repeat(run, number=number, repeat=5)) / number / len(QUEST_LINES) * 1e6
+
+
+if __name__ == '__main__':
+    quest_helper = PokemonQuestHelper(SimpleNamespace(catalog=PokemonCatalog(snapshot_file=None)))
+
+    for line in QUEST_LINES:
+        if legacy_parse_quest(line) != quest_helper.parse_quest(line):
+            print(f'Parsed differently: {line!r}')
+
+    before = per_line_us(legacy_parse_quest)
+    after = per_line_us(quest_helper.parse_quest)
+    print(f'parse_quest over {len(QUEST_LINES)} quest lines: {before:.2f} us -> {after:.2f} us per line '
+          f'({before / after:.1f}x)')
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from storage import IDList, ListEdit, PokemonID, Storage
+
+# Tables holding ID lists (one per Storage collection)
+LIST_TABLES = ('release_ids', 'evolve_ids')
+
+# One row per listed ID with its uses left. `seq` (the rowid) only grows, so ordering
+# by it keeps insertion order. pokemon_id has no declared type, so ints and text are
+# kept as given.
+LIST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    seq INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    pokemon_id NOT NULL,
+    uses INTEGER NOT NULL DEFAULT 1,
+    UNIQUE (user_id, pokemon_id)
+);
+CREATE INDEX IF NOT EXISTS {table}_order ON {table} (user_id, uses, seq);
+"""
+
+DOCUMENT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    key INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, key)
+);
+"""
+
+
+class SQLiteStorage(Storage):
+    """Storage in a local SQLite file (WAL), queried on one worker thread so each operation runs alone"""
+
+    name = 'sqlite'
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _run(self, function: Callable[..., Any], *args) -> Any:
+        """Run function(connection, *args) in one transaction on the worker thread"""
+        def transaction():
+            with self.connection:
+                return function(self.connection, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, transaction)
+
+    async def connect(self):
+        """Open the database file and create the tables"""
+        def open_database():
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL stays consistent on a crash with NORMAL; only the last commits may be lost on power failure
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for table in LIST_TABLES:
+                connection.executescript(LIST_SCHEMA.format(table=table))
+            connection.executescript(DOCUMENT_SCHEMA)
+            return connection
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        try:
+            self.connection = await asyncio.get_running_loop().run_in_executor(self._executor, open_database)
+            print(f"Opened SQLite database {self.path}")
+        except Exception as e:
+            print(f"Error opening SQLite database {self.path}: {e}")
+            raise
+
+    async def close(self):
+        """Close the database file"""
+        if self.connection:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.connection.close)
+            self.connection = None
+            print("SQLite database closed")
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def ping(self):
+        await self._run(lambda connection: connection.execute("SELECT 1").fetchone())
+
+    def describe(self) -> str:
+        return f"{self.path}, WAL"
+
+    async def get_document(self, collection: str, key_field: str, key: int) -> Optional[Dict[str, Any]]:
+        def get(connection):
+            row = connection.execute(
+                "SELECT data FROM documents WHERE collection = ? AND key = ?", (collection, key)
+            ).fetchone()
+            return {key_field: key, **json.loads(row[0])} if row else None
+        return await self._run(get)
+
+    async def save_document(self, collection: str, key_field: str, key: int, data: Dict[str, Any]):
+        def save(connection):
+            row = connection.execute(
+                "SELECT data FROM documents WHERE collection = ? AND key = ?", (collection, key)
+            ).fetchone()
+            document = json.loads(row[0]) if row else {}
+            document.update(data)
+            connection.execute(
+                "INSERT OR REPLACE INTO documents (collection, key, data) VALUES (?, ?, ?)",
+                (collection, key, json.dumps(document))
+            )
+        await self._run(save)
+
+    # ID lists (helpers run on the worker thread; `table` is always one of LIST_TABLES)
+
+    @staticmethod
+    def _count(connection: sqlite3.Connection, table: str, user_id: int) -> int:
+        return connection.execute(f"SELECT COUNT(*) FROM {table} WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    @staticmethod
+    def _add(connection: sqlite3.Connection, table: str, user_id: int, ids: List[PokemonID], uses: int) -> List[PokemonID]:
+        new_ids = []
+        for pokemon_id in ids:
+            cursor = connection.execute(
+                f"INSERT OR IGNORE INTO {table} (user_id, pokemon_id, uses) VALUES (?, ?, ?)",
+                (user_id, pokemon_id, uses)
+            )
+            if cursor.rowcount:
+                new_ids.append(pokemon_id)
+        return new_ids
+
+    @staticmethod
+    def _use_once(connection: sqlite3.Connection, table: str, user_id: int, rows: List[Tuple[int, PokemonID, int]]):
+        """Take one use of each (seq, ID, uses) row; 2x IDs go to the end of the 1x list"""
+        connection.executemany(f"DELETE FROM {table} WHERE seq = ?", [(seq,) for seq, _, _ in rows])
+        connection.executemany(
+            f"INSERT INTO {table} (user_id, pokemon_id, uses) VALUES (?, ?, 1)",
+            [(user_id, pokemon_id) for _, pokemon_id, uses in rows if uses == 2]
+        )
+
+    @classmethod
+    def _remove(cls, connection: sqlite3.Connection, table: str, user_id: int, ids: List[PokemonID], remove_once: bool) -> int:
+        rows = []
+        for pokemon_id in ids:
+            row = connection.execute(
+                f"SELECT seq, pokemon_id, uses FROM {table} WHERE user_id = ? AND pokemon_id = ?",
+                (user_id, pokemon_id)
+            ).fetchone()
+            if row:
+                rows.append(row)
+
+        if remove_once:
+            # In list order, like the 2x IDs moved by MongoStorage
+            cls._use_once(connection, table, user_id, sorted(rows))
+        else:
+            connection.executemany(f"DELETE FROM {table} WHERE seq = ?", [(seq,) for seq, _, _ in rows])
+        return len(rows)
+
+    @classmethod
+    def _demote(cls, connection: sqlite3.Connection, table: str, user_id: int, ids: List[PokemonID]):
+        rows = []
+        for pokemon_id in ids:
+            row = connection.execute(
+                f"SELECT seq, pokemon_id, uses FROM {table} WHERE user_id = ? AND pokemon_id = ? AND uses = 2",
+                (user_id, pokemon_id)
+            ).fetchone()
+            if row:
+                rows.append(row)
+        cls._use_once(connection, table, user_id, sorted(rows))
+
+    @staticmethod
+    def _clear(connection: sqlite3.Connection, table: str, user_id: int) -> int:
+        return connection.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,)).rowcount
+
+    @staticmethod
+    def _table(collection: str) -> str:
+        if collection not in LIST_TABLES:
+            raise ValueError(f"Unknown ID list collection {collection!r}")
+        return collection
+
+    async def get_ids(self, collection: str, user_id: int) -> IDList:
+        table = self._table(collection)
+
+        def get(connection):
+            id_list = IDList()
+            rows = connection.execute(
+                f"SELECT pokemon_id, uses FROM {table} WHERE user_id = ? ORDER BY uses, seq", (user_id,)
+            ).fetchall()
+            for pokemon_id, uses in rows:
+                (id_list.once if uses == 1 else id_list.twice).append(pokemon_id)
+            return id_list
+        return await self._run(get)
+
+    async def get_page(self, collection: str, user_id: int, uses: int, start: int, count: int) -> Tuple[List[PokemonID], int, int]:
+        table = self._table(collection)
+
+        def get(connection):
+            page = [row[0] for row in connection.execute(
+                f"SELECT pokemon_id FROM {table} WHERE user_id = ? AND uses = ? ORDER BY seq LIMIT ? OFFSET ?",
+                (user_id, uses, count, start)
+            )]
+            size = connection.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE user_id = ? AND uses = ?", (user_id, uses)
+            ).fetchone()[0]
+            return page, size, self._count(connection, table, user_id)
+        return await self._run(get)
+
+    async def add_ids(self, collection: str, user_id: int, ids: List[PokemonID], uses: int) -> Tuple[List[PokemonID], int]:
+        table = self._table(collection)
+
+        def add(connection):
+            new_ids = self._add(connection, table, user_id, ids, uses)
+            return new_ids, self._count(connection, table, user_id)
+        return await self._run(add)
+
+    async def remove_ids(self, collection: str, user_id: int, ids: List[PokemonID], remove_once: bool) -> Tuple[int, int]:
+        table = self._table(collection)
+
+        def remove(connection):
+            matched = self._remove(connection, table, user_id, ids, remove_once)
+            return matched, self._count(connection, table, user_id)
+        return await self._run(remove)
+
+    async def pop_ids(self, collection: str, user_id: int, count: int) -> Tuple[Optional[IDList], int]:
+        table = self._table(collection)
+
+        def pop(connection):
+            rows = connection.execute(
+                f"SELECT seq, pokemon_id, uses FROM {table} WHERE user_id = ? ORDER BY uses, seq LIMIT ?",
+                (user_id, count)
+            ).fetchall()
+            if len(rows) < count:
+                return None, len(rows)
+
+            self._use_once(connection, table, user_id, rows)
+            popped = IDList([pokemon_id for _, pokemon_id, uses in rows if uses == 1],
+                            [pokemon_id for _, pokemon_id, uses in rows if uses == 2])
+            return popped, self._count(connection, table, user_id)
+        return await self._run(pop)
+
+    async def clear_ids(self, collection: str, user_id: int) -> int:
+        return await self._run(self._clear, self._table(collection), user_id)
+
+    async def apply_edits(self, collection: str, edits: List[Tuple[int, ListEdit]]):
+        """Apply the edits in one transaction (all or nothing)"""
+        table = self._table(collection)
+
+        def apply(connection):
+            for user_id, (operation, ids, option) in edits:
+                if operation == 'add':
+                    self._add(connection, table, user_id, ids, option)
+                elif operation == 'remove':
+                    self._remove(connection, table, user_id, ids, option)
+                elif operation == 'demote':
+                    self._demote(connection, table, user_id, ids)
+                else:
+                    self._clear(connection, table, user_id)
+        await self._run(apply)
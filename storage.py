@@ -0,0 +1,179 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# A stored Pokémon ID: an int when numeric (smaller to store and compare than text), else the text
+PokemonID = Union[int, str]
+
+# Numeric IDs up to this many digits are stored as (32-bit) ints
+MAX_INT_ID_DIGITS = 9
+
+# A queued list edit: (operation, IDs, option), where operation is 'add', 'remove', 'demote'
+# (move 2x IDs to the end of the 1x list) or 'clear' and option is the uses for adds,
+# remove_once for removes, None otherwise
+ListEdit = Tuple[str, List[PokemonID], Any]
+
+
+def parse_pokemon_id(token: str) -> PokemonID:
+    """Convert a typed ID to its stored form"""
+    if token.isascii() and token.isdigit() and len(token) <= MAX_INT_ID_DIGITS:
+        return int(token)
+    return token
+
+
+class IDList:
+    """A user's ordered, deduplicated IDs: `once` (one use left, taken first) and `twice` (two uses left)"""
+    __slots__ = ('once', 'twice', '_uses')
+
+    def __init__(self, once: Optional[List[PokemonID]] = None, twice: Optional[List[PokemonID]] = None):
+        self.once = once if once is not None else []
+        self.twice = twice if twice is not None else []
+        self._uses: Optional[Dict[PokemonID, int]] = None  # ID -> uses left, built on first lookup
+
+    def __len__(self) -> int:
+        return len(self.once) + len(self.twice)
+
+    def __contains__(self, pokemon_id: PokemonID) -> bool:
+        return pokemon_id in self.uses()
+
+    def uses(self) -> Dict[PokemonID, int]:
+        """Uses left per ID, for O(1) membership checks"""
+        if self._uses is None:
+            self._uses = dict.fromkeys(self.once, 1)
+            self._uses.update(dict.fromkeys(self.twice, 2))
+        return self._uses
+
+    def ids(self) -> List[PokemonID]:
+        """Every ID in the order they are taken"""
+        return self.once + self.twice
+
+    def copy(self) -> 'IDList':
+        return IDList(list(self.once), list(self.twice))
+
+    # In-memory versions of the Storage list operations (keep cached copies and
+    # queued write-behind results in step with what the backend does)
+
+    def add(self, ids: List[PokemonID], uses: int = 1) -> List[PokemonID]:
+        """Append the IDs not yet listed, returning them"""
+        listed = self.uses()
+        new_ids = []
+        for pokemon_id in ids:
+            if pokemon_id not in listed:
+                listed[pokemon_id] = uses
+                new_ids.append(pokemon_id)
+        (self.once if uses == 1 else self.twice).extend(new_ids)
+        return new_ids
+
+    def remove(self, ids: List[PokemonID], remove_once: bool = False) -> int:
+        """
+        Remove IDs, or with remove_once one use of each (2x IDs move to the end
+        of the 1x list). Returns how many listed IDs matched.
+        """
+        listed = self.uses()
+        targets = {pokemon_id for pokemon_id in ids if pokemon_id in listed}
+        if targets:
+            once = [pokemon_id for pokemon_id in self.once if pokemon_id not in targets]
+            if remove_once:
+                once.extend(pokemon_id for pokemon_id in self.twice if pokemon_id in targets)
+            self.once = once
+            self.twice = [pokemon_id for pokemon_id in self.twice if pokemon_id not in targets]
+            self._uses = None
+        return len(targets)
+
+    def demote(self, ids: List[PokemonID]) -> int:
+        """Move the given 2x IDs to the end of the 1x list (in 2x list order), returning how many moved"""
+        targets = set(ids).intersection(self.twice)
+        if targets:
+            self.once.extend(pokemon_id for pokemon_id in self.twice if pokemon_id in targets)
+            self.twice = [pokemon_id for pokemon_id in self.twice if pokemon_id not in targets]
+            self._uses = None
+        return len(targets)
+
+    def take(self, taken: 'IDList'):
+        """Apply a pop: drop the taken IDs, moving taken 2x IDs to the end of the 1x list"""
+        taken_ids = set(taken.once).union(taken.twice)
+        self.once = [pokemon_id for pokemon_id in self.once if pokemon_id not in taken_ids] + taken.twice
+        self.twice = [pokemon_id for pokemon_id in self.twice if pokemon_id not in taken_ids]
+        self._uses = None
+
+
+class EditError(Exception):
+    """A batch of queued edits failed part-way; edits before `index` were applied"""
+
+    def __init__(self, index: int, message: str):
+        super().__init__(message)
+        self.index = index
+
+
+class Storage(ABC):
+    """Interface of a storage backend; each list operation is atomic per user"""
+
+    name = 'storage'
+
+    @abstractmethod
+    async def connect(self):
+        """Open the backend and prepare its collections/tables"""
+
+    @abstractmethod
+    async def close(self):
+        """Close the backend"""
+
+    @abstractmethod
+    async def ping(self):
+        """Do a minimal round trip (used for the latency report)"""
+
+    def describe(self) -> str:
+        """Short summary of the connection settings in use"""
+        return self.name
+
+    # Plain documents (users, guilds)
+    @abstractmethod
+    async def get_document(self, collection: str, key_field: str, key: int) -> Optional[Dict[str, Any]]:
+        """Get a document by its key"""
+
+    @abstractmethod
+    async def save_document(self, collection: str, key_field: str, key: int, data: Dict[str, Any]):
+        """Set fields of a document, creating it if needed"""
+
+    # ID lists (collection is 'release_ids' or 'evolve_ids')
+    @abstractmethod
+    async def get_ids(self, collection: str, user_id: int) -> IDList:
+        """Get the user's list"""
+
+    @abstractmethod
+    async def get_page(self, collection: str, user_id: int, uses: int, start: int, count: int) -> Tuple[List[PokemonID], int, int]:
+        """
+        Get up to `count` IDs from position `start` of the 1x (uses=1) or 2x
+        list without reading the rest. Returns (those IDs, size of that list,
+        total IDs).
+        """
+
+    @abstractmethod
+    async def add_ids(self, collection: str, user_id: int, ids: List[PokemonID], uses: int) -> Tuple[List[PokemonID], int]:
+        """Append the IDs not yet listed with the given uses. Returns (IDs added, total IDs)"""
+
+    @abstractmethod
+    async def remove_ids(self, collection: str, user_id: int, ids: List[PokemonID], remove_once: bool) -> Tuple[int, int]:
+        """
+        Remove IDs, or with remove_once one use of each (2x IDs move to the end
+        of the 1x list). Returns (IDs matched, IDs remaining).
+        """
+
+    @abstractmethod
+    async def pop_ids(self, collection: str, user_id: int, count: int) -> Tuple[Optional[IDList], int]:
+        """
+        Take `count` IDs, 1x first, then 2x; taken 2x IDs move to the end of
+        the 1x list. Returns (IDs taken from each list, IDs remaining), or
+        (None, IDs available) when there are fewer than `count`.
+        """
+
+    @abstractmethod
+    async def clear_ids(self, collection: str, user_id: int) -> int:
+        """Empty the list, returning how many IDs it held"""
+
+    # Write-behind
+    @abstractmethod
+    async def apply_edits(self, collection: str, edits: List[Tuple[int, ListEdit]]):
+        """
+        Apply queued (user ID, edit) pairs in order. Raises EditError when
+        only the edits before the failed one were applied.
+        """
@@ -0,0 +1,55 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# MongoDB server for the MongoStorage tests (skipped when it can't be reached)
+MONGODB_TEST_URI = os.getenv('MONGODB_TEST_URI', 'mongodb://localhost:27017')
+
+
+@pytest.fixture(scope='session', autouse=True)
+def repo_cwd():
+    """Data files (CSVs, snapshot) are opened relative to the repo root"""
+    previous = os.getcwd()
+    os.chdir(ROOT)
+    yield
+    os.chdir(previous)
+
+
+@pytest.fixture(scope='session')
+def mongo_client():
+    """Client of the MongoDB test server, checked once per session"""
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    client = MongoClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command('ping')
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f"No MongoDB server at {MONGODB_TEST_URI} ({type(e).__name__})")
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def mongo_storage(mongo_client):
+    """An unconnected MongoStorage on a throwaway database, dropped afterwards"""
+    from mongo_storage import MongoStorage
+
+    database = f"test_{uuid.uuid4().hex}"
+    yield MongoStorage(MONGODB_TEST_URI, database)
+    mongo_client.drop_database(database)
+
+
+@pytest.fixture(params=['sqlite', 'mongodb'])
+def storage(request, tmp_path):
+    """An unconnected storage backend of each kind"""
+    if request.param == 'sqlite':
+        from sqlite_storage import SQLiteStorage
+        return SQLiteStorage(str(tmp_path / 'storage.db'))
+    return request.getfixturevalue('mongo_storage')
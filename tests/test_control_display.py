@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+import cogs.event as event
+from cogs.event import IDRecorder
+
+
+class RateLimitedMessage:
+    """Control message whose edits are held back or refused as given, then go through"""
+
+    def __init__(self, recorder_ref, outcomes):
+        self.recorder_ref = recorder_ref
+        self.outcomes = list(outcomes)  # Seconds discord.py sleeps inside the edit, 429, or RateLimited's retry_after
+        self.intervals = []  # display_interval at each edit attempt
+        self.attempts = []  # Loop time of each edit attempt
+        self.finished = []  # Loop time each edit returned or raised
+        self.shown = []
+
+    async def edit(self, embed=None, view=None):
+        loop = asyncio.get_running_loop()
+        recorder = self.recorder_ref[0]
+        self.intervals.append(recorder.display_interval)
+        self.attempts.append(loop.time())
+        outcome = self.outcomes.pop(0) if self.outcomes else 0
+        try:
+            if outcome == 429:
+                raise discord.HTTPException(SimpleNamespace(status=429, reason='Too Many Requests'), 'rate limited')
+            if isinstance(outcome, tuple):
+                raise discord.RateLimited(outcome[1])
+            await asyncio.sleep(outcome)
+            self.shown.append(embed.description)
+            if outcome:
+                # An ID found while this edit was held
+                recorder.ids.add(789 + len(self.shown))
+        finally:
+            self.finished.append(loop.time())
+
+
+def test_rate_limited_edits_back_off(monkeypatch):
+    monkeypatch.setattr(event, 'CONTROL_UPDATE_INTERVAL', 0.01)
+    monkeypatch.setattr(event, 'CONTROL_UPDATE_MAX_BACKOFF', 1.0)
+    monkeypatch.setattr(event, 'CONTROL_UPDATE_SLOW_EDIT', 0.05)
+
+    async def run():
+        recorder_ref = []
+        control_message = RateLimitedMessage(recorder_ref, [0.02, 0.08, 429, ('RateLimited', 0.5), 0])
+        message = SimpleNamespace(id=1, jump_url='https://discord.com', embeds=[])
+        recorder = IDRecorder(message, 1, control_message, '@user')
+        recorder_ref.append(recorder)
+
+        message.embeds = [discord.Embed(description='`123` `456`')]
+        await recorder.update_ids_and_display()
+        await asyncio.wait_for(recorder.display_task, 2)
+        return recorder, control_message
+
+    recorder, control_message = asyncio.run(run())
+
+    # A slow edit under CONTROL_UPDATE_SLOW_EDIT doesn't back off, an edit held
+    # for 0.08s spaces the next one out by as long, a 429 doubles the interval,
+    # RateLimited waits at least its retry_after, and a quick edit resets it
+    assert control_message.intervals == [
+        0.01, 0.01, pytest.approx(0.08, abs=0.03), pytest.approx(0.16, abs=0.06), 0.5
+    ]
+    for attempt in range(2, 5):
+        assert control_message.attempts[attempt] - control_message.finished[attempt - 1] >= control_message.intervals[attempt] - 1e-3
+    assert recorder.display_interval == 0.01
+    assert '**IDs found:** 2' in control_message.shown[0]
+    assert '**IDs found:** 3' in control_message.shown[1]
+    assert '**IDs found:** 4' in control_message.shown[2]
+    assert recorder.display_edits == len(control_message.shown) == 3
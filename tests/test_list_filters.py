@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+import pytest
+
+from catalog import PokemonCatalog
+from cogs.pokemonlist import PokemonListHelper
+
+
+@pytest.fixture(scope='module')
+def list_helper():
+    return PokemonListHelper(SimpleNamespace(catalog=PokemonCatalog(snapshot_file=None)))
+
+
+def test_repeated_region_flags_are_alternatives(list_helper):
+    repeated = list_helper.parse_list_command('--r kanto --r johto')
+    assert repeated == list_helper.parse_list_command('--r kanto,johto')
+
+    groups, payload = list_helper.get_list_result(repeated)
+    names = {name for group in groups.values() for name in group}
+    assert 'Bulbasaur' in names and 'Chikorita' in names
+    assert 'Region: Johto, Kanto' in payload['footer']['text']
+
+
+def test_repeated_type_flags_must_all_match(list_helper):
+    filters = list_helper.parse_list_command('--t fire --t flying --all')
+    assert filters['include'] == [('type', ['Fire']), ('type', ['Flying'])]
+
+    groups = list_helper.find_matching_pokemon(filters)
+    names = {name for group in groups.values() for name in group}
+    assert 'Charizard' in names and 'Charmander' not in names and 'Pidgey' not in names
@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+import database
+import id_lists
+from cogs.helpevolve import EvolveListView
+from cogs.helprelease import ReleaseListPaginationView
+from database import Database
+from id_lists import IDListStore
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Settings for an unconnected write-through Database on a temporary SQLite file"""
+    monkeypatch.setattr(database, 'STORAGE_BACKEND', 'sqlite')
+    monkeypatch.setattr(database, 'SQLITE_PATH', str(tmp_path / 'pages.db'))
+    monkeypatch.setattr(database, 'WRITE_BEHIND', False)
+    monkeypatch.setattr(database, 'LATENCY_PINGS', 1)
+
+
+def count_reads(monkeypatch, storage):
+    """Count the list reads that reach storage, by method name"""
+    reads = {'get_ids': 0, 'get_page': 0}
+    for name in reads:
+        read = getattr(storage, name)
+
+        def counted(*args, name=name, read=read):
+            reads[name] += 1
+            return read(*args)
+        monkeypatch.setattr(storage, name, counted)
+    return reads
+
+
+def test_evolve_pages_and_tabs_are_served_from_the_cache(sqlite_db, monkeypatch):
+    async def run():
+        db = Database()
+        await db.connect()
+        store = IDListStore('evolve_ids')
+        store.db = db
+        try:
+            await store.add(1, [str(pokemon_id) for pokemon_id in range(1, 8)], 1)
+            await store.add(1, ['20', '21', '22'], 2)
+            reads = count_reads(monkeypatch, db.storage)
+
+            view = EvolveListView(store, 1, ids_per_page=3)
+            await view.load_page(0)
+            assert (view.page_ids, view.tab_total, view.total_ids) == ([1, 2, 3], 7, 10)
+            # The first view reads the page, then loads and caches the whole list
+            assert reads == {'get_ids': 1, 'get_page': 1}
+
+            await view.load_page(1)  # ▶
+            assert view.page_ids == [4, 5, 6]
+            await view.load_page(2)  # ▶
+            assert view.page_ids == [7]
+            await view.load_page(1)  # ◀
+            assert view.page_ids == [4, 5, 6]
+            view.current_tab = "twice"
+            await view.load_page(0)
+            assert (view.page_ids, view.tab_total, view.page_count) == ([20, 21, 22], 3, 1)
+            view.current_tab = "once"
+            await view.load_page(0)
+            assert view.page_ids == [1, 2, 3]
+            assert reads == {'get_ids': 1, 'get_page': 1}
+
+            # Edits update the cached copy, so the next page shows them without a read
+            await store.remove(1, ['2', '20'], remove_once=True)
+            await view.load_page(2)
+            assert (view.page_ids, view.tab_total) == ([20], 7)
+            assert reads == {'get_ids': 1, 'get_page': 1}
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+def test_long_lists_are_read_a_page_at_a_time(sqlite_db, monkeypatch):
+    monkeypatch.setattr(id_lists, 'USER_LIST_CACHE_MAX_IDS', 5)
+
+    async def run():
+        db = Database()
+        await db.connect()
+        store = IDListStore('release_ids')
+        store.db = db
+        try:
+            await store.add(1, [str(pokemon_id) for pokemon_id in range(1, 13)])
+            reads = count_reads(monkeypatch, db.storage)
+
+            view = ReleaseListPaginationView(store, 1, ids_per_page=5)
+            await view.load_page(0)
+            assert (view.page_ids, view.total_ids, view.page_count) == ([1, 2, 3, 4, 5], 12, 3)
+            await view.load_page(2)  # ▶▶
+            assert view.page_ids == [11, 12]
+            await view.load_page(1)  # ◀
+            assert view.page_ids == [6, 7, 8, 9, 10]
+            assert reads == {'get_ids': 0, 'get_page': 3}
+            assert 1 not in store.cache.cache
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+def test_pages_of_unmigrated_lists(mongo_storage):
+    async def run():
+        storage = mongo_storage
+        await storage.connect()
+        try:
+            # Written after the startup migration, e.g. by an older instance still running
+            await storage.db.evolve_ids.insert_one({"user_id": 2, "ids": [
+                {"id": "5", "uses": 1}, {"id": "6", "uses": 2}, {"id": "7", "uses": 1}, {"id": "8", "uses": 1}
+            ]})
+            assert await storage.get_page('evolve_ids', 2, 1, 1, 2) == ([7, 8], 3, 4)
+            assert await storage.get_page('evolve_ids', 2, 2, 0, 5) == ([6], 1, 4)
+
+            await storage.add_ids('evolve_ids', 9, [1, 2, 3, 4], 1)
+            assert await storage.get_page('evolve_ids', 9, 1, 1, 2) == ([2, 3], 4, 4)
+            assert await storage.get_page('evolve_ids', 9, 2, 0, 2) == ([], 0, 4)
+            assert await storage.get_page('evolve_ids', 10, 1, 0, 2) == ([], 0, 0)
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
+
+
+def test_add_view_evolve_burst_is_served_from_the_cache(sqlite_db, monkeypatch):
+    async def run():
+        db = Database()
+        await db.connect()
+        store = IDListStore('evolve_ids')
+        store.db = db
+        lookups = store.cache.cache
+        try:
+            await store.add(1, ['1', '2', '3', '4'], 1)
+            await store.add(1, ['5', '6'], 2)
+            reads = count_reads(monkeypatch, db.storage)
+
+            view = EvolveListView(store, 1, ids_per_page=3)
+            await view.load_page(0)
+            assert (lookups.hits, lookups.misses) == (0, 1)
+            await view.load_page(1)
+            assert view.page_ids == [4]
+
+            popped, remaining = await store.pop(1, 2)
+            assert (popped.once, remaining) == ([1, 2], 4)
+            await store.add(1, ['7'], 1)
+            await view.load_page(0)
+            assert (view.page_ids, view.tab_total, view.total_ids) == ([3, 4, 7], 3, 5)
+            view.current_tab = "twice"
+            await view.load_page(0)
+            assert view.page_ids == [5, 6]
+
+            assert (lookups.hits, lookups.misses) == (3, 1)
+            assert reads == {'get_ids': 1, 'get_page': 1}
+            cached = await store.get(1)
+            stored = await db.storage.get_ids('evolve_ids', 1)
+            assert (cached.once, cached.twice) == (stored.once, stored.twice)
+        finally:
+            await db.close()
+
+    asyncio.run(run())
@@ -0,0 +1,114 @@
+import asyncio
+import random
+
+import pytest
+
+from storage import IDList
+
+
+@pytest.mark.parametrize('collection', ['release_ids', 'evolve_ids'])
+def test_list_edits_match_the_model(storage, collection):
+    async def run():
+        rng = random.Random(3)
+        pool = list(range(1, 30)) + ['$once', 'ab', '0123456789']
+        model = IDList()
+        await storage.connect()
+        try:
+            for _ in range(200):
+                ids = [rng.choice(pool) for _ in range(rng.randint(1, 5))]
+                ids = list(dict.fromkeys(ids))
+                roll = rng.random()
+                if roll < 0.5:
+                    uses = rng.choice([1, 2]) if collection == 'evolve_ids' else 1
+                    expected = model.add(ids, uses)
+                    assert await storage.add_ids(collection, 5, ids, uses) == (expected, len(model))
+                elif roll < 0.95:
+                    remove_once = rng.random() < 0.5
+                    expected = model.remove(ids, remove_once)
+                    assert await storage.remove_ids(collection, 5, ids, remove_once) == (expected, len(model))
+                else:
+                    expected = len(model)
+                    model = IDList()
+                    assert await storage.clear_ids(collection, 5) == expected
+
+                listed = await storage.get_ids(collection, 5)
+                assert (listed.once, listed.twice) == (model.once, model.twice)
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
+
+
+def test_remove_once_moves_twice_ids_in_list_order(storage):
+    async def run():
+        await storage.connect()
+        try:
+            await storage.add_ids('evolve_ids', 5, [1, 2], 1)
+            await storage.add_ids('evolve_ids', 5, [26, 9, 4], 2)
+
+            assert await storage.remove_ids('evolve_ids', 5, [9, 1, 26, 99], True) == (3, 4)
+            listed = await storage.get_ids('evolve_ids', 5)
+            assert (listed.once, listed.twice) == ([2, 26, 9], [4])
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize('collection', ['release_ids', 'evolve_ids'])
+def test_apply_edits_writes_queued_edits_in_order(storage, collection):
+    async def run():
+        uses = 2 if collection == 'evolve_ids' else 1
+        edits = [
+            (1, ('add', [5, 6, 7], 1)),
+            (2, ('add', [5, '$twice'], uses)),
+            (1, ('remove', [6], False)),
+            (2, ('remove', ['$twice'], True)),
+            (1, ('add', [8, 5], uses)),
+            (2, ('clear', [], None)),
+            (2, ('add', [9], 1)),
+            (1, ('add', [10, 11], uses)),
+            (1, ('demote', [11, 5], None)),
+        ]
+        models = {1: IDList(), 2: IDList()}
+        for user_id, (operation, ids, option) in edits:
+            if operation == 'add':
+                models[user_id].add(ids, option)
+            elif operation == 'remove':
+                models[user_id].remove(ids, option)
+            elif operation == 'demote':
+                models[user_id].demote(ids)
+            else:
+                models[user_id] = IDList()
+
+        if collection == 'release_ids':
+            edits = [(user_id, edit) for user_id, edit in edits if edit[0] != 'demote']
+        await storage.connect()
+        try:
+            await storage.apply_edits(collection, edits)
+            for user_id, model in models.items():
+                listed = await storage.get_ids(collection, user_id)
+                assert (listed.once, listed.twice) == (model.once, model.twice)
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
+
+
+def test_demote_can_be_written_again(storage):
+    async def run():
+        await storage.connect()
+        try:
+            await storage.add_ids('evolve_ids', 5, [1, 2], 1)
+            await storage.add_ids('evolve_ids', 5, [26, 9, 4], 2)
+            edits = [(5, ('remove', [2], False)), (5, ('demote', [9, 26, 1], None))]
+
+            # Written once, then again as a retried flush would
+            await storage.apply_edits('evolve_ids', edits)
+            await storage.apply_edits('evolve_ids', edits)
+            listed = await storage.get_ids('evolve_ids', 5)
+            assert (listed.once, listed.twice) == ([1, 26, 9], [4])
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
@@ -0,0 +1,75 @@
+import asyncio
+
+
+def test_legacy_lists_are_migrated(mongo_client, mongo_storage):
+    # Lists as stored before the compact schema
+    db = mongo_client[mongo_storage.database]
+    db.release_ids.insert_many([
+        {"user_id": 1, "ids": ["123", "0042", "ab", "1234567890", 7]},
+        {"user_id": 4, "ids": ["ab", 8]},
+    ])
+    db.evolve_ids.insert_many([
+        {"user_id": 2, "ids": [
+            {"id": "5", "uses": 1}, {"id": "6", "uses": 2}, {"id": "x1", "uses": 2}, {"id": "7", "uses": 1}
+        ]},
+        {"user_id": 3, "once": [1], "ids": [{"id": "2", "uses": 1}]},
+    ])
+
+    async def run():
+        storage = mongo_storage
+        await storage.connect()
+        try:
+            assert (await storage.get_ids('release_ids', 1)).once == [123, 42, 'ab', '1234567890', 7]
+            assert (await storage.get_ids('release_ids', 4)).once == ['ab', 8]
+            evolve = await storage.get_ids('evolve_ids', 2)
+            assert (evolve.once, evolve.twice) == ([5, 7], [6, 'x1'])
+            evolve = await storage.get_ids('evolve_ids', 3)
+            assert (evolve.once, evolve.twice) == ([1, 2], [])
+
+            # Stored in the new layout, so a second run has nothing left to convert
+            stored = await storage.db.evolve_ids.find_one({"user_id": 2}, {"_id": 0})
+            assert stored == {"user_id": 2, "once": [5, 7], "twice": [6, 'x1']}
+            stored = await storage.db.release_ids.find_one({"user_id": 1}, {"_id": 0})
+            assert stored["ids"] == [123, 42, 'ab', '1234567890', 7]
+            await storage.migrate_legacy_ids()
+            assert await storage.db.evolve_ids.find_one({"user_id": 2}, {"_id": 0}) == {
+                "user_id": 2, "once": [5, 7], "twice": [6, 'x1']
+            }
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
+
+
+def test_migration_drops_repeated_ids(mongo_client, mongo_storage):
+    db = mongo_client[mongo_storage.database]
+    db.release_ids.insert_many([
+        {"user_id": 1, "ids": ["42", "0042", "ab", 42, "7", "ab"]},
+        # Migrated before repeats were dropped
+        {"user_id": 2, "ids": [5, 6, 5]},
+    ])
+    db.evolve_ids.insert_many([
+        {"user_id": 3, "ids": [
+            {"id": "42", "uses": 1}, {"id": "0042", "uses": 2}, {"id": "9", "uses": 1}, {"id": "009", "uses": 1}
+        ]},
+        {"user_id": 4, "once": [1, 2, 1], "twice": [3, 2]},
+    ])
+
+    async def run():
+        storage = mongo_storage
+        await storage.connect()
+        try:
+            assert (await storage.get_ids('release_ids', 1)).once == [42, 'ab', 7]
+            assert (await storage.get_ids('release_ids', 2)).once == [5, 6]
+            evolve = await storage.get_ids('evolve_ids', 3)
+            assert (evolve.once, evolve.twice) == ([9], [42])
+            evolve = await storage.get_ids('evolve_ids', 4)
+            assert (evolve.once, evolve.twice) == ([1], [3, 2])
+
+            # A repeat can now be removed in one go
+            assert await storage.remove_ids('release_ids', 1, [42], False) == (1, 2)
+            assert (await storage.get_ids('release_ids', 1)).once == ['ab', 7]
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+import asyncio
+import random
+from collections import Counter
+
+import pytest
+
+
+@pytest.mark.parametrize('collection', ['release_ids', 'evolve_ids'])
+def test_concurrent_pops_never_over_issue(storage, collection):
+    async def run():
+        rng = random.Random(7)
+        await storage.connect()
+        try:
+            user_id = 42
+            once = list(range(1, 301))
+            twice = list(range(1001, 1201)) if collection == 'evolve_ids' else []
+            await storage.add_ids(collection, user_id, once, 1)
+            if twice:
+                await storage.add_ids(collection, user_id, twice, 2)
+            uses = {**dict.fromkeys(once, 1), **dict.fromkeys(twice, 2)}
+
+            results = await asyncio.gather(*(
+                storage.pop_ids(collection, user_id, rng.randint(1, 5)) for _ in range(400)
+            ))
+
+            issued = Counter()
+            for popped, _ in results:
+                if popped is not None:
+                    issued.update(popped.ids())
+            remaining = await storage.get_ids(collection, user_id)
+        finally:
+            await storage.close()
+
+        # No ID is issued more times than its uses
+        assert all(issued[pokemon_id] <= uses[pokemon_id] for pokemon_id in issued)
+        # Nothing is lost: every use is either issued or still listed
+        left = Counter(remaining.once + remaining.twice * 2)
+        assert issued + left == Counter(uses)
+
+    asyncio.run(run())
+
+
+def test_pop_takes_once_then_twice(storage):
+    async def run():
+        await storage.connect()
+        try:
+            await storage.add_ids('evolve_ids', 7, [1, 2, 3], 1)
+            await storage.add_ids('evolve_ids', 7, [10, 11, 'ab'], 2)
+
+            popped, remaining = await storage.pop_ids('evolve_ids', 7, 4)
+            assert (popped.once, popped.twice, remaining) == ([1, 2, 3], [10], 3)
+            listed = await storage.get_ids('evolve_ids', 7)
+            assert (listed.once, listed.twice) == ([10], [11, 'ab'])
+
+            assert await storage.pop_ids('evolve_ids', 7, 4) == (None, 3)
+            assert await storage.pop_ids('evolve_ids', 8, 1) == (None, 0)
+
+            popped, remaining = await storage.pop_ids('evolve_ids', 7, 3)
+            assert (popped.once, popped.twice, remaining) == ([10], [11, 'ab'], 2)
+            listed = await storage.get_ids('evolve_ids', 7)
+            assert (listed.once, listed.twice) == ([11, 'ab'], [])
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
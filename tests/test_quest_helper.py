@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+import pytest
+
+from catalog import PokemonCatalog
+from cogs.pokemonquesthelper import PokemonQuestHelper
+
+
+@pytest.fixture(scope='module')
+def quest_helper():
+    return PokemonQuestHelper(SimpleNamespace(catalog=PokemonCatalog(snapshot_file=None)))
+
+
+@pytest.mark.parametrize('quest, base_form', [
+    ('Catch 5 Dragon-type Pokémon from the Paldea region', 'Cyclizar'),
+    ('Catch 5 Ghost-type Pokémon from the Paldea region', 'Gimmighoul'),
+])
+def test_region_type_quest_suggests_each_species_once(quest_helper, quest, base_form):
+    quest_info = quest_helper.parse_quest(quest)
+    matches = quest_helper.find_matching_pokemon(quest_info, limit=5)
+
+    dex_numbers = [pokemon.dex for pokemon in matches]
+    assert len(dex_numbers) == len(set(dex_numbers))
+    assert base_form in [pokemon.name for pokemon in matches]
+
+
+def test_candidate_lists_have_one_row_per_dex(quest_helper):
+    catalog = quest_helper.catalog
+    for rows in list(quest_helper.candidates.values()) + list(quest_helper.gender_candidates.values()):
+        dex_numbers = [catalog.dex[row] for row in rows]
+        assert len(dex_numbers) == len(set(dex_numbers))
@@ -0,0 +1,46 @@
+import json
+
+import recording_log
+from recording_log import RecordingLog
+
+
+def test_malformed_lines_are_skipped(tmp_path):
+    path = tmp_path / 'recordings.log'
+    log = RecordingLog(str(path))
+    log.start(1, 10, 11, 5, '@a')
+    log.add_ids(1, [3, 4])
+    log.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "ids", "ids": [9], "at": 1}\n')             # No message
+        f.write('[1, 2]\n')                                         # Not an entry
+        f.write('{"op": "ids", "message": 1, "ids": 7, "at": 1}\n')  # ids of the wrong type
+        f.write('{"op": "start", "message": 2}\n')                  # Missing fields
+        f.write('{"op": "ids", "message": 1, "ids": [8], "at": 2}\n')
+        f.write('{"op": "start", "message": 3, "channel": 10, "control": 12, "user": 6, "mention": "@b", "at": 3}\n')
+        f.write('{"op": "ids", "mess')                              # Torn write
+
+    recordings = {recording.message_id: recording for recording in RecordingLog(str(path)).load()}
+
+    assert sorted(recordings) == [1, 3]
+    assert recordings[1].ids == {3, 4, 8}
+    # The compacted log replays to the same recordings
+    assert {recording.message_id for recording in RecordingLog(str(path)).load()} == {1, 3}
+
+
+def test_end_compacts_a_large_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(recording_log, 'RECORDING_LOG_COMPACT_SIZE', 2000)
+    path = tmp_path / 'recordings.log'
+    log = RecordingLog(str(path))
+    log.load()
+    log.start(1, 10, 11, 5, '@a')
+    log.add_ids(1, [1])
+    for message_id in range(100, 200):
+        log.start(message_id, 10, 11, 5, '@a')
+        log.add_ids(message_id, list(range(20)))
+        log.end(message_id)
+
+    assert path.stat().st_size < 4000
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert {line['message'] for line in lines} <= {1} | set(range(100, 200))
+    recordings = RecordingLog(str(path)).load()
+    assert [recording.message_id for recording in recordings] == [1]
@@ -0,0 +1,110 @@
+import asyncio
+import random
+
+from scheduler import DeadlineScheduler
+
+
+def test_thousands_of_recordings_fire_once():
+    async def run():
+        rng = random.Random(1)
+        loop = asyncio.get_running_loop()
+        fired = {}
+
+        async def expire(key):
+            fired.setdefault(key, []).append(loop.time())
+
+        scheduler = DeadlineScheduler(expire)
+        deadlines = {}
+        keys = range(5000)
+        for key in keys:
+            delay = rng.uniform(0.05, 0.3)
+            deadlines[key] = loop.time() + delay
+            scheduler.schedule(key, delay)
+
+        # Activity pushes deadlines back, stopped recordings cancel theirs
+        cancelled = set()
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            for key in rng.sample(keys, 500):
+                if key in fired or key in cancelled:
+                    continue
+                if rng.random() < 0.2:
+                    scheduler.cancel(key)
+                    cancelled.add(key)
+                else:
+                    delay = rng.uniform(0.05, 0.3)
+                    deadlines[key] = loop.time() + delay
+                    scheduler.schedule(key, delay)
+
+        await asyncio.sleep(0.6)
+
+        assert cancelled and not cancelled & set(fired)
+        for key in set(keys) - cancelled:
+            assert len(fired[key]) == 1
+            assert fired[key][0] >= deadlines[key] - 1e-6
+        assert len(scheduler) == 0
+
+        # Scheduling again once everything has fired still works
+        start = loop.time()
+        scheduler.schedule('again', 0.02)
+        await asyncio.sleep(0.1)
+        assert fired['again'][0] - start >= 0.02 - 1e-6
+        scheduler.close()
+
+    asyncio.run(run())
+
+
+def test_earlier_deadline_wakes_the_scheduler():
+    async def run():
+        loop = asyncio.get_running_loop()
+        fired = {}
+
+        async def expire(key):
+            fired[key] = loop.time()
+
+        scheduler = DeadlineScheduler(expire)
+        scheduler.schedule('late', 5)
+        await asyncio.sleep(0.01)
+        start = loop.time()
+        scheduler.schedule('early', 0.05)
+        await asyncio.sleep(0.2)
+
+        assert 'early' in fired and fired['early'] - start < 0.15
+        assert 'late' in scheduler and 'late' not in fired
+        scheduler.close()
+
+    asyncio.run(run())
+
+
+def test_rescheduling_and_cancelling():
+    async def run():
+        loop = asyncio.get_running_loop()
+        fired = {}
+
+        async def expire(key):
+            fired.setdefault(key, []).append(loop.time())
+
+        scheduler = DeadlineScheduler(expire)
+        start = loop.time()
+        scheduler.schedule('pushed', 0.03)
+        scheduler.schedule('cancelled', 0.03)
+        scheduler.schedule('kept', 0.03)
+        await asyncio.sleep(0.01)
+        scheduler.schedule('pushed', 0.1)
+        scheduler.cancel('cancelled')
+        await asyncio.sleep(0.05)
+
+        assert list(fired) == ['kept']
+        assert 'pushed' in scheduler and 'cancelled' not in scheduler
+
+        await asyncio.sleep(0.1)
+        assert sorted(fired) == ['kept', 'pushed']
+        assert len(fired['pushed']) == 1 and fired['pushed'][0] - start >= 0.11 - 1e-6
+
+        # Nothing fires after close
+        scheduler.schedule('closed', 0.02)
+        scheduler.close()
+        await asyncio.sleep(0.05)
+        assert 'closed' not in fired and len(scheduler) == 0
+
+    asyncio.run(run())
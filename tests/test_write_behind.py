@@ -0,0 +1,128 @@
+import asyncio
+import random
+
+import pytest
+
+import database
+from database import Database
+from id_lists import IDListStore
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_flushed_lists_match_the_cache(tmp_path, monkeypatch, seed):
+    monkeypatch.setattr(database, 'STORAGE_BACKEND', 'sqlite')
+    monkeypatch.setattr(database, 'SQLITE_PATH', str(tmp_path / 'write_behind.db'))
+    monkeypatch.setattr(database, 'WRITE_BEHIND', True)
+    monkeypatch.setattr(database, 'LATENCY_PINGS', 1)
+
+    async def run():
+        rng = random.Random(seed)
+        db = Database()
+        await db.connect()
+        store = IDListStore('evolve_ids')
+        store.db = db
+        user_ids = [1, 2]
+        try:
+            for _ in range(300):
+                user_id = rng.choice(user_ids)
+                ids = [str(rng.randint(1, 40)) for _ in range(rng.randint(1, 4))]
+                roll = rng.random()
+                if roll < 0.45:
+                    await store.add(user_id, ids, rng.choice([1, 2]))
+                elif roll < 0.8:
+                    await store.remove(user_id, ids[:1], remove_once=True)
+                elif roll < 0.95:
+                    await store.remove(user_id, ids)
+                elif roll < 0.99:
+                    # Goes through storage, so it flushes the queued edits first
+                    await store.pop(user_id, rng.randint(1, 3))
+                else:
+                    await store.clear(user_id)
+
+            await db.flush()
+            for user_id in user_ids:
+                cached = await store.get(user_id)
+                stored = await db.storage.get_ids('evolve_ids', user_id)
+                assert (cached.once, cached.twice) == (stored.once, stored.twice)
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+def test_consecutive_remove_once_keeps_the_order_shown(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'STORAGE_BACKEND', 'sqlite')
+    monkeypatch.setattr(database, 'SQLITE_PATH', str(tmp_path / 'write_behind.db'))
+    monkeypatch.setattr(database, 'WRITE_BEHIND', True)
+    monkeypatch.setattr(database, 'LATENCY_PINGS', 1)
+
+    async def run():
+        db = Database()
+        await db.connect()
+        store = IDListStore('evolve_ids')
+        store.db = db
+        try:
+            await store.add(1, ['26', '9'], 2)
+            await db.flush()
+            await store.remove(1, ['9'], remove_once=True)
+            await store.remove(1, ['26'], remove_once=True)
+            await db.flush()
+
+            assert (await store.get(1)).once == [9, 26]
+            assert (await db.storage.get_ids('evolve_ids', 1)).once == [9, 26]
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_retried_partial_flush_matches_the_cache(tmp_path, monkeypatch, seed):
+    monkeypatch.setattr(database, 'STORAGE_BACKEND', 'sqlite')
+    monkeypatch.setattr(database, 'SQLITE_PATH', str(tmp_path / 'write_behind.db'))
+    monkeypatch.setattr(database, 'WRITE_BEHIND', True)
+    monkeypatch.setattr(database, 'LATENCY_PINGS', 1)
+
+    async def run():
+        rng = random.Random(seed)
+        db = Database()
+        await db.connect()
+        store = IDListStore('evolve_ids')
+        store.db = db
+        apply_edits = db.storage.apply_edits
+
+        async def apply_part_then_fail(collection, edits):
+            # Like a bulk_write cut off by a network error after some edits were written
+            await apply_edits(collection, edits[:rng.randint(0, len(edits))])
+            raise ConnectionError('connection reset')
+
+        try:
+            await store.add(1, [str(pokemon_id) for pokemon_id in range(1, 31)], 2)
+            await store.add(1, [str(pokemon_id) for pokemon_id in range(31, 41)], 1)
+            await db.flush()
+            for _ in range(5):
+                for _ in range(20):
+                    ids = [str(rng.randint(1, 45)) for _ in range(rng.randint(1, 3))]
+                    if rng.random() < 0.7:
+                        await store.remove(1, ids, remove_once=True)
+                    else:
+                        await store.add(1, ids, rng.choice([1, 2]))
+
+                acknowledged = await store.get(1)
+                db.storage.apply_edits = apply_part_then_fail
+                await db.flush()
+                assert db.has_pending('evolve_ids', 1)
+                db.storage.apply_edits = apply_edits
+                await db.flush()
+
+                # The retry stores every acknowledged use, none twice...
+                stored = await db.storage.get_ids('evolve_ids', 1)
+                assert stored.uses() == acknowledged.uses()
+                # ...and users are shown the stored order from then on
+                cached = await store.get(1)
+                assert (cached.once, cached.twice) == (stored.once, stored.twice)
+        finally:
+            db.storage.apply_edits = apply_edits
+            await db.close()
+
+    asyncio.run(run())